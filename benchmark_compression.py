@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Benchmark LLMLingua compression settings against a fixed guidance corpus.
+
+Each configuration runs in its own child process so peak RSS is attributed
+to that configuration alone. Model load time is reported separately from
+compression wall time. Sweeping 'backend' compares PyTorch with the ONNX
+Runtime backends (see onnx_backend.py) on latency and peak RSS. A child
+that crashes (e.g. OOM-killed) or exceeds --timeout is recorded as a failed
+configuration and the sweep moves on.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+from queue import Empty
+
+import compress_guidance
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'guidance', '**', '*.md')
+
+# Settings swept by default; every combination becomes one configuration
+DEFAULT_SWEEP = {
+    'use_context_level_filter': [True, False],
+    'drop_consecutive': [True, False],
+    'force_reserve_digit': [False, True],
+    'target_ratio': [0.3, 0.5, 0.7],
+    'backend': ['torch'],
+}
+
+# The compressor is LLMLingua-2 (use_llmlingua2=True), whose compress_prompt
+# path ignores rank_method, keep_sentence_number, condition_compare and the
+# other LongLLMLingua settings; sweeping them only yields duplicate configs
+SWEEPABLE = frozenset({
+    'target_ratio', 'backend', 'use_context_level_filter', 'use_token_level_filter',
+    'drop_consecutive', 'force_reserve_digit', 'context_level_rate',
+})
+
+AT_REFERENCE_RE = re.compile(r'@[~\w./-]+\.md')
+
+# How often the parent checks that a configuration's child is still alive
+QUEUE_POLL_SECONDS = 1.0
+
+
+def heading_lines(text):
+    """Heading lines, stripped, in document order."""
+    return [line.strip() for line in text.splitlines() if compress_guidance.HEADING_RE.match(line)]
+
+
+def fence_count(text):
+    """Number of fenced-code delimiter lines."""
+    return sum(1 for line in text.splitlines() if compress_guidance.FENCE_RE.match(line))
+
+
+def check_structure(original, compressed):
+    """
+    Compare markdown structure between original and compressed text.
+
+    Returns a dict of check name -> bool, plus counts of what was lost.
+    """
+    original_headings = heading_lines(original)
+    kept = set(heading_lines(compressed))
+    headings_lost = [h for h in original_headings if h not in kept]
+
+    original_refs = set(AT_REFERENCE_RE.findall(original))
+    refs_lost = sorted(original_refs - set(AT_REFERENCE_RE.findall(compressed)))
+
+    original_fences = fence_count(original)
+    compressed_fences = fence_count(compressed)
+
+    return {
+        'headings_intact': not headings_lost,
+        'fences_intact': compressed_fences == original_fences and compressed_fences % 2 == 0,
+        'references_intact': not refs_lost,
+        'headings_lost': len(headings_lost),
+        'fences_delta': compressed_fences - original_fences,
+        'references_lost': refs_lost,
+    }
+
+
+def token_length(llm_lingua, text):
+    """Token count using the compressor's tokenizer, falling back to words."""
+    try:
+        return llm_lingua.get_token_length(text)
+    except Exception:
+        return len(text.split())
+
+
+def load_corpus(pattern, limit=None):
+    """Sorted list of (path, content) for the corpus glob."""
+    paths = compress_guidance.expand_paths([pattern])
+    if limit:
+        paths = paths[:limit]
+    corpus = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.append((path, f.read()))
+    return corpus
+
+
+def run_configuration(config, corpus, queue):
+    """Child-process entry point: load the model, compress the corpus, report."""
+    compress_guidance.set_backend(config.get('backend', compress_guidance.DEFAULT_BACKEND))
+    load_start = time.perf_counter()
+    llm_lingua = compress_guidance.get_compressor()
+    load_seconds = time.perf_counter() - load_start
+
+    settings = {k: v for k, v in config.items() if k not in ('target_ratio', 'backend')}
+    files = []
+    tokens_in = tokens_out = 0
+    compress_seconds = 0.0
+    for path, content in corpus:
+        start = time.perf_counter()
+        try:
+            compressed, _ = compress_guidance.compress_text(
+                llm_lingua, content, config['target_ratio'], **settings
+            )
+        except Exception as e:
+            files.append({'path': path, 'error': f"{type(e).__name__}: {e}"})
+            continue
+        seconds = time.perf_counter() - start
+        compress_seconds += seconds
+        file_in = token_length(llm_lingua, content)
+        file_out = token_length(llm_lingua, compressed)
+        tokens_in += file_in
+        tokens_out += file_out
+        files.append({
+            'path': path,
+            'seconds': seconds,
+            'tokens_in': file_in,
+            'tokens_out': file_out,
+            'structure': check_structure(content, compressed),
+        })
+
+    ok = [f for f in files if 'error' not in f]
+    queue.put({
+        'config': config,
+        'model_load_seconds': load_seconds,
+        'compress_seconds': compress_seconds,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'tokens_in': tokens_in,
+        'tokens_out': tokens_out,
+        'token_ratio': tokens_out / tokens_in if tokens_in else 0,
+        'errors': len(files) - len(ok),
+        'headings_intact': all(f['structure']['headings_intact'] for f in ok),
+        'fences_intact': all(f['structure']['fences_intact'] for f in ok),
+        'references_intact': all(f['structure']['references_intact'] for f in ok),
+        'files': files,
+    })
+
+
+def failed_result(config, corpus, reason):
+    """Result recorded for a configuration whose child never reported."""
+    return {
+        'config': config,
+        'failed': reason,
+        'model_load_seconds': None,
+        'compress_seconds': None,
+        'peak_rss_kb': None,
+        'tokens_in': 0,
+        'tokens_out': 0,
+        'token_ratio': 0,
+        'errors': len(corpus),
+        'headings_intact': False,
+        'fences_intact': False,
+        'references_intact': False,
+        'files': [],
+    }
+
+
+def benchmark(config, corpus, timeout=None):
+    """Run one configuration in a fresh process and return its result."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_configuration, args=(config, corpus, queue))
+    process.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                return queue.get(timeout=QUEUE_POLL_SECONDS)
+            except Empty:
+                pass
+            if not process.is_alive():
+                # A result put just before exit may still be in the pipe
+                try:
+                    return queue.get(timeout=QUEUE_POLL_SECONDS)
+                except Empty:
+                    return failed_result(config, corpus, f"child exited with code {process.exitcode}")
+            if deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                return failed_result(config, corpus, f"timed out after {timeout}s")
+    finally:
+        process.join()
+
+
+def expand_sweep(sweep):
+    """Cartesian product of sweep values as a list of config dicts."""
+    keys = list(sweep)
+    return [dict(zip(keys, values)) for values in itertools.product(*(sweep[k] for k in keys))]
+
+
+def is_usable(result):
+    """A configuration is usable when every file kept its markdown structure."""
+    return (not result.get('failed') and not result['errors'] and result['headings_intact']
+            and result['fences_intact'] and result['references_intact'])
+
+
+def parse_values(raw):
+    """Parse a comma-separated CLI value list into bools/numbers/strings."""
+    values = []
+    for item in raw.split(','):
+        item = item.strip()
+        if item.lower() in ('true', 'false'):
+            values.append(item.lower() == 'true')
+            continue
+        try:
+            values.append(int(item))
+        except ValueError:
+            try:
+                values.append(float(item))
+            except ValueError:
+                values.append(item)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sweep compress_guidance settings over a fixed corpus',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                                        # Default sweep over guidance/
+  %(prog)s --limit 10 -o bench.json               # First 10 corpus files
+  %(prog)s --set target_ratio=0.4,0.6 --set drop_consecutive=true
+  %(prog)s --set backend=torch,onnx,onnx-int8 --set target_ratio=0.5 \
+           --set use_context_level_filter=true --set drop_consecutive=true \
+           --set force_reserve_digit=false       # Backend latency/RSS comparison
+        """,
+    )
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS,
+                        help='Glob or directory for the corpus (default: guidance/**/*.md)')
+    parser.add_argument('--limit', type=int, help='Use only the first N corpus files')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=V1,V2',
+                        help='Override the values swept for one setting (repeatable)')
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds before a configuration is killed and recorded as failed')
+    parser.add_argument('-o', '--output', default='compression-benchmark.json',
+                        help='JSON report path (default: compression-benchmark.json)')
+    args = parser.parse_args()
+
+    sweep = dict(DEFAULT_SWEEP)
+    for override in args.set:
+        key, _, raw = override.partition('=')
+        if not raw:
+            parser.error(f"--set expects KEY=V1,V2: {override}")
+        if key not in SWEEPABLE:
+            parser.error(f"--set {key}: not used by LLMLingua-2 compression; "
+                         f"sweepable: {', '.join(sorted(SWEEPABLE))}")
+        sweep[key] = parse_values(raw)
+
+    corpus = load_corpus(args.corpus, args.limit)
+    if not corpus:
+        print(f"No corpus files matched {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+
+    configs = expand_sweep(sweep)
+    if any(str(config.get('backend', '')).startswith('onnx') for config in configs):
+        # One-time export/quantization must not count as the first ONNX config's model load
+        from onnx_backend import export_model
+        print("Exporting ONNX model (not timed)")
+        export_model()
+    print(f"Benchmarking {len(configs)} configuration(s) over {len(corpus)} file(s)")
+
+    results = []
+    for config in configs:
+        result = benchmark(config, corpus, args.timeout)
+        results.append(result)
+        if result.get('failed'):
+            print(f"  {json.dumps(config)}: FAILED ({result['failed']})")
+            continue
+        flags = ''.join(
+            'Y' if result[k] else 'n'
+            for k in ('headings_intact', 'fences_intact', 'references_intact')
+        )
+        print(f"  {json.dumps(config)}: {result['compress_seconds']:.2f}s "
+              f"rss={result['peak_rss_kb'] // 1024}MB "
+              f"tokens {result['tokens_in']}->{result['tokens_out']} structure={flags}")
+
+    usable = sorted((r for r in results if is_usable(r)), key=lambda r: r['compress_seconds'])
+    report = {
+        'corpus': [path for path, _ in corpus],
+        'sweep': sweep,
+        'results': results,
+        'fastest_usable': usable[0]['config'] if usable else None,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if usable:
+        print(f"\nFastest usable configuration: {json.dumps(usable[0]['config'])}")
+    else:
+        print("\nNo configuration preserved markdown structure on every file")
+    print(f"Report written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
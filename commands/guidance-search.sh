@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+# Full-text search over guidance, agents, commands and research notes
+# Usage: guidance-search.sh <query> [--scope guidance,agents] [--limit N] [--json]
+#
+# Ranks matches with BM25 from a persistent index
+# (~/.cache/claude-guidance/search-index-<root hash>.json) that is refreshed
+# incrementally; see guidance_search.py.
+
+set -euo pipefail
+
+if [ $# -eq 0 ]; then
+    echo "Usage: guidance-search.sh <query> [--scope guidance,agents] [--limit N] [--json]"
+    echo "Example: guidance-search.sh service objects"
+    echo "Example: guidance-search.sh rspec mocking --scope guidance,project-guidance"
+    exit 1
+fi
+
+exec python3 "$(dirname "$0")/guidance_search.py" "$@"
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Compile guidance bundles into pre-flattened, token-counted artifacts.
+
+A bundle under guidance/bundles/ builds its context through chains of
+@-references (Inherits From / Direct Includes). The compiler resolves
+each bundle's full @-reference closure ahead of time. It writes one
+markdown file per bundle in which every file in the closure appears once,
+after the files it references, with frontmatter stripped and inlined
+@-references turned into plain paths so nothing is loaded twice. A
+session then loads one file per bundle instead of walking the graph.
+
+Each artifact records an estimated token count. It uses tiktoken's
+cl100k_base encoding when installed, which approximates but does not
+match Claude's tokenizer; otherwise four characters per token. With
+--compressed, an LLMLingua version is also written through
+compress_guidance_file(), section by section.
+
+Builds are incremental. A bundle is rebuilt only when a file in its
+closure changed, or when the closure itself changed.
+
+Usage:
+    guidance_bundles.py build [--root ~/.claude] [--output DIR] [--compressed] [--force]
+    guidance_bundles.py list [--output DIR] [--json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from guidance_links import CLAUDE_DIR, build_graph, resolve_reference, scan
+
+OUTPUT_DIR = Path.home() / ".cache" / "claude-guidance" / "bundles"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+CHARS_PER_TOKEN = 4
+DEFAULT_RATIO = 0.5
+
+
+def token_counter():
+    """(name, count_fn): tiktoken when available, else a character estimate."""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return "tiktoken/cl100k_base", lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return "estimate/4-chars", lambda text: (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def strip_frontmatter(text):
+    if text.startswith('---\n'):
+        end = text.find('\n---', 4)
+        if end != -1:
+            return text[end + 4:].lstrip('\n')
+    return text
+
+
+def closure(bundle, edges):
+    """Files reachable from bundle, each once, dependencies before dependents."""
+    order = []
+    visited = {bundle}
+    stack = [(bundle, iter(sorted(edges.get(bundle, ()))))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(sorted(edges.get(child, ())))))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    return order
+
+
+def flatten(files, references, claude_dir, read):
+    """Concatenate files into one document, marking inlined @-references as plain paths."""
+    inlined = set(files)
+    parts = []
+    for path in files:
+        text = read(path)
+        lines = text.split('\n')
+        for number, ref in references.get(path, ()):
+            # Only references that resolve to a file in this bundle lose their '@'
+            if resolve_reference(ref, path, claude_dir) in inlined and 0 < number <= len(lines):
+                lines[number - 1] = lines[number - 1].replace(ref, ref[1:])
+        body = strip_frontmatter('\n'.join(lines)).rstrip('\n')
+        parts.append(f"<!-- source: {os.path.relpath(path, claude_dir)} -->\n{body}\n")
+    return '\n'.join(parts)
+
+
+class BundleCompiler:
+    """Incremental bundle compiler with a manifest of per-bundle dependencies."""
+
+    def __init__(self, claude_dir=CLAUDE_DIR, output_dir=OUTPUT_DIR):
+        self.claude_dir = os.path.abspath(os.path.expanduser(str(claude_dir)))
+        self.output_dir = Path(output_dir).expanduser()
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.manifest = {'version': MANIFEST_VERSION, 'counter': None, 'files': {}, 'bundles': {}}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+            if data.get('version') == MANIFEST_VERSION:
+                self.manifest = data
+        except (OSError, ValueError):
+            pass
+        self._contents = {}
+
+    def bundle_dir(self):
+        return os.path.join(self.claude_dir, "guidance", "bundles")
+
+    def read(self, path):
+        if path not in self._contents:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                self._contents[path] = f.read()
+        return self._contents[path]
+
+    def digest(self, path):
+        """Content hash, recomputed only when size/mtime changed."""
+        stat = os.stat(path)
+        entry = self.manifest['files'].get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = hashlib.sha256(self.read(path).encode('utf-8')).hexdigest()
+        self.manifest['files'][path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def build(self, compressed=False, ratio=DEFAULT_RATIO, force=False):
+        """Compile every bundle; yields (bundle, entry, status) with status built/unchanged."""
+        counter_name, count_tokens = token_counter()
+        if self.manifest['counter'] != counter_name:
+            force = True
+            self.manifest['counter'] = counter_name
+
+        references = scan(self.claude_dir)
+        edges, _ = build_graph(references, self.claude_dir)
+        root = self.bundle_dir()
+        bundles = sorted(p for p in edges if p.startswith(root + os.sep))
+        compression_cache = None
+
+        for bundle in bundles:
+            name = os.path.relpath(bundle, root)
+            files = closure(bundle, edges)
+            sources = {os.path.relpath(p, self.claude_dir): self.digest(p) for p in files}
+            entry = self.manifest['bundles'].get(name)
+            artifact = self.output_dir / name
+            compressed_artifact = artifact.with_suffix('.compressed.md')
+            up_to_date = (
+                not force and entry is not None and entry['sources'] == sources
+                and artifact.is_file()
+                and (not compressed or (entry.get('compressed_tokens') is not None
+                                        and compressed_artifact.is_file()))
+            )
+            if up_to_date:
+                yield name, entry, 'unchanged'
+                continue
+
+            document = flatten(files, references, self.claude_dir, self.read)
+            tokens = count_tokens(document)
+            header = (f"<!-- Compiled bundle {name}: {len(files)} files, {tokens} tokens "
+                      f"({counter_name}). Generated by guidance_bundles.py; do not edit. -->\n\n")
+            write_atomic(artifact, header + document)
+            entry = {'sources': sources, 'files': len(files), 'tokens': tokens,
+                     'compressed_tokens': None}
+
+            if compressed:
+                if compression_cache is None:
+                    compression_cache, compress_file = load_compressor()
+                content, stats = compress_file(str(artifact), ratio, cache=compression_cache,
+                                               sections=True)
+                write_atomic(compressed_artifact, content)
+                entry['compressed_tokens'] = count_tokens(content)
+                entry['ratio'] = stats.get('compression_ratio')
+            elif compressed_artifact.exists():
+                compressed_artifact.unlink()
+
+            self.manifest['bundles'][name] = entry
+            yield name, entry, 'built'
+
+        # Drop artifacts for bundles that no longer exist
+        current = {os.path.relpath(p, root) for p in bundles}
+        for name in [n for n in self.manifest['bundles'] if n not in current]:
+            del self.manifest['bundles'][name]
+            for path in (self.output_dir / name, (self.output_dir / name).with_suffix('.compressed.md')):
+                if path.exists():
+                    path.unlink()
+        live = {os.path.join(self.claude_dir, s) for e in self.manifest['bundles'].values() for s in e['sources']}
+        self.manifest['files'] = {p: v for p, v in self.manifest['files'].items() if p in live}
+        write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2))
+
+
+def load_compressor():
+    """Import compress_guidance from the ~/.claude root only when compression is requested."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from compress_guidance import CompressionCache, compress_guidance_file
+    return CompressionCache(), compress_guidance_file
+
+
+def write_atomic(path, content):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def print_table(bundles, counter, statuses=None):
+    print(f"{'bundle':<40}{'files':>6}{'tokens':>9}{'compressed':>12}")
+    for name, entry in sorted(bundles.items()):
+        compressed = entry.get('compressed_tokens')
+        status = f"  {statuses[name]}" if statuses else ''
+        print(f"{name:<40}{entry['files']:>6}{entry['tokens']:>9}"
+              f"{compressed if compressed is not None else '-':>12}{status}")
+    print(f"\nToken counts: {counter}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile guidance bundles into flattened artifacts')
+    parser.add_argument('--output', default=str(OUTPUT_DIR),
+                        help='Artifact directory (default: ~/.cache/claude-guidance/bundles)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Compile changed bundles')
+    build.add_argument('--root', default=str(CLAUDE_DIR),
+                       help='Claude config directory (default: ~/.claude)')
+    build.add_argument('--compressed', action='store_true',
+                       help='Also write an LLMLingua-compressed artifact per bundle')
+    build.add_argument('--ratio', type=float, default=DEFAULT_RATIO,
+                       help=f'Compression target ratio (default: {DEFAULT_RATIO})')
+    build.add_argument('--force', action='store_true', help='Rebuild every bundle')
+    show = sub.add_parser('list', help='Show compiled bundles and their token counts')
+    show.add_argument('--json', action='store_true', help='Print the manifest entries as JSON')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        compiler = BundleCompiler(args.root, args.output)
+        statuses = {}
+        for name, _, status in compiler.build(args.compressed, args.ratio, args.force):
+            statuses[name] = status
+        built = sum(1 for s in statuses.values() if s == 'built')
+        print_table(compiler.manifest['bundles'], compiler.manifest['counter'], statuses)
+        print(f"{built} built, {len(statuses) - built} unchanged -> {compiler.output_dir}")
+        return
+
+    compiler = BundleCompiler(output_dir=args.output)
+    if args.json:
+        print(json.dumps(compiler.manifest['bundles'], indent=2))
+    elif not compiler.manifest['bundles']:
+        print("No compiled bundles; run: guidance_bundles.py build")
+    else:
+        print_table(compiler.manifest['bundles'], compiler.manifest['counter'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Incremental conciseness checker for guidance files.
+
+Each file is read once. That single read yields its line count, word count,
+estimated tokens and every forbidden-phrase and hedging hit. Results are
+cached by content hash, so the hook path and repeated audits only
+re-check files that changed. Audits also record library-wide token
+totals, so token-budget trends can be reported across runs.
+
+Usage:
+    guidance_conciseness.py hook [file]       # hook mode ($CLAUDE_HOOK_PARAMS or file)
+    guidance_conciseness.py audit [--root DIR] [--json] [--top N]
+    guidance_conciseness.py trend [--json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+GUIDANCE_DIR = Path.home() / ".claude" / "guidance"
+CACHE_PATH = Path.home() / ".cache" / "claude-guidance" / "conciseness.json"
+CACHE_VERSION = 2
+HISTORY_LIMIT = 200
+
+MAX_LINES = 200
+WARN_LINES = 150
+# Roughly MAX_LINES of typical guidance prose
+FILE_TOKEN_BUDGET = 2000
+CHARS_PER_TOKEN = 4
+
+SKIP_FILES = ("README.md", "ultra-concise-enforcement.md")
+
+FORBIDDEN = (
+    "## Benefits",
+    "## Why",
+    "This helps",
+    "This improves",
+    "It's important to",
+    "You should consider",
+    "It's recommended",
+)
+HEDGING = ("consider using", "might be", "could help", "should think about")
+
+# One scan finds every forbidden phrase and hedging hit. The zero-width
+# lookahead tries every position, so overlapping phrases are all reported
+# ("You should consider using" hits both "You should consider" and
+# "consider using"); no phrase is a prefix of another, so one per position is enough
+PHRASE_RE = re.compile('(?=(' + '|'.join(re.escape(p) for p in FORBIDDEN + HEDGING) + '))')
+
+RED = '\033[0;31m'
+YELLOW = '\033[1;33m'
+NC = '\033[0m'
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def measure(text):
+    """All metrics for one file's content."""
+    forbidden = {}
+    hedging = 0
+    for match in PHRASE_RE.finditer(text):
+        phrase = match.group(1)
+        if phrase in HEDGING:
+            hedging += 1
+        else:
+            forbidden[phrase] = forbidden.get(phrase, 0) + 1
+    return {
+        # Same as wc -l: newline count
+        'lines': text.count('\n'),
+        'words': len(text.split()),
+        'tokens': estimate_tokens(text),
+        'forbidden': forbidden,
+        'hedging': hedging,
+    }
+
+
+def issues_for(metrics):
+    """(issues, failed) in the order the shell hook reported them."""
+    issues = []
+    failed = False
+    lines = metrics['lines']
+    if lines > MAX_LINES:
+        issues.append(f"❌ File exceeds {MAX_LINES} lines (current: {lines})")
+        failed = True
+    elif lines > WARN_LINES:
+        issues.append(f"⚠️  File is lengthy (current: {lines} lines, recommended: <{WARN_LINES})")
+    for phrase in FORBIDDEN:
+        if phrase in metrics['forbidden']:
+            issues.append(f"❌ Contains forbidden pattern: '{phrase}'")
+            failed = True
+    if metrics['hedging']:
+        issues.append("⚠️  Contains verbose hedging language")
+    return issues, failed
+
+
+def is_checked(path):
+    path = str(path)
+    return '/guidance/' in path and path.endswith('.md') and not path.endswith(SKIP_FILES)
+
+
+class ConcisenessCache:
+    """Per-file metrics keyed by path, validated by size/mtime then content hash."""
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = Path(cache_path)
+        self.files = {}
+        self.history = []
+        self.dirty = False
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION:
+                self.files = data['files']
+                self.history = data.get('history', [])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def check(self, path):
+        """Metrics for path, re-reading and re-measuring only when it changed."""
+        key = str(path)
+        stat = os.stat(key)
+        entry = self.files.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['metrics']
+        with open(key, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest:
+            metrics = entry['metrics']
+        else:
+            metrics = measure(raw.decode('utf-8', errors='replace'))
+        self.files[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                           'sha256': digest, 'metrics': metrics}
+        self.dirty = True
+        return metrics
+
+    def prune(self, root, current):
+        prefix = str(root) + os.sep
+        for key in [k for k in self.files if k.startswith(prefix) and k not in current]:
+            del self.files[key]
+            self.dirty = True
+
+    def record(self, root, totals):
+        """Append a library snapshot when the totals moved since the last one."""
+        snapshot = {'root': str(root), **{k: totals[k] for k in ('files', 'lines', 'words', 'tokens',
+                                                                  'over_budget', 'failing')}}
+        previous = next((h for h in reversed(self.history) if h['root'] == str(root)), None)
+        if previous and all(previous[k] == snapshot[k] for k in snapshot):
+            return
+        self.history.append({'ts': round(time.time()), **snapshot})
+        self.history = self.history[-HISTORY_LIMIT:]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({'version': CACHE_VERSION, 'files': self.files,
+                                        'history': self.history}, separators=(',', ':')),
+                            encoding='utf-8')
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+def audit(root, cache):
+    """Check every guidance file under root in one pass; returns the report dict."""
+    root = Path(root).expanduser().resolve()
+    results = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if not filename.endswith('.md') or filename in SKIP_FILES:
+                continue
+            metrics = cache.check(path)
+            issues, failed = issues_for(metrics)
+            results.append({'path': os.path.relpath(path, root), **metrics,
+                            'issues': issues, 'failed': failed})
+    cache.prune(root, {str(root / r['path']) for r in results})
+
+    categories = {}
+    for result in results:
+        category = result['path'].split(os.sep, 1)[0] if os.sep in result['path'] else '.'
+        totals = categories.setdefault(category, {'files': 0, 'tokens': 0, 'lines': 0})
+        totals['files'] += 1
+        totals['tokens'] += result['tokens']
+        totals['lines'] += result['lines']
+
+    totals = {
+        'files': len(results),
+        'lines': sum(r['lines'] for r in results),
+        'words': sum(r['words'] for r in results),
+        'tokens': sum(r['tokens'] for r in results),
+        'over_budget': sum(1 for r in results if r['tokens'] > FILE_TOKEN_BUDGET),
+        'failing': sum(1 for r in results if r['failed']),
+    }
+    cache.record(root, totals)
+    return {
+        'root': str(root),
+        'totals': totals,
+        'categories': dict(sorted(categories.items(), key=lambda kv: -kv[1]['tokens'])),
+        'files': sorted(results, key=lambda r: r['path']),
+        'trend': trend(cache, root),
+    }
+
+
+def trend(cache, root):
+    """Library snapshots for root, oldest first, with token deltas."""
+    snapshots = [h for h in cache.history if h['root'] == str(root)]
+    previous = None
+    rows = []
+    for snapshot in snapshots:
+        rows.append({**snapshot, 'delta_tokens': snapshot['tokens'] - previous['tokens'] if previous else 0})
+        previous = snapshot
+    return rows
+
+
+def run_hook(file_path, cache):
+    """Single-file hook check with the shell hook's output and exit codes."""
+    if not file_path or not is_checked(file_path) or not os.path.isfile(file_path):
+        return 0
+    metrics = cache.check(file_path)
+    issues, failed = issues_for(metrics)
+    if not issues:
+        return 0
+
+    print(f"\n{RED}━━━ GUIDANCE CONCISENESS VALIDATION ━━━{NC}")
+    print(f"File: {os.path.basename(file_path)}")
+    print("\n" + "\n".join(issues) + "\n")
+    if failed:
+        print(f"{RED}REQUIRED FIXES:{NC}")
+        print("1. DELETE all 'Benefits' and 'Why' sections")
+        print("2. REMOVE explanatory text (This helps..., It's important...)")
+        print("3. REPLACE hedging language with imperatives (MUST/NEVER)")
+        print(f"4. CUT file to under {MAX_LINES} lines")
+        print("")
+        print("Apply these rules from: @~/.claude/guidance/ai-development/ultra-concise-enforcement.md")
+        print(f"{RED}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{NC}\n")
+        return 1
+    print(f"{YELLOW}Consider applying ultra-concise enforcement for better clarity.{NC}")
+    print(f"{YELLOW}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{NC}\n")
+    return 0
+
+
+def hook_file_path(argument):
+    """File path from $CLAUDE_HOOK_PARAMS, falling back to the argument."""
+    try:
+        params = json.loads(os.environ.get('CLAUDE_HOOK_PARAMS') or '{}')
+    except ValueError:
+        params = {}
+    return (params.get('file_path') if isinstance(params, dict) else None) or argument
+
+
+def print_trend(rows):
+    if not rows:
+        print("No audits recorded yet")
+        return
+    print(f"{'date':<17}{'files':>6}{'tokens':>10}{'Δ':>8}{'over':>6}{'failing':>9}")
+    for row in rows:
+        stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['ts']))
+        print(f"{stamp:<17}{row['files']:>6}{row['tokens']:>10}{row['delta_tokens']:>+8}"
+              f"{row['over_budget']:>6}{row['failing']:>9}")
+
+
+def print_audit(report, top):
+    totals = report['totals']
+    print(f"Guidance library: {report['root']}")
+    print(f"  {totals['files']} files, {totals['lines']} lines, {totals['words']} words, "
+          f"~{totals['tokens']} tokens")
+    print(f"  {totals['failing']} failing, {totals['over_budget']} over the "
+          f"{FILE_TOKEN_BUDGET}-token budget\n")
+
+    failing = [r for r in report['files'] if r['issues']]
+    for result in failing:
+        print(f"{result['path']} ({result['lines']} lines, ~{result['tokens']} tokens)")
+        for issue in result['issues']:
+            print(f"  {issue}")
+    if failing:
+        print()
+
+    print("Tokens by category:")
+    for category, totals in report['categories'].items():
+        print(f"  {category:<28}{totals['files']:>5} files{totals['tokens']:>9} tokens")
+    print(f"\nLargest files (top {top}):")
+    for result in sorted(report['files'], key=lambda r: -r['tokens'])[:top]:
+        print(f"  ~{result['tokens']:>6} tokens  {result['path']}")
+
+    if len(report['trend']) > 1:
+        print("\nToken trend:")
+        print_trend(report['trend'][-10:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check guidance files for conciseness')
+    sub = parser.add_subparsers(dest='command', required=True)
+    hook = sub.add_parser('hook', help='Check one edited file (hook mode)')
+    hook.add_argument('file', nargs='?')
+    for name, help_text in (('audit', 'Check the whole guidance library'),
+                            ('trend', 'Show library token totals over past audits')):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument('--root', default=str(GUIDANCE_DIR),
+                             help='Guidance directory (default: ~/.claude/guidance)')
+        command.add_argument('--json', action='store_true', help='Print as JSON')
+    sub.choices['audit'].add_argument('--top', type=int, default=10,
+                                      help='Largest files to list (default: 10)')
+    args = parser.parse_args()
+
+    cache = ConcisenessCache()
+    if args.command == 'hook':
+        status = run_hook(hook_file_path(args.file), cache)
+        cache.save()
+        sys.exit(status)
+
+    root = Path(args.root).expanduser().resolve()
+    if args.command == 'trend':
+        rows = trend(cache, root)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_trend(rows)
+        return
+
+    if not root.is_dir():
+        print(f"Guidance directory not found: {root}")
+        sys.exit(1)
+    report = audit(root, cache)
+    cache.save()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_audit(report, args.top)
+    sys.exit(1 if report['totals']['failing'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Persistent tag index over guidance frontmatter.
+
+Indexes ~/.claude/guidance (global) and .claude/guidance (project) into an
+on-disk inverted index of tag -> files, with each file's title and
+description. The inverted map is stored, not rebuilt per query.
+
+Each query refreshes the index incrementally. A directory whose mtime is
+unchanged keeps its stored listing instead of being re-listed; every file
+is still stat'ed, since an in-place edit leaves its directory's mtime
+alone. Files are re-read only when size/mtime changed, and YAML is
+re-parsed only when the content hash changed.
+
+Usage:
+    guidance_index.py <tag> [<tag> ...] [--any] [--json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+GUIDANCE_DIR = Path.home() / ".claude" / "guidance"
+PROJECT_GUIDANCE_DIR = Path(".claude") / "guidance"
+INDEX_PATH = Path.home() / ".cache" / "claude-guidance" / "tag-index.json"
+INDEX_VERSION = 3
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+TITLE_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+
+def default_roots():
+    """(scope, directory) pairs searched by default."""
+    return [("global", GUIDANCE_DIR), ("project", PROJECT_GUIDANCE_DIR)]
+
+
+def parse_frontmatter(content):
+    """Parse YAML frontmatter into a dict; {} when absent or invalid."""
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return {}
+    try:
+        import yaml
+        frontmatter = yaml.safe_load(match.group(1))
+    except Exception:
+        return {}
+    return frontmatter if isinstance(frontmatter, dict) else {}
+
+
+def describe_file(content, frontmatter):
+    """Tags, title and description for one guidance file."""
+    tags = frontmatter.get('tags') or []
+    if isinstance(tags, str):
+        tags = [tags]
+    title = frontmatter.get('title')
+    if not title:
+        body = FRONTMATTER_RE.sub('', content, count=1)
+        heading = TITLE_RE.search(body)
+        title = heading.group(1).strip() if heading else None
+    return {
+        'tags': sorted({str(tag) for tag in tags}),
+        'title': title,
+        'description': frontmatter.get('description'),
+    }
+
+
+class TagIndex:
+    """On-disk inverted index of guidance tags, refreshed incrementally."""
+
+    def __init__(self, index_path=INDEX_PATH):
+        self.index_path = Path(index_path)
+        self.files = {}
+        self.dirs = {}
+        self.tags = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+            if data.get('version') == INDEX_VERSION:
+                self.files = data['files']
+                self.dirs = data['dirs']
+                self.tags = data['tags']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def refresh(self, roots):
+        """
+        Bring entries under roots up to date with the filesystem.
+
+        Returns the absolute paths of markdown files currently under roots.
+        """
+        current = set()
+        visited = set()
+        seen_roots = set()
+        for scope, root in roots:
+            root = Path(root).expanduser()
+            if not root.is_dir() or root.resolve() in seen_roots:
+                continue
+            root = root.resolve()
+            seen_roots.add(root)
+            self._refresh_dir(str(root), str(root), scope, current, visited)
+
+        # Drop entries for files and directories that disappeared from the searched roots
+        root_prefixes = tuple(
+            str(Path(root).expanduser().resolve()) + os.sep for _, root in roots
+        )
+        for key in [k for k in self.files if k.startswith(root_prefixes) and k not in current]:
+            del self.files[key]
+            self.dirty = True
+        for key in [k for k in self.dirs if (k + os.sep).startswith(root_prefixes) and k not in visited]:
+            del self.dirs[key]
+            self.dirty = True
+        return current
+
+    def _refresh_dir(self, directory, root, scope, current, visited):
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            return
+        visited.add(directory)
+        listing = self.dirs.get(directory)
+        # The directory mtime only says whether files were added or removed
+        if not listing or listing['mtime_ns'] != stat.st_mtime_ns:
+            names, subdirs = [], []
+            try:
+                with os.scandir(directory) as it:
+                    for item in it:
+                        if item.is_dir():
+                            subdirs.append(item.name)
+                        elif item.name.endswith('.md') and item.name != "README.md":
+                            names.append(item.name)
+            except OSError:
+                return
+            listing = self.dirs[directory] = {'mtime_ns': stat.st_mtime_ns,
+                                              'files': sorted(names), 'dirs': sorted(subdirs)}
+            self.dirty = True
+
+        for name in listing['files']:
+            key = os.path.join(directory, name)
+            self._refresh_file(Path(key), key, scope, os.path.relpath(key, root))
+            if key in self.files:
+                current.add(key)
+        for name in listing['dirs']:
+            self._refresh_dir(os.path.join(directory, name), root, scope, current, visited)
+
+    def _refresh_file(self, md_file, key, scope, rel_path):
+        try:
+            stat = md_file.stat()
+        except OSError:
+            return
+        entry = self.files.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size \
+                and entry['scope'] == scope:
+            return
+
+        try:
+            raw = md_file.read_bytes()
+        except OSError:
+            return
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest and entry['scope'] == scope:
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            content = raw.decode('utf-8', errors='replace')
+            entry = {
+                'scope': scope,
+                'path': rel_path,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                **describe_file(content, parse_frontmatter(content)),
+            }
+            self.files[key] = entry
+        self.dirty = True
+
+    def save(self):
+        """Persist the index, with its rebuilt inverted tag map, atomically if anything changed."""
+        if not self.dirty:
+            return
+        self.tags = self.tag_map(self.files)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': INDEX_VERSION, 'files': self.files, 'dirs': self.dirs,
+                        'tags': self.tags}, separators=(',', ':')),
+            encoding='utf-8',
+        )
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    def tag_map(self, keys):
+        """Inverted tag -> sorted file keys, limited to keys."""
+        inverted = {}
+        for key in keys:
+            for tag in self.files[key]['tags']:
+                inverted.setdefault(tag, []).append(key)
+        return {tag: sorted(found) for tag, found in inverted.items()}
+
+    def search(self, tags, keys, match_any=False):
+        """Entries tagged with all (or, with match_any, any) of tags."""
+        # The stored map is stale once entries changed; it is rebuilt on save()
+        inverted = self.tag_map(keys) if self.dirty else self.tags
+        sets = [set(inverted.get(tag, ())) & keys for tag in tags]
+        if not sets:
+            return []
+        found = set().union(*sets) if match_any else set.intersection(*sets)
+        return sorted((self.files[key] for key in found), key=lambda e: (e['path'], e['scope']))
+
+
+def search_tags(tags, match_any=False, roots=None, index_path=INDEX_PATH):
+    """Refresh the index and return matching entries."""
+    index = TagIndex(index_path)
+    keys = index.refresh(roots or default_roots())
+    results = index.search(tags, keys, match_any)
+    index.save()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search guidance files by tag')
+    parser.add_argument('tags', nargs='+', help='Tags to match (all must match unless --any)')
+    parser.add_argument('--any', action='store_true', help='Match files with any of the tags')
+    parser.add_argument('--json', action='store_true', help='Print matches as JSON')
+    args = parser.parse_args()
+
+    results = search_tags(args.tags, match_any=args.any)
+
+    if args.json:
+        print(json.dumps([
+            {k: e[k] for k in ('path', 'scope', 'title', 'description', 'tags')} for e in results
+        ], indent=2))
+        return
+
+    label = "' or '".join(args.tags) if args.any else "' and '".join(args.tags)
+    if results:
+        print(f"Guidance modules tagged with '{label}':\n")
+        for i, entry in enumerate(results, 1):
+            print(f"{i}. {entry['path']} ({entry['scope']})")
+    else:
+        print(f"No guidance modules found with tag '{label}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Single-pass @-reference validator for the guidance library.
+
+Tokenizes each markdown file once, ignoring references inside fenced code,
+inline code and HTML comments. It builds the @-reference graph across
+guidance/, agents/, commands/ and project-guidance/ and reports broken
+links, orphaned guidance modules and reference cycles. Per-file results
+are cached by content hash, so unchanged files are not re-scanned.
+
+Usage:
+    guidance_links.py [--root ~/.claude] [--json] [--no-orphans] [--no-cycles]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+SCAN_DIRS = ("guidance", "agents", "commands", "project-guidance")
+# Only modules in these trees are expected to be referenced by something;
+# agents and commands are entry points.
+ORPHAN_DIRS = ("guidance", "project-guidance")
+CACHE_PATH = Path.home() / ".cache" / "claude-guidance" / "link-graph.json"
+CACHE_VERSION = 1
+
+REFERENCE_RE = re.compile(r'@[^\s`<>()\[\]"\']*\.md')
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+INLINE_CODE_RE = re.compile(r'(`+).*?\1')
+
+# Example references used in documentation, never real files
+PLACEHOLDERS = ("category", "module", "layer", "bundle-name", "relevant-module")
+
+
+def extract_references(text):
+    """
+    Return [(line_number, reference)] for @-references in markdown text.
+
+    Skips fenced code blocks, inline code spans and HTML comments
+    (including comments spanning several lines).
+    """
+    references = []
+    fence = None
+    in_comment = False
+    for number, line in enumerate(text.splitlines(), 1):
+        if fence:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            continue
+        if not in_comment:
+            match = FENCE_RE.match(line)
+            if match:
+                fence = match.group(1)
+                continue
+
+        visible = []
+        rest = line
+        while rest:
+            if in_comment:
+                end = rest.find('-->')
+                if end == -1:
+                    rest = ''
+                    break
+                rest = rest[end + 3:]
+                in_comment = False
+            start = rest.find('<!--')
+            if start == -1:
+                visible.append(rest)
+                break
+            visible.append(rest[:start])
+            rest = rest[start + 4:]
+            in_comment = True
+
+        code_free = INLINE_CODE_RE.sub('', ''.join(visible))
+        for ref in REFERENCE_RE.findall(code_free):
+            references.append((number, ref.rstrip('.,;:')))
+    return references
+
+
+def is_placeholder(ref):
+    return any(word in ref for word in PLACEHOLDERS)
+
+
+def resolve_reference(ref, source, claude_dir):
+    """
+    Resolve an @-reference to an absolute path, or None if it is not checkable.
+
+    @~/.claude/... maps into claude_dir (so a checkout validates against
+    itself), other @~/ paths into the home directory, @./ and @../ are
+    relative to the referencing file, and @.claude/ project references
+    resolve against claude_dir as the shell validator did. Anything else
+    (e.g. @specs/...) is project-relative and skipped.
+    """
+    path = ref[1:]
+    if path.startswith('~/.claude/'):
+        return os.path.normpath(os.path.join(claude_dir, path[len('~/.claude/'):]))
+    if path.startswith('~/'):
+        return os.path.normpath(os.path.join(Path.home(), path[2:]))
+    if path.startswith(('../', './')):
+        return os.path.normpath(os.path.join(os.path.dirname(source), path))
+    if path.startswith('.claude/'):
+        return os.path.normpath(os.path.join(claude_dir, path[len('.claude/'):]))
+    return None
+
+
+def load_cache(cache_path):
+    try:
+        data = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(cache_path, files):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps({'version': CACHE_VERSION, 'files': files}, separators=(',', ':')),
+                        encoding='utf-8')
+    os.replace(tmp_path, cache_path)
+
+
+def scan(claude_dir, cache_path=CACHE_PATH):
+    """
+    Return {absolute_path: [(line, ref)]} for every markdown file under SCAN_DIRS.
+
+    Files whose size and mtime match the cache are not opened; files whose
+    content hash matches are not re-tokenized.
+    """
+    cached = load_cache(cache_path)
+    files = {}
+    changed = False
+    for name in SCAN_DIRS:
+        root = os.path.join(claude_dir, name)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                if not filename.endswith('.md'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entry = cached.get(path)
+                if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                    files[path] = entry
+                    continue
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                digest = hashlib.sha256(raw).hexdigest()
+                if not entry or entry['sha256'] != digest:
+                    refs = extract_references(raw.decode('utf-8', errors='replace'))
+                else:
+                    refs = entry['refs']
+                files[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                               'sha256': digest, 'refs': refs}
+                changed = True
+    if changed or set(files) != set(cached):
+        save_cache(cache_path, files)
+    return {path: [tuple(r) for r in entry['refs']] for path, entry in files.items()}
+
+
+def build_graph(references, claude_dir):
+    """Return (edges, broken): edges maps file -> set of referenced files."""
+    edges = {path: set() for path in references}
+    broken = []
+    for source, refs in references.items():
+        for line, ref in refs:
+            if is_placeholder(ref):
+                continue
+            target = resolve_reference(ref, source, claude_dir)
+            if target is None:
+                continue
+            if os.path.isfile(target):
+                edges[source].add(target)
+            else:
+                broken.append((source, line, ref))
+    return edges, sorted(broken)
+
+
+def find_orphans(edges, claude_dir):
+    """Guidance modules that nothing references (README.md excluded)."""
+    referenced = set().union(*edges.values()) if edges else set()
+    prefixes = tuple(os.path.join(claude_dir, d) + os.sep for d in ORPHAN_DIRS)
+    return sorted(
+        path for path in edges
+        if path.startswith(prefixes) and os.path.basename(path) != 'README.md'
+        and path not in referenced
+    )
+
+
+def find_cycles(edges):
+    """Strongly connected components that form cycles (Tarjan, iterative)."""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    cycles = []
+    counter = 0
+
+    for root in sorted(edges):
+        if root in index:
+            continue
+        work = [(root, iter(sorted(edges.get(root, ()))))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(edges.get(child, ())))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in edges.get(node, ()):
+                    cycles.append(sorted(component))
+    return sorted(cycles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate @-references across the guidance library')
+    parser.add_argument('--root', default=str(CLAUDE_DIR),
+                        help='Claude config directory to scan (default: ~/.claude)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--no-orphans', action='store_true', help='Skip the orphan report')
+    parser.add_argument('--no-cycles', action='store_true', help='Skip the cycle report')
+    args = parser.parse_args()
+
+    claude_dir = os.path.abspath(os.path.expanduser(args.root))
+    references = scan(claude_dir)
+    edges, broken = build_graph(references, claude_dir)
+    orphans = [] if args.no_orphans else find_orphans(edges, claude_dir)
+    cycles = [] if args.no_cycles else find_cycles(edges)
+
+    def rel(path):
+        return os.path.relpath(path, claude_dir)
+
+    if args.json:
+        print(json.dumps({
+            'files': len(references),
+            'broken': [{'file': rel(s), 'line': line, 'reference': ref} for s, line, ref in broken],
+            'orphans': [rel(p) for p in orphans],
+            'cycles': [[rel(p) for p in cycle] for cycle in cycles],
+        }, indent=2))
+    else:
+        for source, line, ref in broken:
+            print(f"{rel(source)}:{line}: {ref}")
+        if orphans:
+            print(f"\nOrphaned modules ({len(orphans)}):")
+            for path in orphans:
+                print(f"  {rel(path)}")
+        if cycles:
+            print(f"\nReference cycles ({len(cycles)}, files that reach each other):")
+            for cycle in cycles:
+                print(f"  {', '.join(rel(p) for p in cycle)}")
+
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+BM25 full-text search over guidance, agents, commands and research notes.
+
+Indexes markdown under guidance/, project-guidance/, agents/, commands/,
+archived-guidance/ and research/ into an on-disk inverted index at
+~/.cache/claude-guidance/search-index-<root hash>.json, one per --root so
+corpora never mix in the ranking statistics. Headings, titles and
+frontmatter descriptions are weighted above body text. Each query
+refreshes the index incrementally: files are re-read only when size/mtime
+changed and re-tokenized only when the content hash changed. Only the top
+hits are opened again to build snippets.
+
+Usage:
+    guidance_search.py <query> [--scope guidance,agents] [--limit N] [--json]
+
+Python API:
+    from guidance_search import search
+    search("service objects", limit=5)
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+SCOPES = ("guidance", "project-guidance", "agents", "commands", "archived-guidance", "research")
+INDEX_DIR = Path.home() / ".cache" / "claude-guidance"
+INDEX_VERSION = 1
+
+# BM25 parameters; heading terms count HEADING_WEIGHT times toward term frequency
+K1 = 1.2
+B = 0.75
+HEADING_WEIGHT = 3
+SNIPPET_CHARS = 160
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_'+#-]*[a-z0-9+#]|[a-z0-9]")
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its of on or "
+    "that the their then there these this to was were will with you your".split()
+)
+
+
+def index_path_for(claude_dir):
+    """Index file for one resolved claude_dir."""
+    digest = hashlib.sha256(str(claude_dir).encode('utf-8')).hexdigest()[:16]
+    return INDEX_DIR / f"search-index-{digest}.json"
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def analyze(text):
+    """(heading_terms, body_terms, title) for one markdown document."""
+    heading_parts = []
+    body_parts = []
+    title = None
+    lines = text.split('\n')
+    start = 0
+    if text.startswith('---\n'):
+        for i in range(1, len(lines)):
+            if lines[i].strip() == '---':
+                start = i + 1
+                break
+        for line in lines[1:start - 1]:
+            key, _, value = line.partition(':')
+            if key.strip() in ('title', 'description', 'name', 'tags'):
+                heading_parts.append(value)
+                if key.strip() in ('title', 'name') and value.strip() and title is None:
+                    title = value.strip().strip('"\'')
+            else:
+                body_parts.append(line)
+
+    fence = None
+    for line in lines[start:]:
+        if fence:
+            if line.strip().startswith(fence):
+                fence = None
+            body_parts.append(line)
+            continue
+        match = FENCE_RE.match(line)
+        if match:
+            fence = match.group(1)
+            continue
+        if line.startswith('#'):
+            heading = line.lstrip('#').strip()
+            heading_parts.append(heading)
+            if title is None and line.startswith('# '):
+                title = heading
+        else:
+            body_parts.append(line)
+    return tokenize('\n'.join(heading_parts)), tokenize('\n'.join(body_parts)), title
+
+
+def term_counts(heading_terms, body_terms):
+    """{term: [body_tf, heading_tf]}"""
+    counts = {}
+    for term in body_terms:
+        counts.setdefault(term, [0, 0])[0] += 1
+    for term in heading_terms:
+        counts.setdefault(term, [0, 0])[1] += 1
+    return counts
+
+
+class SearchIndex:
+    """
+    Inverted index persisted as JSON.
+
+    docs maps a numeric id to path/hash/length metadata; postings maps each
+    term to a flat [doc_id, body_tf, heading_tf, ...] list.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+        self.docs = {}
+        self.postings = {}
+        self.next_id = 0
+        self.dirty = False
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+            if data.get('version') == INDEX_VERSION:
+                self.docs = {int(k): v for k, v in data['docs'].items()}
+                self.postings = data['postings']
+                self.next_id = data['next_id']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def refresh(self, claude_dir, scopes=SCOPES):
+        """Bring the index up to date with markdown files under claude_dir."""
+        claude_dir = str(Path(claude_dir).expanduser().resolve())
+        by_path = {doc['path']: doc_id for doc_id, doc in self.docs.items()}
+        seen = set()
+        removed = set()
+        added = {}
+        for scope in scopes:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(claude_dir, scope)):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for filename in filenames:
+                    if not filename.endswith('.md'):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    seen.add(path)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    doc_id = by_path.get(path)
+                    doc = self.docs.get(doc_id)
+                    if doc and doc['mtime_ns'] == stat.st_mtime_ns and doc['size'] == stat.st_size:
+                        continue
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    digest = hashlib.sha256(raw).hexdigest()
+                    if doc and doc['sha256'] == digest:
+                        doc.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                        self.dirty = True
+                        continue
+                    if doc_id is not None:
+                        removed.add(doc_id)
+                    heading_terms, body_terms, title = analyze(raw.decode('utf-8', errors='replace'))
+                    new_id = self.next_id
+                    self.next_id += 1
+                    self.docs[new_id] = {
+                        'path': path, 'scope': scope, 'title': title, 'sha256': digest,
+                        'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                        'length': len(body_terms) + HEADING_WEIGHT * len(heading_terms),
+                    }
+                    added[new_id] = term_counts(heading_terms, body_terms)
+
+        prefixes = tuple(os.path.join(claude_dir, scope) + os.sep for scope in scopes)
+        removed.update(doc_id for doc_id, doc in self.docs.items()
+                       if doc['path'].startswith(prefixes) and doc['path'] not in seen)
+        if removed or added:
+            self._apply(removed, added)
+
+    def _apply(self, removed, added):
+        for doc_id in removed:
+            self.docs.pop(doc_id, None)
+        if removed:
+            for term in list(self.postings):
+                flat = self.postings[term]
+                kept = []
+                for i in range(0, len(flat), 3):
+                    if flat[i] not in removed:
+                        kept.extend(flat[i:i + 3])
+                if kept:
+                    self.postings[term] = kept
+                else:
+                    del self.postings[term]
+        for doc_id, counts in added.items():
+            for term, (body_tf, heading_tf) in counts.items():
+                self.postings.setdefault(term, []).extend((doc_id, body_tf, heading_tf))
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({
+            'version': INDEX_VERSION, 'next_id': self.next_id,
+            'docs': self.docs, 'postings': self.postings,
+        }, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    def score(self, query, scopes=None):
+        """[(score, doc_id)] for documents matching any query term, best first."""
+        terms = tokenize(query)
+        if not terms or not self.docs:
+            return []
+        allowed = None if scopes is None else {d for d, doc in self.docs.items() if doc['scope'] in scopes}
+        n = len(self.docs)
+        avg_length = sum(doc['length'] for doc in self.docs.values()) / n or 1.0
+        scores = {}
+        for term in set(terms):
+            flat = self.postings.get(term)
+            if not flat:
+                continue
+            df = len(flat) // 3
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for i in range(0, len(flat), 3):
+                doc_id = flat[i]
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                tf = flat[i + 1] + HEADING_WEIGHT * flat[i + 2]
+                norm = K1 * (1 - B + B * self.docs[doc_id]['length'] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        return sorted(((s, d) for d, s in scores.items()), key=lambda x: (-x[0], self.docs[x[1]]['path']))
+
+
+def snippet(path, terms):
+    """(line_number, text) of the line with the most query terms, trimmed around the first hit."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return None, ''
+    wanted = set(terms)
+    best = (0, None)
+    for number, line in enumerate(lines, 1):
+        hits = len(wanted.intersection(tokenize(line)))
+        if hits > best[0]:
+            best = (hits, number)
+            if hits == len(wanted):
+                break
+    if best[1] is None:
+        return None, ''
+    line = lines[best[1] - 1].strip()
+    if len(line) > SNIPPET_CHARS:
+        lowered = line.lower()
+        first = min((lowered.find(t) for t in wanted if t in lowered), default=0)
+        start = max(0, first - SNIPPET_CHARS // 3)
+        line = ('…' if start else '') + line[start:start + SNIPPET_CHARS] + '…'
+    return best[1], line
+
+
+def search(query, limit=10, scopes=None, claude_dir=CLAUDE_DIR, index_path=None):
+    """
+    Refresh the index and return the top hits for query.
+
+    Each hit is {'path', 'scope', 'title', 'score', 'line', 'snippet'}, with
+    path relative to claude_dir.
+    """
+    claude_dir = Path(claude_dir).expanduser().resolve()
+    index = SearchIndex(index_path or index_path_for(claude_dir))
+    index.refresh(claude_dir)
+    index.save()
+    terms = tokenize(query)
+    hits = []
+    for score, doc_id in index.score(query, scopes)[:limit]:
+        doc = index.docs[doc_id]
+        line, text = snippet(doc['path'], terms)
+        hits.append({
+            'path': os.path.relpath(doc['path'], claude_dir),
+            'scope': doc['scope'],
+            'title': doc['title'],
+            'score': round(score, 3),
+            'line': line,
+            'snippet': text,
+        })
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search over guidance, agents and commands')
+    parser.add_argument('query', nargs='+', help='Search terms')
+    parser.add_argument('--scope', help=f"Comma-separated scopes to search ({', '.join(SCOPES)})")
+    parser.add_argument('--limit', type=int, default=10, help='Maximum results (default: 10)')
+    parser.add_argument('--root', default=str(CLAUDE_DIR),
+                        help='Claude config directory (default: ~/.claude)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    scopes = None
+    if args.scope:
+        scopes = {s.strip() for s in args.scope.split(',') if s.strip()}
+        unknown = scopes - set(SCOPES)
+        if unknown:
+            print(f"Unknown scope(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+            sys.exit(2)
+
+    query = ' '.join(args.query)
+    hits = search(query, args.limit, scopes, args.root)
+    if args.json:
+        print(json.dumps(hits, indent=2))
+        return
+    if not hits:
+        print(f"No matches for '{query}'")
+        return
+    for i, hit in enumerate(hits, 1):
+        title = f" — {hit['title']}" if hit['title'] else ''
+        print(f"{i}. {hit['path']}{title} ({hit['score']:.2f})")
+        if hit['snippet']:
+            print(f"   {hit['line']}: {hit['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
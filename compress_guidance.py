@@ -1,92 +1,549 @@
 #!/usr/bin/env python3
 """
 Compress guidance files using LLMLingua with preservation of markdown structure.
+
+llmlingua (and with it torch/transformers) is imported on first use. When a
+compression daemon is running (compression_daemon.py), the CLI sends its
+files there and never loads the model itself; otherwise, or when --jobs
+asks for more than one worker, it compresses in-process.
 """
+import argparse
+import glob
+import hashlib
+import json
 import os
+import re
 import sys
-from llmlingua import PromptCompressor
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def compress_guidance_file(file_path, target_ratio=0.5):
-    """Compress guidance file using LLMLingua with markdown-aware settings."""
+MODEL_NAME = "microsoft/llmlingua-2-bert-base-multilingual-cased"
+DEFAULT_FILE = "/home/matt/.claude/guidance/documentation/task-handoff-creation.md"
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/compress-guidance")
+DEFAULT_CACHE_MAX_ENTRIES = 500
 
-    # Read the original file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        original_content = f.read()
+# Define force tokens to preserve markdown structure
+FORCE_TOKENS = [
+    '\n', '#', '-', '*', '`', '```',
+    '**', '__', '|', '>', '[', ']', '(', ')',
+    'md', 'bash', 'markdown', 'yaml', 'json'
+]
+
+# Inference backends: PyTorch, or ONNX Runtime on CPU (fp32 or int8
+# dynamically quantized); see onnx_backend.py
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+DEFAULT_BACKEND = 'torch'
+
+# Backend used by get_compressor() when none is given
+_backend = DEFAULT_BACKEND
+# Process-wide compressors per backend, loaded on first use
+_compressors = {}
+
+
+def set_backend(backend):
+    """Select the inference backend for this process."""
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    _backend = backend
+
+
+def model_id(backend=None):
+    """Model identity for cache keys; ONNX backends can differ slightly from PyTorch."""
+    backend = backend or _backend
+    return MODEL_NAME if backend == 'torch' else f"{MODEL_NAME}#{backend}"
+
+
+def get_compressor(backend=None):
+    """Return the shared PromptCompressor for backend, loading the model on first call."""
+    backend = backend or _backend
+    if backend not in _compressors:
+        if backend == 'torch':
+            from llmlingua import PromptCompressor
+            _compressors[backend] = PromptCompressor(
+                model_name=MODEL_NAME,
+                use_llmlingua2=True
+            )
+        else:
+            from onnx_backend import load_onnx_compressor
+            _compressors[backend] = load_onnx_compressor(quantized=backend == 'onnx-int8')
+    return _compressors[backend]
 
-    # Initialize the compressor
-    llm_lingua = PromptCompressor(
-        model_name="microsoft/llmlingua-2-bert-base-multilingual-cased",
-        use_llmlingua2=True
-    )
 
-    # Define force tokens to preserve markdown structure
-    force_tokens = [
-        '\n', '#', '-', '*', '`', '```',
-        '**', '__', '|', '>', '[', ']', '(', ')',
-        'md', 'bash', 'markdown', 'yaml', 'json'
-    ]
+class CompressionCache:
+    """
+    On-disk cache of compression results with LRU eviction.
 
-    # Compress the content
+    Entries are JSON files named by a key over the source content, target
+    ratio, force tokens and model name. File mtime records last use, so
+    eviction drops the least recently read entries first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content, target_ratio, force_tokens=FORCE_TOKENS, model_name=None,
+                 kind='file'):
+        """Hash everything that can change the compressed output."""
+        model_name = model_name or model_id()
+        h = hashlib.sha256()
+        for part in (kind, content, repr(target_ratio), json.dumps(force_tokens), model_name):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def has(self, key):
+        """True if an entry exists for key (does not count as a use)."""
+        return os.path.exists(self._entry_path(key))
+
+    def get(self, key):
+        """Return (compressed_content, stats) or None, marking the entry as recently used."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry['compressed'], entry['stats']
+
+    def put(self, key, compressed_content, stats):
+        """Store an entry atomically, then evict down to max_entries."""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'compressed': compressed_content, 'stats': stats}, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries beyond max_entries."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# compress_prompt settings tuned for markdown guidance; see benchmark_compression.py
+COMPRESS_SETTINGS = {
+    'condition_compare': True,
+    'condition_in_question': "guidance",
+    'rank_method': "longllmlingua",
+    'use_sentence_level_filter': False,
+    'use_context_level_filter': True,
+    'use_token_level_filter': True,
+    'keep_split': True,
+    'keep_first_sentence': 3,
+    'keep_last_sentence': 1,
+    'keep_sentence_number': 5,
+    'high_priority_bonus': 100,
+    'context_budget': "+100",
+    'drop_consecutive': True,
+}
+
+
+def compress_text(llm_lingua, text, target_ratio, **overrides):
+    """Run LLMLingua over text; returns (compressed_text, ratio).
+
+    overrides replace individual COMPRESS_SETTINGS entries.
+    """
+    settings = dict(COMPRESS_SETTINGS, **overrides)
     compressed_result = llm_lingua.compress_prompt(
-        original_content,
-        target_token=int(len(original_content.split()) * target_ratio),
-        condition_compare=True,
-        condition_in_question="guidance",
-        rank_method="longllmlingua",
-        use_sentence_level_filter=False,
-        use_context_level_filter=True,
-        use_token_level_filter=True,
-        keep_split=True,
-        keep_first_sentence=3,
-        keep_last_sentence=1,
-        keep_sentence_number=5,
-        high_priority_bonus=100,
-        context_budget="+100",
+        text,
+        target_token=int(len(text.split()) * target_ratio),
         token_budget_ratio=target_ratio,
-        force_tokens=force_tokens,
-        drop_consecutive=True
+        force_tokens=FORCE_TOKENS,
+        **settings
     )
+    compressed = compressed_result['compressed_prompt']
+    words = len(text.split())
+    return compressed, compressed_result.get('ratio', len(compressed.split()) / words if words else 1.0)
+
 
-    compressed_content = compressed_result['compressed_prompt']
+def build_stats(original_content, compressed_content, compression_ratio):
+    """Word/line statistics shared by whole-file and sectioned compression.
 
-    # Calculate statistics
+    Empty or whitespace-only input has nothing to compress: its ratios are 1.0.
+    """
     original_words = len(original_content.split())
     compressed_words = len(compressed_content.split())
     original_lines = len(original_content.splitlines())
     compressed_lines = len(compressed_content.splitlines())
 
-    stats = {
+    return {
         'original_words': original_words,
         'compressed_words': compressed_words,
         'original_lines': original_lines,
         'compressed_lines': compressed_lines,
-        'word_ratio': compressed_words / original_words,
-        'line_ratio': compressed_lines / original_lines,
-        'compression_ratio': compressed_result.get('ratio', compressed_words / original_words)
+        'word_ratio': compressed_words / original_words if original_words else 1.0,
+        'line_ratio': compressed_lines / original_lines if original_lines else 1.0,
+        'compression_ratio': compression_ratio
     }
 
-    return compressed_content, stats
 
-def main():
-    file_path = "/home/matt/.claude/guidance/documentation/task-handoff-creation.md"
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+HEADING_RE = re.compile(r'^ {0,3}#{1,6}(\s|$)')
+
+# Prose bodies shorter than this are kept verbatim; compressing them saves
+# almost nothing and tends to mangle list items and short notes.
+MIN_SECTION_WORDS = 20
+
+
+def split_sections(content):
+    """
+    Split markdown into ('frontmatter' | 'code' | 'prose', text) sections.
+
+    Frontmatter and fenced code blocks become their own sections. Prose is
+    split at every heading, with the heading line kept at the top of the
+    section it introduces. Joining the texts reproduces content exactly.
+    """
+    lines = content.splitlines(keepends=True)
+    sections = []
+    current = []
+    i = 0
+
+    if lines and lines[0].rstrip('\r\n') == '---':
+        for j in range(1, len(lines)):
+            if lines[j].rstrip('\r\n') == '---':
+                sections.append(('frontmatter', ''.join(lines[:j + 1])))
+                i = j + 1
+                break
+
+    def flush():
+        if current:
+            sections.append(('prose', ''.join(current)))
+            current.clear()
+
+    while i < len(lines):
+        line = lines[i]
+        fence = FENCE_RE.match(line)
+        if fence:
+            flush()
+            marker = fence.group(1)
+            block = [line]
+            i += 1
+            while i < len(lines):
+                closing = lines[i].strip()
+                block.append(lines[i])
+                i += 1
+                if closing.startswith(marker) and not closing.strip(marker[0]):
+                    break
+            sections.append(('code', ''.join(block)))
+            continue
+        if HEADING_RE.match(line):
+            flush()
+        current.append(line)
+        i += 1
+    flush()
+    return sections
+
+
+def compress_section(llm_lingua_getter, text, target_ratio, cache):
+    """
+    Compress one prose section, keeping its heading line and blank-line padding.
+
+    Returns (text, status) where status is 'kept', 'cached' or 'compressed'.
+    """
+    lines = text.splitlines(keepends=True)
+    heading = lines.pop(0) if lines and HEADING_RE.match(lines[0]) else ''
+    body = ''.join(lines)
+    stripped = body.strip()
+    if len(stripped.split()) < MIN_SECTION_WORDS:
+        return text, 'kept'
+
+    leading = body[:len(body) - len(body.lstrip())]
+    trailing = body[len(body.rstrip()):]
+
+    if cache is not None:
+        key = cache.make_key(stripped, target_ratio, kind='section')
+        cached = cache.get(key)
+        if cached is not None:
+            return heading + leading + cached[0] + trailing, 'cached'
+
+    compressed, ratio = compress_text(llm_lingua_getter(), stripped, target_ratio)
+    compressed = compressed.strip()
+    if cache is not None:
+        cache.put(key, compressed, {'compression_ratio': ratio})
+    return heading + leading + compressed + trailing, 'compressed'
+
+
+def compress_sections(original_content, target_ratio, compressor, cache):
+    """
+    Compress prose sections independently and reassemble the document.
+
+    Frontmatter and fenced code are passed through untouched. With a cache,
+    each unchanged section is reused, so editing one section of a large
+    file only recompresses that section.
+    """
+    llm_lingua_getter = lambda: compressor or get_compressor()
+    parts = []
+    counts = {'sections': 0, 'sections_compressed': 0, 'sections_cached': 0}
+    for kind, text in split_sections(original_content):
+        counts['sections'] += 1
+        if kind != 'prose':
+            parts.append(text)
+            continue
+        compressed, status = compress_section(llm_lingua_getter, text, target_ratio, cache)
+        if status != 'kept':
+            counts[f'sections_{status}'] += 1
+        parts.append(compressed)
+    return ''.join(parts), counts
+
+
+def compress_guidance_file(file_path, target_ratio=0.5, compressor=None, cache=None,
+                           sections=False):
+    """
+    Compress guidance file using LLMLingua with markdown-aware settings.
+
+    With sections=True the file is split at headings and fenced code, and
+    each prose section is compressed on its own (see compress_sections).
+    """
+
+    # Read the original file
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original_content = f.read()
+
+    # Unchanged content returns the cached result without loading the model
+    kind = 'sections' if sections else 'file'
+    if cache is not None:
+        cache_key = cache.make_key(original_content, target_ratio, kind=kind)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            compressed_content, stats = cached
+            return compressed_content, dict(stats, cached=True)
 
-    print(f"Compressing: {file_path}")
+    if sections:
+        compressed_content, counts = compress_sections(
+            original_content, target_ratio, compressor, cache
+        )
+        original_words = len(original_content.split())
+        ratio = len(compressed_content.split()) / original_words if original_words else 1.0
+        stats = build_stats(original_content, compressed_content, ratio)
+        stats.update(counts)
+    elif not original_content.strip():
+        # Nothing to compress; don't load the model for it
+        compressed_content, ratio = original_content, 1.0
+        stats = build_stats(original_content, compressed_content, ratio)
+    else:
+        llm_lingua = compressor or get_compressor()
+        compressed_content, ratio = compress_text(llm_lingua, original_content, target_ratio)
+        stats = build_stats(original_content, compressed_content, ratio)
 
-    # Create backup
-    backup_path = file_path.replace('.md', '.original.md')
-    with open(file_path, 'r') as original, open(backup_path, 'w') as backup:
-        backup.write(original.read())
-    print(f"Backup created: {backup_path}")
+    if cache is not None:
+        cache.put(cache_key, compressed_content, stats)
 
-    # Compress the file
-    compressed_content, stats = compress_guidance_file(file_path, target_ratio=0.5)
+    return compressed_content, dict(stats, cached=False)
+
+
+def is_derived_file(file_path):
+    """True for outputs of a previous run (.original.md / .compressed.md)."""
+    return file_path.endswith('.original.md') or file_path.endswith('.compressed.md')
+
+
+def expand_paths(patterns):
+    """Expand files, directories and globs into a sorted, de-duplicated file list."""
+    files = set()
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '**', '*.md'), recursive=True)
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+        files.update(os.path.abspath(m) for m in matches if not is_derived_file(m))
+    return sorted(files)
+
+
+def write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that content."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def write_outputs(file_path, compressed_content):
+    """Write the .original.md backup and .compressed.md output next to file_path."""
+    with open(file_path, 'r', encoding='utf-8') as original:
+        backup_path = file_path.replace('.md', '.original.md')
+        write_if_changed(backup_path, original.read())
 
-    # Write compressed version
     compressed_path = file_path.replace('.md', '.compressed.md')
-    with open(compressed_path, 'w', encoding='utf-8') as f:
-        f.write(compressed_content)
+    write_if_changed(compressed_path, compressed_content)
+
+    return backup_path, compressed_path
+
+
+def compress_and_write(file_path, target_ratio=0.5, cache=None, sections=False):
+    """
+    Compress one file and write its outputs.
+
+    Returns (file_path, stats, error); exactly one of stats/error is None.
+    """
+    start = time.perf_counter()
+    try:
+        compressed_content, stats = compress_guidance_file(
+            file_path, target_ratio=target_ratio, cache=cache, sections=sections
+        )
+        _, compressed_path = write_outputs(file_path, compressed_content)
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}"
+    stats['seconds'] = time.perf_counter() - start
+    stats['compressed_path'] = compressed_path
+    return file_path, stats, None
+
+
+def _init_worker(backend=DEFAULT_BACKEND):
+    """Pool initializer: select the backend and load the model once per worker process."""
+    set_backend(backend)
+    get_compressor()
+
+
+def is_cached(file_path, target_ratio, cache, sections=False):
+    """True when file_path's current content already has a cache entry."""
+    if cache is None:
+        return False
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError:
+        return False
+    kind = 'sections' if sections else 'file'
+    return cache.has(cache.make_key(content, target_ratio, kind=kind))
+
+
+def compress_guidance_files(file_paths, target_ratio=0.5, cache=None, jobs=1, sections=False):
+    """
+    Compress many guidance files with a single compressor per process.
+
+    Yields (file_path, stats, error) per file, in input order, so callers can
+    stream results. Exactly one of stats/error is None. The model is only
+    loaded on the first cache miss.
+
+    With jobs > 1, cache misses are spread over a process pool whose workers
+    each load the model once; cache hits are served in this process so a
+    fully cached run never starts the pool.
+    """
+    if jobs <= 1:
+        for file_path in file_paths:
+            yield compress_and_write(file_path, target_ratio, cache, sections)
+        return
+
+    misses = [fp for fp in file_paths if not is_cached(fp, target_ratio, cache, sections)]
+    if not misses:
+        for file_path in file_paths:
+            yield compress_and_write(file_path, target_ratio, cache, sections)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(misses)),
+                             initializer=_init_worker, initargs=(_backend,)) as pool:
+        futures = {fp: pool.submit(compress_and_write, fp, target_ratio, cache, sections) for fp in misses}
+        for file_path in file_paths:
+            future = futures.get(file_path)
+            if future is None:
+                yield compress_and_write(file_path, target_ratio, cache, sections)
+                continue
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker died (e.g. BrokenProcessPool); report and keep going
+                yield file_path, None, f"{type(e).__name__}: {e}"
+
+
+def compress_with_daemon(file_paths, target_ratio=0.5, cache=None, jobs=1, sections=False):
+    """
+    Like compress_guidance_files(), but served by a running compression daemon.
+
+    Falls back to in-process compression (for the files not yet done) when
+    no daemon is running or it stops answering. The daemon compresses on a
+    single thread, so jobs > 1 skips it and uses the process pool instead.
+    """
+    if jobs > 1:
+        yield from compress_guidance_files(file_paths, target_ratio, cache, jobs, sections)
+        return
 
-    # Print statistics
+    from compression_daemon import DaemonUnavailable, compress_files
+
+    done = 0
+    try:
+        for result in compress_files(
+            file_paths, target_ratio, sections,
+            cache_dir=cache.cache_dir if cache else DEFAULT_CACHE_DIR,
+            cache_max_entries=cache.max_entries if cache else DEFAULT_CACHE_MAX_ENTRIES,
+            no_cache=cache is None,
+            backend=_backend,
+        ):
+            done += 1
+            yield result
+        return
+    except DaemonUnavailable:
+        pass
+    yield from compress_guidance_files(file_paths[done:], target_ratio, cache, jobs, sections)
+
+
+def aggregate_stats(results):
+    """Build aggregate totals from per-file stats."""
+    ok = [stats for stats in results.values() if 'error' not in stats]
+    original_words = sum(s['original_words'] for s in ok)
+    compressed_words = sum(s['compressed_words'] for s in ok)
+    original_lines = sum(s['original_lines'] for s in ok)
+    compressed_lines = sum(s['compressed_lines'] for s in ok)
+    return {
+        'files': len(results),
+        'succeeded': len(ok),
+        'failed': len(results) - len(ok),
+        'original_words': original_words,
+        'compressed_words': compressed_words,
+        'original_lines': original_lines,
+        'compressed_lines': compressed_lines,
+        'word_ratio': compressed_words / original_words if original_words else 0,
+        'line_ratio': compressed_lines / original_lines if original_lines else 0,
+        'cached': sum(1 for s in ok if s.get('cached')),
+        'seconds': sum(s.get('seconds', 0) for s in ok),
+    }
+
+
+def write_report(report_path, results, target_ratio):
+    """Write per-file and aggregate stats as JSON."""
+    report = {
+        'model': MODEL_NAME,
+        'backend': _backend,
+        'target_ratio': target_ratio,
+        'aggregate': aggregate_stats(results),
+        'files': results,
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_stats(stats):
+    """Print statistics for a single compressed file."""
     print("\n=== COMPRESSION STATISTICS ===")
     print(f"Original words: {stats['original_words']}")
     print(f"Compressed words: {stats['compressed_words']}")
@@ -95,9 +552,89 @@ def main():
     print(f"Compressed lines: {stats['compressed_lines']}")
     print(f"Line reduction: {(1 - stats['line_ratio']) * 100:.1f}%")
     print(f"Compression ratio: {stats['compression_ratio']:.3f}")
-    print(f"\nCompressed file created: {compressed_path}")
 
-    return stats
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compress guidance files with LLMLingua-2',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s guidance/testing/tdd.md            # Single file
+  %(prog)s guidance/                          # Every .md under a directory
+  %(prog)s 'guidance/**/*.md' --report r.json # Glob with JSON stats report
+  %(prog)s guidance/ agents/ --jobs 0         # One worker process per CPU
+  %(prog)s agents/ --sections                 # Per-section, code/frontmatter kept
+
+Start a resident compression daemon (compression_daemon.py start) to keep
+the model loaded between runs; the CLI uses it automatically when running.
+        """,
+    )
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_FILE],
+                        help='Files, directories or globs to compress')
+    parser.add_argument('--ratio', type=float, default=0.5,
+                        help='Target compression ratio (default: 0.5)')
+    parser.add_argument('--report', help='Write per-file and aggregate stats to this JSON file')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Compression cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_CACHE_MAX_ENTRIES,
+                        help=f'Maximum cached results before LRU eviction (default: {DEFAULT_CACHE_MAX_ENTRIES})')
+    parser.add_argument('--sections', action='store_true',
+                        help='Compress each heading section separately, keeping frontmatter '
+                             'and code blocks verbatim; unchanged sections are reused from cache')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for compression; 0 = one per CPU (default: 1). '
+                             'More than one compresses in-process, bypassing the daemon')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always recompress, ignoring the cache')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help='Inference backend: PyTorch, or ONNX Runtime on CPU with fp32 or '
+                             f'int8-quantized weights (default: {DEFAULT_BACKEND})')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Compress in-process even if a compression daemon is running')
+    args = parser.parse_args()
+
+    set_backend(args.backend)
+    file_paths = expand_paths(args.paths)
+    if not file_paths:
+        print("No markdown files matched", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Compressing {len(file_paths)} file(s)")
+
+    cache = None if args.no_cache else CompressionCache(args.cache_dir, args.cache_max_entries)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    compress = compress_guidance_files if args.no_daemon else compress_with_daemon
+    results = {}
+    for file_path, stats, error in compress(file_paths, target_ratio=args.ratio, cache=cache,
+                                            jobs=jobs, sections=args.sections):
+        if error:
+            print(f"FAILED {file_path}: {error}", file=sys.stderr)
+            results[file_path] = {'error': error}
+            continue
+        results[file_path] = stats
+        source = "cached" if stats['cached'] else f"{stats['seconds']:.2f}s"
+        print(f"{file_path}: {stats['original_words']} -> {stats['compressed_words']} words "
+              f"({source})")
+
+    if len(file_paths) == 1 and 'error' not in results[file_paths[0]]:
+        print_stats(results[file_paths[0]])
+
+    aggregate = aggregate_stats(results)
+    print("\n=== AGGREGATE ===")
+    print(f"Files: {aggregate['succeeded']}/{aggregate['files']} compressed "
+          f"({aggregate['cached']} from cache)")
+    print(f"Words: {aggregate['original_words']} -> {aggregate['compressed_words']}")
+    print(f"Lines: {aggregate['original_lines']} -> {aggregate['compressed_lines']}")
+
+    if args.report:
+        write_report(args.report, results, args.ratio)
+        print(f"\nReport written: {args.report}")
+
+    if aggregate['failed']:
+        sys.exit(1)
+    return aggregate
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Resident compression service for compress_guidance.py.
+
+Keeps one LLMLingua PromptCompressor warm behind a Unix socket, so callers
+skip the torch/transformers import and the model load. Any number of
+clients can connect at once. Their requests go through a bounded queue to
+a single worker that owns the model; when the queue stays full, a request
+is refused with 'busy' instead of piling up. The service exits after
+IDLE_TIMEOUT_SECONDS without requests.
+
+Protocol: one JSON request line per connection, one JSON response line.
+
+    {"op": "compress", "file_path": "...", "target_ratio": 0.5, "sections": false,
+     "write": true, "backend": "torch", "cache_dir": "...", "cache_max_entries": 500}
+    -> {"ok": true, "stats": {...}}                  (write=true: outputs written)
+    -> {"ok": true, "stats": {...}, "content": "..."} (write=false)
+    -> {"ok": false, "error": "..."}
+
+Usage:
+    compression_daemon.py start | serve [--backend onnx-int8] | status | stop
+"""
+import argparse
+import fcntl
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from compress_guidance import (BACKENDS, DEFAULT_BACKEND, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_ENTRIES,
+                               CompressionCache, compress_and_write, compress_guidance_file,
+                               get_compressor, set_backend)
+
+SOCKET_PATH = Path(DEFAULT_CACHE_DIR) / "daemon.sock"
+LOG_PATH = Path(DEFAULT_CACHE_DIR) / "daemon.log"
+
+QUEUE_SIZE = 32
+# How long a request may wait for a queue slot before being refused as busy
+QUEUE_WAIT_SECONDS = 5.0
+IDLE_TIMEOUT_SECONDS = 10 * 60
+START_TIMEOUT_SECONDS = 120.0
+REQUEST_TIMEOUT_SECONDS = 30 * 60
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening, or it refused the request."""
+
+
+class CompressionWorker:
+    """Single thread that owns the model and drains a bounded job queue."""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.caches = {}
+        self.last_activity = time.monotonic()
+        self.busy = False
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, request):
+        """Queue a request and block until its response is ready."""
+        done = threading.Event()
+        slot = {'request': request, 'done': done, 'response': None}
+        try:
+            self.jobs.put(slot, timeout=QUEUE_WAIT_SECONDS)
+        except queue.Full:
+            return {'ok': False, 'error': 'busy'}
+        done.wait()
+        return slot['response']
+
+    def _cache(self, request):
+        if request.get('no_cache'):
+            return None
+        key = (request.get('cache_dir') or DEFAULT_CACHE_DIR,
+               request.get('cache_max_entries') or DEFAULT_CACHE_MAX_ENTRIES)
+        if key not in self.caches:
+            self.caches[key] = CompressionCache(*key)
+        return self.caches[key]
+
+    def _loop(self):
+        while True:
+            slot = self.jobs.get()
+            self.busy = True
+            try:
+                slot['response'] = self._handle(slot['request'])
+            except Exception as e:
+                slot['response'] = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            finally:
+                self.busy = False
+                self.last_activity = time.monotonic()
+                slot['done'].set()
+
+    def _handle(self, request):
+        file_path = request['file_path']
+        target_ratio = request.get('target_ratio', 0.5)
+        sections = bool(request.get('sections'))
+        cache = self._cache(request)
+        # Only this thread compresses, so the process-wide backend is safe to switch
+        set_backend(request.get('backend') or DEFAULT_BACKEND)
+        if request.get('write', True):
+            _, stats, error = compress_and_write(file_path, target_ratio, cache, sections)
+            return {'ok': False, 'error': error} if error else {'ok': True, 'stats': stats}
+        content, stats = compress_guidance_file(file_path, target_ratio, cache=cache, sections=sections)
+        return {'ok': True, 'stats': stats, 'content': content}
+
+    def idle(self):
+        return (not self.busy and self.jobs.empty()
+                and time.monotonic() - self.last_activity > IDLE_TIMEOUT_SECONDS)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        server = self.server
+        op = request.get('op')
+        if op == 'status':
+            response = {'ok': True, 'pid': os.getpid(), 'queued': server.worker.jobs.qsize(),
+                        'busy': server.worker.busy}
+        elif op == 'stop':
+            response = {'ok': True}
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        elif op == 'compress' and request.get('file_path'):
+            server.worker.last_activity = time.monotonic()
+            response = server.worker.submit(request)
+        else:
+            response = {'ok': False, 'error': f"unknown request: {op}"}
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+class CompressionServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        self.worker = CompressionWorker()
+        super().__init__(str(socket_path), RequestHandler)
+
+
+def serve(socket_path=SOCKET_PATH, backend=DEFAULT_BACKEND):
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    # Held for the daemon's lifetime, and taken before the model load: a
+    # second overlapping start exits here instead of loading the model too
+    # and then failing to bind
+    with open(socket_path.with_suffix('.lock'), 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            print(f"Compression daemon already starting on {socket_path}", file=sys.stderr)
+            return
+        _serve_locked(socket_path, backend)
+
+
+def _serve_locked(socket_path, backend):
+    if socket_path.exists():
+        try:
+            request({'op': 'status'}, socket_path, timeout=2)
+            print(f"Compression daemon already listening on {socket_path}", file=sys.stderr)
+            return
+        except DaemonUnavailable:
+            socket_path.unlink()
+
+    # Load the model before accepting connections so the first request is warm
+    get_compressor(backend)
+    server = CompressionServer(socket_path)
+    os.chmod(socket_path, 0o600)
+
+    def watch_idle():
+        while True:
+            time.sleep(30)
+            if server.worker.idle():
+                server.shutdown()
+                return
+
+    threading.Thread(target=watch_idle, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+
+
+def request(payload, socket_path=SOCKET_PATH, timeout=REQUEST_TIMEOUT_SECONDS):
+    """Send one request; raises DaemonUnavailable when nothing answers."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall((json.dumps(payload) + '\n').encode('utf-8'))
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        return json.loads(line)
+    except (OSError, ValueError) as e:
+        raise DaemonUnavailable(str(e)) from e
+
+
+def is_running(socket_path=SOCKET_PATH):
+    if not Path(socket_path).exists():
+        return False
+    try:
+        request({'op': 'status'}, socket_path, timeout=2)
+    except DaemonUnavailable:
+        return False
+    return True
+
+
+def compress_files(file_paths, target_ratio=0.5, sections=False, cache_dir=DEFAULT_CACHE_DIR,
+                   cache_max_entries=DEFAULT_CACHE_MAX_ENTRIES, no_cache=False,
+                   backend=DEFAULT_BACKEND, socket_path=SOCKET_PATH):
+    """
+    Compress and write files through the daemon.
+
+    Yields (file_path, stats, error) like compress_guidance_files(). Raises
+    DaemonUnavailable before the first result if no daemon is running, and
+    from a later file if the daemon disappears or is busy, so callers can
+    finish the remaining files in-process.
+    """
+    if not is_running(socket_path):
+        raise DaemonUnavailable(f"no daemon on {socket_path}")
+    for file_path in file_paths:
+        start = time.perf_counter()
+        response = request({
+            'op': 'compress', 'file_path': os.path.abspath(file_path), 'target_ratio': target_ratio,
+            'sections': sections, 'write': True, 'backend': backend, 'cache_dir': cache_dir,
+            'cache_max_entries': cache_max_entries, 'no_cache': no_cache,
+        }, socket_path)
+        if response.get('ok'):
+            stats = response['stats']
+            stats['seconds'] = time.perf_counter() - start
+            yield file_path, stats, None
+        elif response.get('error') == 'busy':
+            raise DaemonUnavailable('daemon queue is full')
+        else:
+            yield file_path, None, response.get('error', 'unknown error')
+
+
+def start(socket_path=SOCKET_PATH, backend=DEFAULT_BACKEND):
+    """Start the daemon detached, preloading backend; True once it answers."""
+    if is_running(socket_path):
+        return True
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, 'ab') as log:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--socket', str(socket_path),
+                          '--backend', backend],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident LLMLingua compression service')
+    parser.add_argument('command', choices=('start', 'serve', 'status', 'stop'))
+    parser.add_argument('--socket', default=str(SOCKET_PATH),
+                        help=f'Unix socket path (default: {SOCKET_PATH})')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f'Backend to preload (default: {DEFAULT_BACKEND}); requests may use any')
+    args = parser.parse_args()
+    socket_path = Path(args.socket).expanduser()
+
+    if args.command == 'serve':
+        serve(socket_path, args.backend)
+    elif args.command == 'start':
+        if not start(socket_path, args.backend):
+            print(f"Compression daemon did not start; see {LOG_PATH}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Compression daemon listening on {socket_path}")
+    else:
+        try:
+            response = request({'op': args.command}, socket_path, timeout=5)
+        except DaemonUnavailable:
+            print("Compression daemon is not running")
+            sys.exit(1)
+        if args.command == 'status':
+            state = 'busy' if response['busy'] else 'idle'
+            print(f"Compression daemon pid {response['pid']} on {socket_path} "
+                  f"({state}, {response['queued']} queued)")
+        else:
+            print("Compression daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Hook latency profiler for Claude debug traces (~/.claude/debug/*.txt).
+
+Streams each log once and rebuilds three kinds of timeline:
+
+- hook events (PreToolUse:Edit, PostToolUse:Write, UserPromptSubmit, Stop, ...),
+  split into matcher lookup and hook command execution, with every command
+  timed from "Executing hook command" to "Hook command completed"
+- tool calls, from executePreToolHooks to the end of the matching PostToolUse
+  event, with the pre-hook, post-hook and rewrite time inside them
+- prompt submits, from the UserPromptSubmit hooks to the first streamed chunk,
+  including FileHistory snapshots and the ~/.claude.json rewrite
+
+Atomic file rewrites (temp file + rename) are timed and sized separately;
+rewrites of .claude.json count as config rewrites.
+
+Durations need timestamped lines ("2025-10-09T18:20:01.123Z [DEBUG] ...").
+For logs without timestamps the report still counts events, the hooks that
+ran, matchers and rewrite bytes, so it shows which hooks fire on every edit.
+
+Memory stays constant however large the logs are. Percentiles come from
+log-scale histograms (about 2% resolution), each category keeps only its
+TOP_N slowest occurrences, and open spans are capped at MAX_OPEN.
+
+Usage:
+    hook_profiler.py [LOG_OR_DIR ...] [--top N] [--json]
+"""
+import argparse
+import glob
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+DEBUG_DIR = Path.home() / ".claude" / "debug"
+TOP_N = 5
+MAX_OPEN = 256
+
+# Histogram buckets grow by BUCKET_GROWTH from BUCKET_FLOOR_MS upward
+BUCKET_FLOOR_MS = 0.01
+BUCKET_GROWTH = 1.02
+
+LINE_RE = re.compile(
+    r'^(?:\[?(?P<ts>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\]?\s+)?'
+    r'\[(?P<level>[A-Z]+)\]\s?(?P<msg>.*)$'
+)
+EXECUTE_PRE_RE = re.compile(r'^executePreToolHooks called for tool: (?P<tool>\S+)')
+EXECUTE_EVENT_RE = re.compile(r'^Executing hooks for (?P<event>\S+)')
+GET_MATCHING_RE = re.compile(r'^Getting matching hook commands for (?P<event>\S+) with query: (?P<query>.*)')
+MATCHERS_RE = re.compile(r'^Found (?P<n>\d+) hook matchers in settings')
+MATCHED_RE = re.compile(r'^Matched (?P<n>\d+) unique hooks')
+COMMANDS_RE = re.compile(r'^Found (?P<n>\d+) hook commands to execute')
+COMMAND_START_RE = re.compile(r'^Executing hook command: (?P<cmd>.+?) with timeout \d+ms')
+COMMAND_DONE_RE = re.compile(r'^Hook command completed with status (?P<status>-?\d+): (?P<cmd>.+)')
+SNAPSHOT_START_RE = re.compile(r'^FileHistory: Making snapshot for message (?P<id>\S+)')
+SNAPSHOT_DONE_RE = re.compile(r'^FileHistory: Added snapshot for (?P<id>\S+), tracking (?P<n>\d+) files')
+WRITE_START_RE = re.compile(r'^Writing to temp file: (?P<tmp>.+)')
+WRITE_SIZE_RE = re.compile(r'^Temp file written successfully, size: (?P<bytes>\d+) bytes')
+WRITE_DONE_RE = re.compile(r'^File (?P<path>.+) written atomically')
+STREAM_RE = re.compile(r'^Stream started')
+TMP_SUFFIX_RE = re.compile(r'\.tmp\.\d+\.\d+$')
+
+
+def parse_timestamp(value):
+    """Milliseconds since the epoch for an ISO-8601 timestamp."""
+    value = value.replace(' ', 'T')
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value).timestamp() * 1000
+
+
+class Histogram:
+    """Log-bucketed latency histogram: constant memory, ~2% percentile error."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        ms = max(ms, 0.0)
+        index = 0 if ms <= BUCKET_FLOOR_MS else int(math.log(ms / BUCKET_FLOOR_MS, BUCKET_GROWTH)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = BUCKET_FLOOR_MS * BUCKET_GROWTH ** index
+                return min(upper, self.max)
+        return self.max
+
+
+class Category:
+    """Occurrence count, latency histogram, slowest occurrences and counters for one category."""
+
+    def __init__(self):
+        self.count = 0
+        self.histogram = Histogram()
+        self.worst = []
+        self.counters = {}
+        self._sequence = 0
+
+    def add(self, ms, where, detail=None, top=TOP_N, **counters):
+        self.count += 1
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        if ms is None:
+            return
+        self.histogram.add(ms)
+        self._sequence += 1
+        item = (ms, self._sequence, where, detail)
+        if len(self.worst) < top:
+            heapq.heappush(self.worst, item)
+        elif ms > self.worst[0][0]:
+            heapq.heapreplace(self.worst, item)
+
+    def summary(self):
+        h = self.histogram
+        return {
+            'count': self.count,
+            'timed': h.count,
+            'total_ms': round(h.total, 3),
+            'p50_ms': _round(h.percentile(0.50)),
+            'p95_ms': _round(h.percentile(0.95)),
+            'p99_ms': _round(h.percentile(0.99)),
+            'max_ms': _round(h.max) if h.count else None,
+            'counters': dict(self.counters),
+            'worst': [{'ms': _round(ms), 'at': where, 'detail': detail}
+                      for ms, _, where, detail in sorted(self.worst, reverse=True)],
+        }
+
+
+class Span:
+    """One hook event invocation being reconstructed."""
+
+    __slots__ = ('event', 'start', 'where', 'matching', 'match_seen', 'match_start', 'match_ms',
+                 'matchers', 'announced', 'started', 'completed', 'pending', 'first_command',
+                 'last_ts', 'tool_call', 'closed')
+
+    def __init__(self, event, ts, where):
+        self.event = event
+        self.start = ts
+        self.where = where
+        self.matching = True
+        self.match_seen = False
+        self.match_start = None
+        self.match_ms = None
+        self.matchers = 0
+        self.announced = 0
+        self.started = 0
+        self.completed = 0
+        self.pending = {}
+        self.first_command = None
+        self.last_ts = ts
+        self.tool_call = None
+        self.closed = False
+
+
+class TraceProfiler:
+    """Feed debug log lines in order; report() aggregates everything seen so far."""
+
+    def __init__(self, top=TOP_N):
+        self.top = top
+        self.categories = {}
+        self.lines = 0
+        self.timestamped = 0
+        self.files = 0
+        self._reset()
+
+    def _reset(self):
+        self.spans = deque()
+        self.tool_calls = {}
+        self.prompt = None
+        self.snapshots = {}
+        self.writes = {}
+        self.last_write = None
+
+    def category(self, kind, name):
+        key = (kind, name)
+        if key not in self.categories:
+            self.categories[key] = Category()
+        return self.categories[key]
+
+    def _record(self, kind, name, ms, where, detail=None, **counters):
+        self.category(kind, name).add(ms, where, detail, self.top, **counters)
+
+    @staticmethod
+    def _elapsed(start, end):
+        return None if start is None or end is None else end - start
+
+    def profile_file(self, path):
+        self.files += 1
+        self._reset()
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for number, line in enumerate(f, 1):
+                self.feed(line, f"{os.path.basename(path)}:{number}")
+        self.finish()
+
+    def feed(self, line, where):
+        match = LINE_RE.match(line.rstrip('\n'))
+        if not match:
+            return  # continuation of a multi-line payload
+        self.lines += 1
+        ts = None
+        if match.group('ts'):
+            try:
+                ts = parse_timestamp(match.group('ts'))
+                self.timestamped += 1
+            except ValueError:
+                pass
+        self._dispatch(match.group('msg'), ts, where)
+
+    def _dispatch(self, msg, ts, where):
+        m = EXECUTE_PRE_RE.match(msg)
+        if m:
+            calls = self.tool_calls.setdefault(m.group('tool'), deque())
+            if len(calls) >= MAX_OPEN:
+                calls.popleft()
+            calls.append({'start': ts, 'where': where, 'pre_ms': None, 'rewrite_ms': 0.0,
+                          'rewrites': 0, 'hooks': 0})
+            return
+        m = EXECUTE_EVENT_RE.match(msg)
+        if m:
+            self._open_span(m.group('event'), ts, where)
+            return
+        m = GET_MATCHING_RE.match(msg)
+        if m:
+            span = self._matching_span(m.group('event'))
+            if span is None:
+                span = self._open_span(m.group('event'), ts, where)
+            span.match_seen = True
+            span.match_start = ts
+            return
+        m = MATCHERS_RE.match(msg)
+        if m:
+            span = self._matching_span()
+            if span:
+                span.matchers = int(m.group('n'))
+            return
+        m = MATCHED_RE.match(msg)
+        if m:
+            span = self._matching_span()
+            if span:
+                span.match_ms = self._elapsed(span.match_start if span.match_start is not None
+                                              else span.start, ts)
+                span.last_ts = ts
+                # Events like Notification log no "Found N hook commands" line when nothing matched
+                if m.group('n') == '0':
+                    span.matching = False
+                    self._close_span(span, ts)
+            return
+        m = COMMANDS_RE.match(msg)
+        if m:
+            span = self._matching_span()
+            if span:
+                span.matching = False
+                span.last_ts = ts
+                span.announced = int(m.group('n'))
+                if not span.announced:
+                    self._close_span(span, ts)
+            return
+        m = COMMAND_START_RE.match(msg)
+        if m:
+            span = self._starting_span()
+            if span:
+                span.started += 1
+                span.pending.setdefault(m.group('cmd'), deque()).append((ts, where))
+                if span.first_command is None:
+                    span.first_command = ts
+            return
+        m = COMMAND_DONE_RE.match(msg)
+        if m:
+            self._complete_command(m.group('cmd'), int(m.group('status')), ts, where)
+            return
+        m = SNAPSHOT_START_RE.match(msg)
+        if m:
+            if len(self.snapshots) < MAX_OPEN:
+                self.snapshots[m.group('id')] = (ts, where)
+            return
+        m = SNAPSHOT_DONE_RE.match(msg)
+        if m:
+            start, start_where = self.snapshots.pop(m.group('id'), (None, where))
+            ms = self._elapsed(start, ts)
+            self._record('step', 'file-history-snapshot', ms, start_where,
+                         f"{m.group('n')} files", files=int(m.group('n')))
+            self._attribute('snapshot', ms)
+            return
+        m = WRITE_START_RE.match(msg)
+        if m:
+            tmp = m.group('tmp').strip()
+            if len(self.writes) < MAX_OPEN:
+                self.writes[TMP_SUFFIX_RE.sub('', tmp)] = {'start': ts, 'where': where, 'bytes': 0}
+                self.last_write = TMP_SUFFIX_RE.sub('', tmp)
+            return
+        m = WRITE_SIZE_RE.match(msg)
+        if m:
+            write = self.writes.get(self.last_write)
+            if write is not None:
+                write['bytes'] = int(m.group('bytes'))
+            return
+        m = WRITE_DONE_RE.match(msg)
+        if m:
+            path = m.group('path').strip()
+            write = self.writes.pop(path, None) or {'start': None, 'where': where, 'bytes': 0}
+            ms = self._elapsed(write['start'], ts)
+            name = 'config-rewrite' if os.path.basename(path) == '.claude.json' else 'file-rewrite'
+            self._record('step', name, ms, write['where'], path, bytes=write['bytes'])
+            self._attribute('rewrite', ms)
+            return
+        if STREAM_RE.match(msg) and self.prompt is not None:
+            prompt = self.prompt
+            self.prompt = None
+            self._record('timeline', 'prompt-submit', self._elapsed(prompt['start'], ts), prompt['where'],
+                         self._breakdown(prompt), hooks=prompt['hooks'], rewrites=prompt['rewrites'])
+
+    # Hook event spans
+
+    def _open_span(self, event, ts, where):
+        span = Span(event, ts, where)
+        base, _, tool = event.partition(':')
+        if base == 'PostToolUse' and self.tool_calls.get(tool):
+            span.tool_call = self.tool_calls[tool].popleft()
+        elif base == 'PreToolUse' and self.tool_calls.get(tool):
+            # The oldest call still waiting for its PreToolUse span
+            for call in self.tool_calls[tool]:
+                if call['pre_ms'] is None and not call.get('pre_open'):
+                    call['pre_open'] = True
+                    span.tool_call = call
+                    break
+        elif base == 'UserPromptSubmit':
+            self.prompt = {'start': ts, 'where': where, 'hooks_ms': None, 'snapshot_ms': 0.0,
+                           'rewrite_ms': 0.0, 'rewrites': 0, 'hooks': 0}
+        self.spans.append(span)
+        while len(self.spans) > MAX_OPEN:
+            self._close_span(self.spans[0], None)
+        return span
+
+    def _matching_span(self, event=None):
+        """Newest span still resolving matchers; with event, one whose lookup has not begun."""
+        for span in reversed(self.spans):
+            if not span.matching:
+                continue
+            if event is None:
+                return span
+            if not span.match_seen and span.event.partition(':')[0] == event:
+                return span
+        return None
+
+    def _starting_span(self):
+        """Newest span with announced hook commands that have not all started yet."""
+        for span in reversed(self.spans):
+            if not span.matching and span.started < span.announced:
+                return span
+        return None
+
+    def _command_span(self, cmd):
+        """Oldest span waiting for cmd to complete (completions come back in start order)."""
+        for span in self.spans:
+            if span.pending.get(cmd):
+                return span
+        return None
+
+    def _complete_command(self, cmd, status, ts, where):
+        span = self._command_span(cmd)
+        if span is None:
+            self._record('hook', cmd, None, where, failures=int(status != 0))
+            return
+        start, start_where = span.pending[cmd].popleft()
+        if not span.pending[cmd]:
+            del span.pending[cmd]
+        self._record('hook', cmd, self._elapsed(start, ts), start_where, span.event,
+                     failures=int(status != 0))
+        span.completed += 1
+        span.last_ts = ts
+        if span.completed >= span.announced and not span.pending:
+            self._close_span(span, ts)
+
+    def _close_span(self, span, ts):
+        if span.closed:
+            return
+        span.closed = True
+        try:
+            self.spans.remove(span)
+        except ValueError:
+            pass
+        end = ts if ts is not None else span.last_ts
+        ms = self._elapsed(span.start, end)
+        command_ms = self._elapsed(span.first_command, end)
+        executed = span.announced
+        detail = f"{span.matchers} matchers, {executed} hooks"
+        if command_ms is not None:
+            detail += f" (match {_fmt(span.match_ms)}, commands {_fmt(command_ms)})"
+        elif span.match_ms is not None:
+            detail += f" (match {_fmt(span.match_ms)})"
+        self._record('event', span.event, ms, span.where, detail, matchers=span.matchers,
+                     hooks=executed)
+        if span.match_ms is not None:
+            self._record('step', 'hook-matching', span.match_ms, span.where, span.event)
+        base, _, tool = span.event.partition(':')
+        call = span.tool_call
+        if call is not None:
+            call['hooks'] += executed
+            if base == 'PreToolUse':
+                call['pre_ms'] = ms if ms is not None else 0.0
+                call.pop('pre_open', None)
+            else:
+                call['post_ms'] = ms
+                total = self._elapsed(call['start'], end)
+                self._record('timeline', f"tool-call:{tool}", total, call['where'], self._breakdown(call),
+                             hooks=call['hooks'], rewrites=call['rewrites'])
+        if base == 'UserPromptSubmit' and self.prompt is not None:
+            self.prompt['hooks_ms'] = ms
+            self.prompt['hooks'] += executed
+
+    def _attribute(self, kind, ms):
+        """Charge a snapshot/rewrite to the open prompt submit or most recent open tool call."""
+        if self.prompt is not None:
+            target = self.prompt
+        else:
+            open_calls = [c for calls in self.tool_calls.values() for c in calls]
+            if not open_calls:
+                return
+            target = open_calls[-1]
+        if kind == 'rewrite':
+            target['rewrites'] = target.get('rewrites', 0) + 1
+        if ms is not None:
+            key = f"{kind}_ms"
+            target[key] = target.get(key, 0.0) + ms
+
+    @staticmethod
+    def _breakdown(record):
+        parts = []
+        for key, label in (('pre_ms', 'pre-hooks'), ('post_ms', 'post-hooks'), ('hooks_ms', 'hooks'),
+                           ('snapshot_ms', 'snapshot'), ('rewrite_ms', 'rewrites')):
+            if key in record and record[key] is not None:
+                parts.append(f"{label} {_fmt(record[key])}")
+        return ', '.join(parts) or None
+
+    def finish(self):
+        """Close spans left open at end of file (their durations end at the last seen line)."""
+        for span in list(self.spans):
+            self._close_span(span, None)
+        self._reset()
+
+    def report(self):
+        sections = {}
+        for (kind, name), category in sorted(self.categories.items()):
+            sections.setdefault(kind, {})[name] = category.summary()
+        return {
+            'files': self.files,
+            'lines': self.lines,
+            'timestamped_lines': self.timestamped,
+            'events': sections.get('event', {}),
+            'hooks': sections.get('hook', {}),
+            'steps': sections.get('step', {}),
+            'timelines': sections.get('timeline', {}),
+        }
+
+
+def _round(ms):
+    return None if ms is None else round(ms, 3)
+
+
+def _fmt(ms):
+    if ms is None:
+        return 'n/a'
+    return f"{ms / 1000:.2f}s" if ms >= 1000 else f"{ms:.1f}ms"
+
+
+def expand_logs(paths):
+    """Log files from paths, directories (their *.txt) and globs, in order, without duplicates."""
+    files = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, '*.txt')))
+        else:
+            matches = sorted(glob.glob(path)) or [path]
+        files.extend(m for m in matches if m not in files)
+    return files
+
+
+def print_report(report, top):
+    timed = report['timestamped_lines']
+    print(f"Profiled {report['files']} log(s), {report['lines']} lines, {timed} timestamped")
+    if not timed:
+        print("No timestamps in these logs: showing counts only (durations need timestamped lines)")
+
+    def table(title, rows, label_width=34):
+        if not rows:
+            return
+        print(f"\n{title}")
+        print(f"  {'':<{label_width}} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'total':>9}  notes")
+        for name, stats, notes in rows:
+            cells = [_fmt(stats[k]) if stats[k] is not None else '-' for k in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+            total = _fmt(stats['total_ms']) if stats['timed'] else '-'
+            print(f"  {name:<{label_width}} {stats['count']:>6} " + ' '.join(f"{c:>9}" for c in cells)
+                  + f" {total:>9}  {notes}")
+
+    def by_cost(section):
+        return sorted(section.items(), key=lambda item: (-item[1]['total_ms'], -item[1]['count'], item[0]))
+
+    rows = []
+    for name, stats in by_cost(report['events']):
+        counters = stats['counters']
+        rows.append((name, stats, f"{counters.get('hooks', 0) / stats['count']:.1f} hooks/event, "
+                                  f"{counters.get('matchers', 0) / stats['count']:.1f} matchers/event"))
+    table("Hook events", rows)
+
+    rows = []
+    for name, stats in by_cost(report['hooks']):
+        failures = stats['counters'].get('failures', 0)
+        rows.append((os.path.basename(name), stats, f"{failures} non-zero exit" if failures else ''))
+    table("Hook commands", rows)
+
+    rows = []
+    for name, stats in by_cost(report['steps']):
+        counters = stats['counters']
+        notes = ''
+        if 'bytes' in counters:
+            notes = f"{counters['bytes'] / stats['count'] / 1024:.0f} KB avg, {counters['bytes'] / 1e6:.1f} MB total"
+        elif 'files' in counters:
+            notes = f"{counters['files'] / stats['count']:.1f} files tracked avg"
+        rows.append((name, stats, notes))
+    table("Steps", rows)
+
+    rows = []
+    for name, stats in by_cost(report['timelines']):
+        counters = stats['counters']
+        rows.append((name, stats, f"{counters.get('hooks', 0) / stats['count']:.1f} hooks, "
+                                  f"{counters.get('rewrites', 0) / stats['count']:.1f} rewrites per call"))
+    table("Timelines", rows)
+
+    worst = []
+    for section in ('events', 'hooks', 'steps', 'timelines'):
+        for name, stats in report[section].items():
+            worst.extend((w['ms'], name, w) for w in stats['worst'])
+    if worst:
+        print(f"\nSlowest {top}")
+        for ms, name, w in sorted(worst, key=lambda item: -item[0])[:top]:
+            detail = f" — {w['detail']}" if w['detail'] else ''
+            print(f"  {_fmt(ms):>9}  {os.path.basename(name) if '/' in name else name} at {w['at']}{detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-event hook latency report from Claude debug logs')
+    parser.add_argument('logs', nargs='*', default=[str(DEBUG_DIR)],
+                        help='Log files, directories or globs (default: ~/.claude/debug)')
+    parser.add_argument('--top', type=int, default=TOP_N,
+                        help=f'Slowest occurrences kept per category (default: {TOP_N})')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    files = expand_logs(args.logs)
+    missing = [f for f in files if not os.path.isfile(f)]
+    if missing or not files:
+        print(f"❌ No debug logs found: {', '.join(missing or args.logs)}", file=sys.stderr)
+        sys.exit(1)
+
+    profiler = TraceProfiler(args.top)
+    for path in files:
+        profiler.profile_file(path)
+    report = profiler.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Persistent spec runner for the run-spec-for-ruby-file.sh hook.
+
+The hook used to start a cold `docker compose exec web bundle exec rspec`
+on every Ruby edit and re-parse .specignore in bash each time. Now it is a
+thin client that talks to a long-lived daemon over a Unix socket. The
+daemon:
+
+- compiles .specignore once into a single regex and recompiles it only
+  when the file changes
+- maps edited files to specs with the Guardfile rules
+- starts a lone request at once; only a request that arrives while a run
+  for the same spec is pending or running waits DEBOUNCE_SECONDS, so
+  bursts coalesce into one run that shares its result
+- cancels a run already in progress when a newer edit for the same spec
+  arrives, killing rspec inside the container (its pid is recorded in a
+  pid file there); the superseded request returns at once, and the newest
+  one reports the result
+- runs specs through spring (bin/spring rspec) when the project has it,
+  so Rails stays booted between runs, and boots spring's test environment
+  as soon as the daemon starts. Spring is the only preloader: without
+  bin/spring every run is a cold `bundle exec rspec` in the container,
+  and the hook says so
+
+If the daemon cannot be reached or started, the client runs the spec
+in-process, exactly as the old hook did.
+
+Usage:
+    spec_runner.py hook            # hook entry point, reads hook JSON on stdin
+    spec_runner.py serve           # run the daemon in the foreground
+    spec_runner.py status | stop
+"""
+import argparse
+import fcntl
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = "/home/matt/code/musashi"
+PROJECT_MARKER = "/musashi/"
+RUNTIME_DIR = Path.home() / ".cache" / "claude-hooks"
+SOCKET_PATH = RUNTIME_DIR / "spec-runner.sock"
+LOG_PATH = RUNTIME_DIR / "spec-runner.log"
+
+DEBOUNCE_SECONDS = 0.3
+IDLE_TIMEOUT_SECONDS = 30 * 60
+CONNECT_TIMEOUT_SECONDS = 3.0
+# Upper bound on a single client wait; a spec run longer than this is reported as an error
+REQUEST_TIMEOUT_SECONDS = 15 * 60
+
+DOCKER_EXEC = ["docker", "compose", "exec", "-T", "web"]
+RSPEC_COMMAND = DOCKER_EXEC + ["bundle", "exec", "rspec"]
+SPRING_RSPEC_COMMAND = DOCKER_EXEC + ["bin/spring", "rspec"]
+# Any spring rspec invocation boots the test environment; --version runs no specs
+SPRING_WARM_COMMAND = SPRING_RSPEC_COMMAND + ["--version"]
+RSPEC_ARGS = ["--format", "documentation", "--force-color"]
+# Inside the container; runs are serialized, so stale pid files can be cleared at start
+CONTAINER_PID_GLOB = "/tmp/claude-spec-runner-*.pid"
+KILL_TIMEOUT_SECONDS = 30
+
+SPEC_RE = re.compile(r'^spec/.*_spec\.rb$')
+SPEC_MAPPINGS = (
+    # Controllers -> request specs
+    (re.compile(r'^app/controllers/(.+)_controller\.rb$'), "spec/requests/{0}_controller_spec.rb"),
+    # App files -> spec with same structure
+    (re.compile(r'^app/(.+)\.rb$'), "spec/{0}_spec.rb"),
+    # Lib files -> spec/lib
+    (re.compile(r'^lib/(.+)\.rb$'), "spec/lib/{0}_spec.rb"),
+)
+
+
+def spec_for(relative_path):
+    """Spec path for a project file (itself for specs), or None when unmapped."""
+    if SPEC_RE.match(relative_path):
+        return relative_path
+    for pattern, template in SPEC_MAPPINGS:
+        match = pattern.match(relative_path)
+        if match:
+            return template.format(*match.groups())
+    return None
+
+
+class SpecIgnore:
+    """.specignore globs compiled into one regex, recompiled when the file changes."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.signature = None
+        self.regex = None
+
+    @staticmethod
+    def compile(lines):
+        # Same conversion the bash hook used: ** -> .*, * -> [^/]*, anchored
+        patterns = []
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            pattern = line.replace('**', '\0').replace('*', '[^/]*').replace('\0', '.*')
+            try:
+                re.compile(pattern)
+            except re.error:
+                continue
+            patterns.append(f'(?:{pattern})')
+        return re.compile('^(?:' + '|'.join(patterns) + ')$') if patterns else None
+
+    def _refresh(self):
+        try:
+            stat = self.path.stat()
+        except OSError:
+            self.signature = None
+            self.regex = None
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self.signature:
+            self.regex = self.compile(self.path.read_text(encoding='utf-8', errors='replace').splitlines())
+            self.signature = signature
+
+    def matches(self, relative_path):
+        self._refresh()
+        return bool(self.regex and self.regex.match(relative_path))
+
+
+def has_spring(project_root):
+    return (Path(project_root) / "bin" / "spring").is_file()
+
+
+def warm_spring(project_root):
+    """Boot spring's preloaded test environment ahead of the first spec run."""
+    try:
+        subprocess.run(SPRING_WARM_COMMAND, cwd=project_root, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=REQUEST_TIMEOUT_SECONDS)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+
+
+def rspec_command(project_root, spec_file, pid_file=None):
+    """
+    Command for one spec run. With pid_file, rspec is exec'd from a shell
+    that first records its pid inside the container, so it can be killed
+    there (killing the local docker client leaves it running).
+    """
+    base = SPRING_RSPEC_COMMAND if has_spring(project_root) else RSPEC_COMMAND
+    if pid_file is None:
+        return base + [spec_file] + RSPEC_ARGS
+    script = f'rm -f {CONTAINER_PID_GLOB}; echo $$ > {pid_file}; exec "$@"'
+    return DOCKER_EXEC + ["sh", "-c", script, "sh"] + base[len(DOCKER_EXEC):] + [spec_file] + RSPEC_ARGS
+
+
+def kill_in_container(project_root, pid_file):
+    """TERM the rspec recorded in pid_file inside the container (spring forwards it to the app)."""
+    script = (f'for i in 1 2 3 4 5 6 7 8 9 10; do [ -s {pid_file} ] && break; sleep 0.2; done; '
+              f'kill -TERM "$(cat {pid_file})" 2>/dev/null; rm -f {pid_file}')
+    try:
+        subprocess.run(DOCKER_EXEC + ["sh", "-c", script], cwd=project_root, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=KILL_TIMEOUT_SECONDS)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+
+
+def classify(relative_path, project_root, specignore):
+    """
+    Decide what to do for an edited file.
+
+    Returns (action, spec_file) where action is 'run', 'ignored', 'missing'
+    or 'unmapped'.
+    """
+    spec_file = spec_for(relative_path)
+    is_spec = spec_file == relative_path
+    if not is_spec and specignore.matches(relative_path):
+        return 'ignored', spec_file
+    if spec_file is None:
+        return 'unmapped', None
+    if (Path(project_root) / spec_file).is_file():
+        return 'run', spec_file
+    if is_spec and specignore.matches(relative_path):
+        return 'ignored', spec_file
+    # Includes an edited spec that no longer exists, as the bash hook reported it
+    return 'missing', spec_file
+
+
+def run_once(spec_file, project_root):
+    """Run one spec synchronously (in-process fallback)."""
+    result = subprocess.run(rspec_command(project_root, spec_file), cwd=project_root,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    return {'status': 'passed' if result.returncode == 0 else 'failed',
+            'exit_code': result.returncode,
+            'output': result.stdout.decode('utf-8', errors='replace')}
+
+
+class Job:
+    """One pending or running spec run and the requests waiting on it."""
+
+    _ids = iter(range(1, 1 << 62))
+
+    def __init__(self, spec_file, delay=0.0):
+        self.spec_file = spec_file
+        self.due = time.monotonic() + delay
+        self.pid_file = f"/tmp/claude-spec-runner-{os.getpid()}-{next(self._ids)}.pid"
+        self.waiters = []
+        self.process = None
+        self.cancelled = False
+
+
+class Waiter:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+    def deliver(self, result):
+        self.result = result
+        self.event.set()
+
+
+class SpecScheduler:
+    """Debounces, coalesces and cancels spec runs keyed by spec file."""
+
+    def __init__(self, project_root):
+        self.project_root = project_root
+        self.lock = threading.Lock()
+        # One run at a time: specs share the test database
+        self.run_lock = threading.Lock()
+        self.jobs = {}
+        self.last_activity = time.monotonic()
+
+    def submit(self, spec_file):
+        waiter = Waiter()
+        with self.lock:
+            self.last_activity = time.monotonic()
+            job = self.jobs.get(spec_file)
+            if job is not None and job.process is None and not job.cancelled:
+                # Still debouncing or queued: coalesce into the pending run
+                job.due = time.monotonic() + DEBOUNCE_SECONDS
+                job.waiters.append(waiter)
+                return waiter
+            if job is not None:
+                # A run is in progress: supersede it and debounce the replacement
+                self._cancel(job)
+                job = self.jobs[spec_file] = Job(spec_file, DEBOUNCE_SECONDS)
+            else:
+                job = self.jobs[spec_file] = Job(spec_file)
+            job.waiters.append(waiter)
+        threading.Thread(target=self._run, args=(job,), daemon=True).start()
+        return waiter
+
+    def _cancel(self, job):
+        # Kills the local docker client; _run then kills rspec inside the container
+        job.cancelled = True
+        if job.process is not None and job.process.poll() is None:
+            try:
+                os.killpg(job.process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+        superseded = {'status': 'superseded', 'exit_code': 0, 'output': ''}
+        for waiter in job.waiters:
+            waiter.deliver(superseded)
+        job.waiters = []
+
+    def _run(self, job):
+        while True:
+            with self.lock:
+                delay = job.due - time.monotonic()
+                if job.cancelled:
+                    return
+            if delay <= 0:
+                break
+            time.sleep(delay)
+
+        with self.run_lock:
+            with self.lock:
+                if job.cancelled:
+                    return
+                try:
+                    job.process = subprocess.Popen(
+                        rspec_command(self.project_root, job.spec_file, job.pid_file), cwd=self.project_root,
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True,
+                    )
+                except OSError as e:
+                    result = {'status': 'error', 'exit_code': 1, 'output': f"{e}\n"}
+                    job.process = None
+            if job.process is not None:
+                output, _ = job.process.communicate()
+                if job.cancelled:
+                    # Still holding run_lock, so the next run cannot overlap on the test DB
+                    kill_in_container(self.project_root, job.pid_file)
+                    return
+                result = {'status': 'passed' if job.process.returncode == 0 else 'failed',
+                          'exit_code': job.process.returncode,
+                          'output': output.decode('utf-8', errors='replace')}
+
+        with self.lock:
+            if job.cancelled:
+                return
+            if self.jobs.get(job.spec_file) is job:
+                del self.jobs[job.spec_file]
+            waiters, job.waiters = job.waiters, []
+            self.last_activity = time.monotonic()
+        for waiter in waiters:
+            waiter.deliver(result)
+
+    def idle(self):
+        with self.lock:
+            return not self.jobs and time.monotonic() - self.last_activity > IDLE_TIMEOUT_SECONDS
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        server = self.server
+        if request.get('command') == 'status':
+            with server.scheduler.lock:
+                response = {'status': 'ok', 'pid': os.getpid(), 'jobs': sorted(server.scheduler.jobs)}
+        elif request.get('command') == 'stop':
+            response = {'status': 'ok'}
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        else:
+            response = server.handle_edit(request.get('relative_path', ''))
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+class SpecRunnerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, project_root):
+        self.project_root = project_root
+        self.specignore = SpecIgnore(Path(project_root) / ".specignore")
+        self.scheduler = SpecScheduler(project_root)
+        super().__init__(str(socket_path), RequestHandler)
+
+    def handle_edit(self, relative_path):
+        action, spec_file = classify(relative_path, self.project_root, self.specignore)
+        if action != 'run':
+            return {'status': action, 'spec': spec_file}
+        waiter = self.scheduler.submit(spec_file)
+        if not waiter.event.wait(REQUEST_TIMEOUT_SECONDS):
+            return {'status': 'error', 'spec': spec_file, 'exit_code': 1,
+                    'output': f"Timed out after {REQUEST_TIMEOUT_SECONDS}s waiting for spec run\n"}
+        return {**waiter.result, 'spec': spec_file}
+
+
+def serve(socket_path=SOCKET_PATH, project_root=PROJECT_ROOT):
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    # Held for the daemon's lifetime: a second daemon started at the same
+    # moment backs off instead of unlinking this one's socket
+    with open(socket_path.with_suffix('.lock'), 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            print(f"Spec runner already starting on {socket_path}", file=sys.stderr)
+            return
+        _serve_locked(socket_path, project_root)
+
+
+def _serve_locked(socket_path, project_root):
+    if socket_path.exists():
+        if request_daemon({'command': 'status'}, socket_path) is not None:
+            print(f"Spec runner already listening on {socket_path}", file=sys.stderr)
+            return
+        socket_path.unlink()
+    server = SpecRunnerServer(socket_path, project_root)
+    os.chmod(socket_path, 0o600)
+    if has_spring(project_root):
+        threading.Thread(target=warm_spring, args=(project_root,), daemon=True).start()
+
+    def watch_idle():
+        while True:
+            time.sleep(60)
+            if server.scheduler.idle():
+                server.shutdown()
+                return
+
+    threading.Thread(target=watch_idle, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+
+
+def request_daemon(request, socket_path=SOCKET_PATH, timeout=REQUEST_TIMEOUT_SECONDS):
+    """Send one request to the daemon; None when it is not reachable."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+            with sock.makefile('rb') as f:
+                line = f.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def start_daemon(socket_path=SOCKET_PATH, project_root=PROJECT_ROOT):
+    """Start the daemon detached and wait for its socket; True on success."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, 'ab') as log:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve',
+                          '--project-root', project_root, '--socket', str(socket_path)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    deadline = time.monotonic() + CONNECT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if request_daemon({'command': 'status'}, socket_path, timeout=1) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def report(result, relative_path, project_root, out=None, err=None):
+    """Print the hook messages for a result and return the hook exit code."""
+    out = out or sys.stdout
+    err = err or sys.stderr
+    status = result['status']
+    spec_file = result.get('spec')
+    if status == 'ignored':
+        print(f"ℹ️  File is in .specignore, no spec required: {relative_path}", file=err)
+    elif status == 'unmapped':
+        print(f"ℹ️  No spec mapping found for: {relative_path}", file=err)
+    elif status == 'missing':
+        rule = "━" * 53
+        print("🚨 ERROR: SPEC REQUIRED!", file=err)
+        print(rule, file=err)
+        print(f"❌ No spec found for: {relative_path}", file=err)
+        print(f"❌ Expected spec at: {spec_file}", file=err)
+        print("", file=err)
+        print("⚠️  YOU MUST CREATE THIS SPEC BEFORE PROCEEDING!", file=err)
+        print("", file=err)
+        print("To create the spec, run:", file=err)
+        print(f"  touch {project_root}/{spec_file}", file=err)
+        print("", file=err)
+        print("Or if this file doesn't need a spec, add it to .specignore:", file=err)
+        print(f"  echo '{relative_path}' >> {project_root}/.specignore", file=err)
+        print(rule, file=err)
+        return 2
+    elif status == 'superseded':
+        print(f"ℹ️  Spec run superseded by a newer edit: {spec_file}", file=err)
+    else:
+        print(f"✅ Running spec: {spec_file}", file=err)
+        if not has_spring(project_root):
+            print("ℹ️  No bin/spring: Rails booted cold for this run; "
+                  "add spring-commands-rspec to keep it preloaded", file=err)
+        output = result.get('output', '')
+        print(output, file=err, end='' if output.endswith('\n') else '\n')
+        if status != 'passed':
+            failures = output.find('\nFailures:')
+            if failures != -1:
+                print(output[failures + 1:], file=err, end='')
+            return 2
+        print("✅ All specs passed", file=out)
+    return 0
+
+
+def check_file(file_path, project_root=PROJECT_ROOT, socket_path=SOCKET_PATH, out=None, err=None):
+    """Run the spec check for one edited file; returns the hook exit code."""
+    if not file_path.endswith('.rb') or PROJECT_MARKER not in file_path:
+        return 0
+    prefix = project_root.rstrip('/') + '/'
+    relative_path = file_path[len(prefix):] if file_path.startswith(prefix) else file_path
+
+    request = {'relative_path': relative_path}
+    result = request_daemon(request, socket_path)
+    if result is None and start_daemon(socket_path, project_root):
+        result = request_daemon(request, socket_path)
+    if result is None:
+        # Daemon unavailable: behave like the original one-shot hook
+        action, spec_file = classify(relative_path, project_root, SpecIgnore(Path(project_root) / ".specignore"))
+        result = {'status': action, 'spec': spec_file}
+        if action == 'run':
+            result.update(run_once(spec_file, project_root))
+    return report(result, relative_path, project_root, out, err)
+
+
+def hook(project_root=PROJECT_ROOT, socket_path=SOCKET_PATH):
+    try:
+        payload = json.load(sys.stdin)
+    except ValueError:
+        return 0
+    file_path = (payload.get('tool_input') or {}).get('file_path') or ''
+    return check_file(file_path, project_root, socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent RSpec runner for Claude hooks')
+    parser.add_argument('command', choices=('hook', 'serve', 'status', 'stop'))
+    parser.add_argument('--project-root', default=PROJECT_ROOT)
+    parser.add_argument('--socket', default=str(SOCKET_PATH))
+    args = parser.parse_args()
+    socket_path = Path(args.socket).expanduser()
+
+    if args.command == 'hook':
+        sys.exit(hook(args.project_root, socket_path))
+    if args.command == 'serve':
+        serve(socket_path, args.project_root)
+        return
+    response = request_daemon({'command': args.command}, socket_path, timeout=5)
+    if response is None:
+        print("Spec runner is not running")
+        sys.exit(1)
+    if args.command == 'status':
+        jobs = ', '.join(response['jobs']) or 'none'
+        print(f"Spec runner pid {response['pid']} on {socket_path} (active: {jobs})")
+    else:
+        print("Spec runner stopped")
+
+
+if __name__ == "__main__":
+    main()
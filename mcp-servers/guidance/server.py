@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Resident guidance_load server (MCP over stdio), per research/guidance-mcp-plan.md.
+
+At startup the server builds a compact in-memory catalogue of guidance/ and
+project-guidance/. Each entry holds the fields needed to filter and rank a
+file: focus levels, tags, category, line count and a term-frequency map.
+Full YAML is parsed on demand, and only for the files that end up in a
+response. Requests are answered concurrently from a thread pool. A polling
+watcher re-reads changed files and swaps in an updated catalogue, so
+edits show up within POLL_SECONDS without a restart.
+
+Budgets from the plan: text search < 100 ms and focus-level/tag filtering
+< 200 ms over 100+ files. `server.py bench` measures both, in-process and
+as a stdio round trip, and exits non-zero when a budget is missed.
+
+Usage:
+    server.py [--root ~/.claude]                       # MCP stdio server
+    server.py query "implementing rails controllers" --focus implementation
+    server.py bench [--files 300] [--queries 200]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+FOCUS_LEVELS = ("strategic", "design", "implementation")
+PROTOCOL_VERSION = "2025-06-18"
+# Versions whose tools/list and tools/call shapes this server speaks; an
+# unsupported request gets PROTOCOL_VERSION back and the client decides
+SUPPORTED_PROTOCOL_VERSIONS = ("2024-11-05", "2025-03-26", "2025-06-18")
+SERVER_INFO = {"name": "guidance", "version": "1.0.0"}
+
+SEARCH_BUDGET_MS = 100
+FILTER_BUDGET_MS = 200
+POLL_SECONDS = 1.0
+MAX_WORKERS = 8
+DEFAULT_AUTO_LOAD = 2
+MAX_OPTIONS = 5
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#-]*")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from how i in into is it of on or the this to "
+    "what when with".split()
+)
+
+# Scoring weights from the plan's "Smart Scoring" section
+NAME_WEIGHT = 40
+CATEGORY_WEIGHT = 20
+TAG_WEIGHT = 50
+CONTENT_WEIGHT = 30
+PROJECT_BONUS = 20
+# Files without focus_levels stay eligible but rank below declared matches
+UNDECLARED_PENALTY = 10
+
+GUIDANCE_LOAD_TOOL = {
+    "name": "guidance_load",
+    "description": "Find and load task-specific guidance at the requested focus level. "
+                   "Auto-loads the best matches and lists further options; pass their "
+                   "numbers as `load` to fetch them.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "What you need guidance on"},
+            "focus_level": {"type": "string", "enum": list(FOCUS_LEVELS),
+                            "description": "Granularity of guidance"},
+            "project": {"type": "string", "description": "Project name for project guidance"},
+            "tags": {"type": "array", "items": {"type": "string"},
+                     "description": "Only files carrying all of these tags"},
+            "max_auto_load": {"type": "integer", "default": DEFAULT_AUTO_LOAD,
+                              "description": "Maximum files to auto-load"},
+            "load": {"type": "string",
+                     "description": "Option numbers from the previous result, e.g. \"1,3\""},
+        },
+        "required": ["query", "focus_level"],
+    },
+}
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def scan_frontmatter(text):
+    """
+    Extract the catalogue fields from frontmatter without a YAML parser.
+
+    Handles `key: value`, inline lists (`key: [a, b]`) and block lists;
+    returns {} when there is no frontmatter.
+    """
+    if not text.startswith('---\n'):
+        return {}
+    end = text.find('\n---', 3)
+    if end == -1:
+        return {}
+    fields = {}
+    current = None
+    for line in text[4:end].split('\n'):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if line[0] not in ' \t-':
+            key, _, value = line.partition(':')
+            key = key.strip()
+            value = value.strip()
+            current = key
+            if value.startswith('[') and value.endswith(']'):
+                fields[key] = [v.strip().strip('"\'') for v in value[1:-1].split(',') if v.strip()]
+            elif value:
+                fields[key] = value.strip('"\'')
+            else:
+                fields[key] = []
+        elif current is not None and line.lstrip().startswith('- ') and isinstance(fields.get(current), list):
+            fields[current].append(line.lstrip()[2:].strip().strip('"\''))
+    return fields
+
+
+def strip_frontmatter(text):
+    if text.startswith('---\n'):
+        end = text.find('\n---', 3)
+        if end != -1:
+            return text[end + 4:].lstrip('\n')
+    return text
+
+
+class CatalogueEntry:
+    """Compact per-file record used for filtering and ranking."""
+
+    __slots__ = ('path', 'rel', 'scope', 'project', 'category', 'name_terms', 'focus_levels',
+                 'tags', 'title', 'lines', 'terms', 'mtime_ns', 'size')
+
+    def __init__(self, path, root, scope, text, stat):
+        self.path = path
+        self.rel = os.path.relpath(path, root)
+        self.scope = scope
+        parts = self.rel.split(os.sep)
+        # project-guidance/<project>/<category>/file.md
+        self.project = parts[0] if scope == 'project' and len(parts) > 1 else None
+        fields = scan_frontmatter(text)
+        category_parts = parts[1:-1] if self.project else parts[:-1]
+        self.category = fields.get('category') if isinstance(fields.get('category'), str) else \
+            (category_parts[-1] if category_parts else '')
+        self.name_terms = frozenset(tokenize(os.path.splitext(parts[-1])[0]))
+        levels = fields.get('focus_levels') or []
+        self.focus_levels = frozenset(levels if isinstance(levels, list) else [levels])
+        tags = fields.get('tags') or []
+        self.tags = frozenset(str(t).lower() for t in (tags if isinstance(tags, list) else [tags]))
+        body = strip_frontmatter(text)
+        heading = re.search(r'^#\s+(.+)$', body, re.MULTILINE)
+        self.title = heading.group(1).strip() if heading else None
+        self.lines = text.count('\n')
+        terms = {}
+        for term in tokenize(body):
+            terms[term] = terms.get(term, 0) + 1
+        self.terms = terms
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+
+
+class Catalogue:
+    """
+    In-memory catalogue of guidance files with focus-level and tag indexes.
+
+    refresh() rebuilds changed entries and swaps in new index dicts, so
+    readers never see a half-updated catalogue and need no lock.
+    """
+
+    def __init__(self, claude_dir=CLAUDE_DIR):
+        self.claude_dir = os.path.abspath(os.path.expanduser(str(claude_dir)))
+        self.roots = [('global', os.path.join(self.claude_dir, 'guidance')),
+                      ('project', os.path.join(self.claude_dir, 'project-guidance'))]
+        # Bundle definitions (guidance_bundles.py) only chain other guidance files
+        self.skip_dirs = {os.path.join(self.claude_dir, 'guidance', 'bundles')}
+        self.entries = {}
+        self.by_focus = {}
+        self.undeclared = frozenset()
+        self.by_tag = {}
+        self.generation = 0
+        self._refresh_lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Re-read added/changed files and drop deleted ones; returns the number of changes."""
+        with self._refresh_lock:
+            entries = dict(self.entries)
+            seen = set()
+            changes = 0
+            for scope, root in self.roots:
+                for dirpath, dirnames, filenames in os.walk(root):
+                    dirnames[:] = [d for d in dirnames if not d.startswith('.')
+                                   and os.path.join(dirpath, d) not in self.skip_dirs]
+                    for filename in filenames:
+                        if not filename.endswith('.md') or filename == 'README.md':
+                            continue
+                        path = os.path.join(dirpath, filename)
+                        seen.add(path)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        entry = entries.get(path)
+                        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                            continue
+                        try:
+                            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                                text = f.read()
+                        except OSError:
+                            continue
+                        entries[path] = CatalogueEntry(path, root, scope, text, stat)
+                        changes += 1
+            for path in [p for p in entries if p not in seen]:
+                del entries[path]
+                changes += 1
+            if changes or not self.generation:
+                self._swap(entries)
+            return changes
+
+    def _swap(self, entries):
+        by_focus = {level: set() for level in FOCUS_LEVELS}
+        undeclared = set()
+        by_tag = {}
+        for path, entry in entries.items():
+            if not entry.focus_levels:
+                undeclared.add(path)
+            for level in entry.focus_levels:
+                by_focus.setdefault(level, set()).add(path)
+            for tag in entry.tags:
+                by_tag.setdefault(tag, set()).add(path)
+        # Indexes go in before entries. filter() reads entries first, so during a
+        # swap it can only see index paths its entries dict lacks, which it skips
+        self.by_focus = {k: frozenset(v) for k, v in by_focus.items()}
+        self.undeclared = frozenset(undeclared)
+        self.by_tag = {k: frozenset(v) for k, v in by_tag.items()}
+        self.entries = entries
+        self.generation += 1
+
+    def filter(self, focus_level, tags=(), project=None):
+        """Candidate entries for focus_level (plus undeclared files), all tags, and project."""
+        entries = self.entries
+        candidates = set(self.by_focus.get(focus_level, ())) | self.undeclared
+        for tag in tags:
+            candidates &= self.by_tag.get(tag.lower(), frozenset())
+        result = []
+        for path in candidates:
+            entry = entries.get(path)
+            if entry is None:
+                continue
+            if entry.scope == 'project' and project and entry.project != project:
+                continue
+            result.append(entry)
+        return result
+
+    @staticmethod
+    def score(entry, terms, project=None):
+        if not terms:
+            return 0.0
+        name_hits = sum(1 for t in terms if t in entry.name_terms)
+        category_terms = entry.category.lower().replace('/', '-').split('-') if entry.category else ()
+        category_hits = sum(1 for t in terms if t in category_terms)
+        tag_hits = sum(1 for t in terms if t in entry.tags)
+        content = [entry.terms.get(t, 0) for t in terms]
+        coverage = sum(1 for tf in content if tf) / len(terms)
+        if not (name_hits or category_hits or tag_hits or coverage):
+            return 0.0
+        score = (NAME_WEIGHT * name_hits + CATEGORY_WEIGHT * category_hits + TAG_WEIGHT * tag_hits
+                 + CONTENT_WEIGHT * coverage + min(sum(content), 50) / 10)
+        if project and entry.project == project:
+            score += PROJECT_BONUS
+        if not entry.focus_levels:
+            score -= UNDECLARED_PENALTY
+        return score
+
+    def search(self, query, focus_level, tags=(), project=None):
+        """[(score, entry)] best first, after filtering by focus level, tags and project."""
+        return self.rank(self.filter(focus_level, tags, project), query, project)
+
+    def rank(self, candidates, query, project=None):
+        """[(score, entry)] best first for already-filtered candidates."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        ranked = []
+        for entry in candidates:
+            score = self.score(entry, terms, project)
+            if score > 0:
+                ranked.append((score, entry))
+        ranked.sort(key=lambda item: (-item[0], item[1].scope != 'project', item[1].rel))
+        return ranked
+
+
+def describe(entry):
+    """Description from full YAML frontmatter, parsed only for files being returned."""
+    try:
+        with open(entry.path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return '', ''
+    description = ''
+    if text.startswith('---\n'):
+        end = text.find('\n---', 3)
+        if end != -1:
+            try:
+                import yaml
+                frontmatter = yaml.safe_load(text[4:end]) or {}
+            except Exception:
+                frontmatter = scan_frontmatter(text)
+            if isinstance(frontmatter, dict):
+                description = str(frontmatter.get('description') or '')
+    return description or entry.title or '', text
+
+
+def display_path(entry):
+    return entry.rel if entry.scope == 'global' else f"project-guidance/{entry.rel}"
+
+
+class GuidanceServer:
+    """guidance_load tool logic plus the per-session option list for numbered loads."""
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        self.options = []
+        self.options_lock = threading.Lock()
+
+    def guidance_load(self, args):
+        start = time.perf_counter()
+        if args.get('load'):
+            return self._load_numbers(args['load'])
+        query = args.get('query') or ''
+        focus_level = args.get('focus_level')
+        if focus_level not in FOCUS_LEVELS:
+            raise ValueError(f"focus_level must be one of {', '.join(FOCUS_LEVELS)}")
+        max_auto_load = int(args.get('max_auto_load') or DEFAULT_AUTO_LOAD)
+        tags = args.get('tags') or []
+        filtered = self.catalogue.filter(focus_level, tags, args.get('project'))
+        ranked = self.catalogue.rank(filtered, query, args.get('project'))
+        auto = [entry for _, entry in ranked[:max_auto_load]]
+        options = [entry for _, entry in ranked[max_auto_load:max_auto_load + MAX_OPTIONS]]
+        with self.options_lock:
+            self.options = options
+
+        if not auto:
+            return (f"No {focus_level}-level guidance matched '{query}' "
+                    f"({len(filtered)} files considered).")
+        sections = []
+        summary = [f"Auto-loaded ({len(auto)} files, ~{sum(e.lines for e in auto)} lines):"]
+        for entry in auto:
+            description, text = describe(entry)
+            summary.append(f"✓ {display_path(entry)} ({entry.lines} lines)"
+                           + (f" - {description}" if description else ''))
+            sections.append(f"<!-- {display_path(entry)} -->\n{strip_frontmatter(text).rstrip()}\n")
+        if options:
+            summary.append("\nAdditional options (load with guidance_load load=\"1,3\"):")
+            for number, entry in enumerate(options, 1):
+                summary.append(f"{number}. {display_path(entry)} (~{entry.lines} lines)")
+        elapsed = (time.perf_counter() - start) * 1000
+        summary.append(f"\n[{len(self.catalogue.entries)} files catalogued, {len(filtered)} at "
+                       f"{focus_level} level, {len(ranked)} matched, {elapsed:.1f}ms]")
+        return '\n'.join(summary) + '\n\n' + '\n'.join(sections)
+
+    def _load_numbers(self, numbers):
+        with self.options_lock:
+            options = list(self.options)
+        chosen = []
+        for part in str(numbers).split(','):
+            part = part.strip()
+            if part.isdigit() and 1 <= int(part) <= len(options):
+                chosen.append(options[int(part) - 1])
+        if not chosen:
+            return "No matching options; run a guidance_load query first."
+        sections = []
+        for entry in chosen:
+            _, text = describe(entry)
+            sections.append(f"<!-- {display_path(entry)} -->\n{strip_frontmatter(text).rstrip()}\n")
+        return f"Loaded {len(chosen)} file(s):\n\n" + '\n'.join(sections)
+
+    # MCP (JSON-RPC 2.0 over newline-delimited stdio)
+
+    def handle(self, message):
+        """Response dict for a request, or None for notifications."""
+        method = message.get('method')
+        msg_id = message.get('id')
+        if msg_id is None:
+            return None
+        try:
+            if method == 'initialize':
+                requested = (message.get('params') or {}).get('protocolVersion')
+                version = requested if requested in SUPPORTED_PROTOCOL_VERSIONS else PROTOCOL_VERSION
+                result = {'protocolVersion': version, 'serverInfo': SERVER_INFO,
+                          'capabilities': {'tools': {'listChanged': False}}}
+            elif method == 'ping':
+                result = {}
+            elif method == 'tools/list':
+                result = {'tools': [GUIDANCE_LOAD_TOOL]}
+            elif method == 'tools/call':
+                params = message.get('params') or {}
+                if params.get('name') != GUIDANCE_LOAD_TOOL['name']:
+                    return _error(msg_id, -32602, f"Unknown tool: {params.get('name')}")
+                try:
+                    text = self.guidance_load(params.get('arguments') or {})
+                    result = {'content': [{'type': 'text', 'text': text}]}
+                except (ValueError, TypeError) as e:
+                    result = {'content': [{'type': 'text', 'text': str(e)}], 'isError': True}
+            else:
+                return _error(msg_id, -32601, f"Method not found: {method}")
+        except Exception as e:
+            return _error(msg_id, -32603, f"{type(e).__name__}: {e}")
+        return {'jsonrpc': '2.0', 'id': msg_id, 'result': result}
+
+
+def _error(msg_id, code, message):
+    return {'jsonrpc': '2.0', 'id': msg_id, 'error': {'code': code, 'message': message}}
+
+
+def watch(catalogue, stop, interval=POLL_SECONDS):
+    """Hot-reload loop: pick up added, changed and deleted files."""
+    while not stop.wait(interval):
+        try:
+            catalogue.refresh()
+        except Exception as e:
+            print(f"guidance: refresh failed: {e}", file=sys.stderr)
+
+
+def serve(claude_dir=CLAUDE_DIR, stdin=None, stdout=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    server = GuidanceServer(Catalogue(claude_dir))
+    stop = threading.Event()
+    threading.Thread(target=watch, args=(server.catalogue, stop), daemon=True).start()
+    write_lock = threading.Lock()
+
+    def respond(message):
+        response = server.handle(message)
+        if response is not None:
+            line = json.dumps(response, ensure_ascii=False) + '\n'
+            with write_lock:
+                stdout.write(line)
+                stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                with write_lock:
+                    stdout.write(json.dumps(_error(None, -32700, 'Parse error')) + '\n')
+                    stdout.flush()
+                continue
+            for item in message if isinstance(message, list) else [message]:
+                pool.submit(respond, item)
+    stop.set()
+
+
+# Benchmark
+
+BENCH_QUERIES = [
+    ("implementing rails controllers", "implementation"),
+    ("service objects", "implementation"),
+    ("rspec mocking", "implementation"),
+    ("designing api contracts", "design"),
+    ("system architecture planning", "strategic"),
+    ("error handling", "implementation"),
+    ("code review", "implementation"),
+    ("frontend components vue", "implementation"),
+    ("database migrations", "design"),
+    ("security boundaries", "design"),
+]
+
+
+def synthesize(source_dir, count):
+    """Copy the real corpus into a temp tree until it holds `count` guidance files."""
+    target = tempfile.mkdtemp(prefix='guidance-bench-')
+    sources = []
+    for scope in ('guidance', 'project-guidance'):
+        for dirpath, _, filenames in os.walk(os.path.join(source_dir, scope)):
+            sources.extend(os.path.join(dirpath, f) for f in filenames if f.endswith('.md'))
+    sources.sort()
+    if not sources:
+        raise SystemExit(f"No guidance under {source_dir}")
+    for n in range(max(count, len(sources))):
+        source = sources[n % len(sources)]
+        rel = os.path.relpath(source, source_dir)
+        if n >= len(sources):
+            stem, ext = os.path.splitext(rel)
+            rel = f"{stem}-copy{n // len(sources)}{ext}"
+        dest = os.path.join(target, rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(source, dest)
+    return target
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+
+    def pct(p):
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    return {'p50_ms': pct(0.50), 'p95_ms': pct(0.95), 'max_ms': timings[-1]}
+
+
+def bench(claude_dir, files, queries, stdio=True):
+    root = synthesize(claude_dir, files)
+    try:
+        start = time.perf_counter()
+        catalogue = Catalogue(root)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        filter_times, search_times = [], []
+        for n in range(queries):
+            query, level = BENCH_QUERIES[n % len(BENCH_QUERIES)]
+            tags = ['rails'] if n % 3 == 0 else []
+            start = time.perf_counter()
+            catalogue.filter(level, tags)
+            filter_times.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            catalogue.search(query, level, tags)
+            search_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        catalogue.refresh()
+        refresh_ms = (time.perf_counter() - start) * 1000
+
+        report = {
+            'files': len(catalogue.entries),
+            'catalogue_build_ms': build_ms,
+            'idle_refresh_ms': refresh_ms,
+            'filter': {**percentiles(filter_times), 'budget_ms': FILTER_BUDGET_MS},
+            'search': {**percentiles(search_times), 'budget_ms': SEARCH_BUDGET_MS},
+        }
+        if stdio:
+            report['stdio_guidance_load'] = {**bench_stdio(root, queries), 'budget_ms': FILTER_BUDGET_MS}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    checks = [report['filter'], report['search']] + \
+        ([report['stdio_guidance_load']] if stdio else [])
+    report['within_budget'] = all(c['p95_ms'] <= c['budget_ms'] for c in checks)
+    return report
+
+
+def bench_stdio(root, queries):
+    """Round-trip guidance_load calls through a spawned server, pipelined in batches of 10."""
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--root', root],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+    try:
+        process.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': 0, 'method': 'initialize',
+                                        'params': {'protocolVersion': PROTOCOL_VERSION}}) + '\n')
+        process.stdin.flush()
+        process.stdout.readline()
+        timings = []
+        for n in range(queries):
+            query, level = BENCH_QUERIES[n % len(BENCH_QUERIES)]
+            start = time.perf_counter()
+            process.stdin.write(json.dumps({
+                'jsonrpc': '2.0', 'id': n + 1, 'method': 'tools/call',
+                'params': {'name': 'guidance_load', 'arguments': {'query': query, 'focus_level': level}},
+            }) + '\n')
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            timings.append((time.perf_counter() - start) * 1000)
+            if 'error' in response:
+                raise RuntimeError(response['error'])
+        return percentiles(timings)
+    finally:
+        process.stdin.close()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='guidance_load MCP server (stdio)')
+    parser.add_argument('--root', default=str(CLAUDE_DIR),
+                        help='Claude config directory (default: ~/.claude)')
+    sub = parser.add_subparsers(dest='command')
+    query = sub.add_parser('query', help='Run one guidance_load call and print the result')
+    query.add_argument('query')
+    query.add_argument('--focus', choices=FOCUS_LEVELS, default='implementation')
+    query.add_argument('--project')
+    query.add_argument('--tag', action='append', default=[])
+    query.add_argument('--max-auto-load', type=int, default=DEFAULT_AUTO_LOAD)
+    benchmark = sub.add_parser('bench', help="Check the plan's latency budgets")
+    benchmark.add_argument('--files', type=int, default=150,
+                           help='Corpus size; the real corpus is replicated up to this (default: 150)')
+    benchmark.add_argument('--queries', type=int, default=200)
+    benchmark.add_argument('--no-stdio', action='store_true', help='Skip the stdio round-trip timing')
+    benchmark.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        server = GuidanceServer(Catalogue(args.root))
+        print(server.guidance_load({'query': args.query, 'focus_level': args.focus,
+                                    'project': args.project, 'tags': args.tag,
+                                    'max_auto_load': args.max_auto_load}))
+        return
+    if args.command == 'bench':
+        report = bench(os.path.expanduser(args.root), args.files, args.queries, not args.no_stdio)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"{report['files']} files: catalogue built in {report['catalogue_build_ms']:.1f}ms, "
+                  f"idle refresh {report['idle_refresh_ms']:.1f}ms")
+            for name in ('filter', 'search', 'stdio_guidance_load'):
+                if name in report:
+                    r = report[name]
+                    ok = '✅' if r['p95_ms'] <= r['budget_ms'] else '❌'
+                    print(f"  {ok} {name:<20} p50 {r['p50_ms']:.2f}ms  p95 {r['p95_ms']:.2f}ms  "
+                          f"max {r['max_ms']:.2f}ms  (budget {r['budget_ms']}ms)")
+        sys.exit(0 if report['within_budget'] else 1)
+    serve(args.root)
+
+
+if __name__ == "__main__":
+    main()
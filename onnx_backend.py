@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime CPU backend for the LLMLingua-2 token classifier.
+
+The BERT token classifier is exported to ONNX once and, for the int8
+backend, dynamically quantized (QInt8 weights). Both live under
+~/.cache/compress-guidance/onnx/. OnnxPromptCompressor is a
+PromptCompressor whose model is an ONNX Runtime session. The tokenizer,
+compress_prompt settings and force-token handling stay exactly those of
+llmlingua, and the PyTorch weights are never loaded at inference time.
+OnnxPromptCompressor.load_model mirrors llmlingua's own, so the backend
+refuses to load on any llmlingua other than LLMLINGUA_VERSION
+(pip install llmlingua==0.2.2).
+
+The parity check compresses a corpus with the PyTorch backend and with an
+ONNX backend and compares the outputs word by word. It fails when any file
+falls below the similarity tolerance. Latency and peak RSS per backend
+come from benchmark_compression.py --set backend=torch,onnx,onnx-int8.
+
+Usage:
+    onnx_backend.py export [--force]
+    onnx_backend.py parity [--backend onnx-int8] [--corpus 'guidance/**/*.md'] [--tolerance 0.9]
+"""
+import argparse
+import difflib
+import importlib.metadata
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import compress_guidance
+from compress_guidance import DEFAULT_CACHE_DIR, MODEL_NAME
+
+ONNX_DIR = Path(DEFAULT_CACHE_DIR) / "onnx" / MODEL_NAME.replace('/', '--')
+FP32_MODEL = ONNX_DIR / "model.onnx"
+INT8_MODEL = ONNX_DIR / "model.int8.onnx"
+OPSET = 14
+# The llmlingua release whose PromptCompressor.load_model is mirrored below
+LLMLINGUA_VERSION = "0.2.2"
+DEFAULT_TOLERANCE = 0.9
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'guidance', '**', '*.md')
+
+
+def export_model(force=False):
+    """Export the token classifier to ONNX and quantize it; returns (fp32, int8) paths."""
+    if force or not FP32_MODEL.is_file():
+        import torch
+        from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+        ONNX_DIR.mkdir(parents=True, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model = AutoModelForTokenClassification.from_pretrained(MODEL_NAME)
+        model.eval()
+        sample = tokenizer(["export sample"], return_tensors='pt')
+        tmp_path = FP32_MODEL.with_suffix(f'.{os.getpid()}.tmp')
+        with torch.no_grad():
+            torch.onnx.export(
+                model, (sample['input_ids'], sample['attention_mask']), str(tmp_path),
+                input_names=['input_ids', 'attention_mask'], output_names=['logits'],
+                dynamic_axes={name: {0: 'batch', 1: 'sequence'}
+                              for name in ('input_ids', 'attention_mask', 'logits')},
+                opset_version=OPSET,
+            )
+        os.replace(tmp_path, FP32_MODEL)
+        force = True
+
+    if force or not INT8_MODEL.is_file():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp_path = INT8_MODEL.with_suffix(f'.{os.getpid()}.tmp')
+        quantize_dynamic(str(FP32_MODEL), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, INT8_MODEL)
+    return FP32_MODEL, INT8_MODEL
+
+
+class OnnxTokenClassifier:
+    """Callable stand-in for the PyTorch model: same inputs, returns .logits as a tensor."""
+
+    def __init__(self, model_path, config):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(str(model_path), options,
+                                                    providers=['CPUExecutionProvider'])
+        self.config = config
+
+    def __call__(self, input_ids, attention_mask, **_):
+        import numpy as np
+        import torch
+
+        (logits,) = self.session.run(['logits'], {
+            'input_ids': input_ids.cpu().numpy().astype(np.int64),
+            'attention_mask': attention_mask.cpu().numpy().astype(np.int64),
+        })
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def to(self, *args, **kwargs):
+        return self
+
+    def eval(self):
+        return self
+
+
+def check_llmlingua_version():
+    """Raise RuntimeError unless the installed llmlingua is LLMLINGUA_VERSION."""
+    try:
+        installed = importlib.metadata.version('llmlingua')
+    except importlib.metadata.PackageNotFoundError:
+        installed = None
+    if installed != LLMLINGUA_VERSION:
+        raise RuntimeError(f"ONNX backend requires llmlingua=={LLMLINGUA_VERSION} "
+                           f"(installed: {installed or 'none'}); "
+                           f"pip install llmlingua=={LLMLINGUA_VERSION} or use --backend torch")
+
+
+def load_onnx_compressor(quantized=False):
+    """PromptCompressor (LLMLingua-2) running the exported classifier on ONNX Runtime."""
+    check_llmlingua_version()
+    from llmlingua import PromptCompressor
+
+    fp32_path, int8_path = export_model()
+    model_path = int8_path if quantized else fp32_path
+
+    class OnnxPromptCompressor(PromptCompressor):
+        def load_model(self, model_name, device_map="cpu", model_config={}):
+            # Mirrors PromptCompressor.load_model for a token-classification
+            # model, swapping the PyTorch weights for an ONNX session.
+            from transformers import AutoConfig, AutoTokenizer
+
+            model_config = dict(model_config)
+            model_config.setdefault("trust_remote_code", True)
+            config = AutoConfig.from_pretrained(model_name, **model_config)
+            tokenizer = AutoTokenizer.from_pretrained(model_name, **model_config)
+            if model_config.get("pad_to_left", True):
+                tokenizer.padding_side = "left"
+                tokenizer.pad_token_id = config.pad_token_id if config.pad_token_id else tokenizer.eos_token_id
+            self.device = "cpu"
+            self.tokenizer = tokenizer
+            self.model = OnnxTokenClassifier(model_path, config)
+            self.context_idxs = []
+            self.max_position_embeddings = config.max_position_embeddings
+
+    return OnnxPromptCompressor(model_name=MODEL_NAME, device_map="cpu", use_llmlingua2=True)
+
+
+def similarity(a, b):
+    """Word-level similarity of two compressed outputs (1.0 = identical)."""
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+def parity(corpus, backend, target_ratio=0.5, tolerance=DEFAULT_TOLERANCE):
+    """Compress corpus with PyTorch and backend; returns the parity report dict."""
+    reference = compress_guidance.get_compressor('torch')
+    candidate = compress_guidance.get_compressor(backend)
+    files = []
+    timings = {'torch': 0.0, backend: 0.0}
+    for path, content in corpus:
+        start = time.perf_counter()
+        expected, expected_ratio = compress_guidance.compress_text(reference, content, target_ratio)
+        timings['torch'] += time.perf_counter() - start
+        start = time.perf_counter()
+        actual, actual_ratio = compress_guidance.compress_text(candidate, content, target_ratio)
+        timings[backend] += time.perf_counter() - start
+        files.append({
+            'path': path,
+            'similarity': similarity(expected, actual),
+            'ratio_torch': expected_ratio,
+            f'ratio_{backend}': actual_ratio,
+        })
+    worst = min(files, key=lambda f: f['similarity']) if files else None
+    return {
+        'backend': backend,
+        'target_ratio': target_ratio,
+        'tolerance': tolerance,
+        'files': files,
+        'mean_similarity': sum(f['similarity'] for f in files) / len(files) if files else 1.0,
+        'worst': worst,
+        'seconds': timings,
+        'passed': all(f['similarity'] >= tolerance for f in files),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ONNX Runtime backend for guidance compression')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help='Export and quantize the model (done on first use otherwise)')
+    export.add_argument('--force', action='store_true', help='Re-export even if the files exist')
+    check = sub.add_parser('parity', help='Compare ONNX output against PyTorch on a corpus')
+    check.add_argument('--backend', choices=('onnx', 'onnx-int8'), default='onnx-int8')
+    check.add_argument('--corpus', default=DEFAULT_CORPUS,
+                       help='Glob or directory for the corpus (default: guidance/**/*.md)')
+    check.add_argument('--limit', type=int, help='Use only the first N corpus files')
+    check.add_argument('--ratio', type=float, default=0.5, help='Target compression ratio (default: 0.5)')
+    check.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                       help=f'Minimum per-file word similarity to PyTorch (default: {DEFAULT_TOLERANCE})')
+    check.add_argument('-o', '--output', help='Write the parity report as JSON')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        for path in export_model(args.force):
+            print(f"{path} ({path.stat().st_size / 1e6:.0f} MB)")
+        return
+
+    paths = compress_guidance.expand_paths([args.corpus])
+    if args.limit:
+        paths = paths[:args.limit]
+    if not paths:
+        print(f"No corpus files matched {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+    corpus = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.append((path, f.read()))
+
+    report = parity(corpus, args.backend, args.ratio, args.tolerance)
+    for f in report['files']:
+        flag = '' if f['similarity'] >= args.tolerance else '  <-- below tolerance'
+        print(f"  {f['similarity']:.3f}  {f['path']}{flag}")
+    seconds = report['seconds']
+    print(f"\n{args.backend} vs torch over {len(corpus)} file(s): "
+          f"mean similarity {report['mean_similarity']:.3f}, "
+          f"worst {report['worst']['similarity']:.3f}")
+    print(f"Compression time: torch {seconds['torch']:.2f}s, {args.backend} {seconds[args.backend]:.2f}s")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print("PARITY OK" if report['passed'] else f"PARITY FAILED (tolerance {args.tolerance})")
+    sys.exit(0 if report['passed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
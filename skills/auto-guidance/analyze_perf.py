@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Analyze auto-guidance performance logs in one streaming pass.
+
+Memory stays constant in the number of log lines: durations go into
+log-scale histograms (about 2% relative error on percentiles), and the
+slowest operations are kept in a fixed-size heap. Per-session and
+per-guidance aggregates grow only with the number of sessions and
+guidance files.
+
+Usage:
+    analyze_perf.py [log_file] [--json] [--top N]
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+from perf_log import DEFAULT_LOG, read_events
+from trigger_index import load_config
+
+# Budget for guidance loads (performance-design.md: warning above 200ms)
+GUIDANCE_LOAD_BUDGET_MS = 200
+
+HISTOGRAM_MIN_MS = 0.001
+HISTOGRAM_GROWTH = 1.02
+
+
+class Histogram:
+    """Log-bucketed duration histogram with approximate percentiles."""
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        bucket = 0 if ms <= HISTOGRAM_MIN_MS else \
+            int(math.log(ms / HISTOGRAM_MIN_MS, HISTOGRAM_GROWTH)) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == 0:
+                    return HISTOGRAM_MIN_MS
+                # Geometric midpoint of the bucket, capped at the observed max
+                upper = HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** bucket
+                return min(self.max, upper / math.sqrt(HISTOGRAM_GROWTH))
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max,
+            'total_ms': self.total,
+        }
+
+
+def extension(path):
+    name = path.rsplit('/', 1)[-1]
+    return name.rsplit('.', 1)[-1] if '.' in name else 'no_ext'
+
+
+def analyze(log_path, pattern_budget_ms, top=5):
+    """Stream the log once and return the full report as a dict."""
+    per_op = {}
+    sessions = {}
+    guidance = {}
+    extensions = {}
+    slowest = []
+    violations = {'pattern_match': 0, 'guidance_load': 0}
+    index_builds = Histogram()
+    total = 0
+
+    for sequence, event in enumerate(read_events(log_path)):
+        total += 1
+        op = event.get('op', '?')
+        ms = float(event.get('ms') or 0)
+        file = event.get('file') or '-'
+        per_op.setdefault(op, Histogram()).add(ms)
+
+        if op == 'index_build':
+            index_builds.add(ms)
+        elif op == 'pattern_match' and ms > pattern_budget_ms:
+            violations['pattern_match'] += 1
+        elif op == 'guidance_load' and ms > GUIDANCE_LOAD_BUDGET_MS:
+            violations['guidance_load'] += 1
+
+        session = sessions.get(event.get('sid', '?'))
+        if session is None:
+            session = sessions[event.get('sid', '?')] = {
+                'first_ts': event.get('ts', 0), 'last_ts': event.get('ts', 0),
+                'match': Histogram(), 'ops': 0, 'violations': 0,
+            }
+        session['ops'] += 1
+        session['last_ts'] = max(session['last_ts'], event.get('ts', 0))
+        if op == 'pattern_match':
+            session['match'].add(ms)
+            if ms > pattern_budget_ms:
+                session['violations'] += 1
+
+        if op == 'guidance_load' and file != '-':
+            stats = guidance.setdefault(file, {'matched': 0, 'loaded': 0, 'ms': 0.0})
+            stats['loaded'] += 1
+            stats['ms'] += ms
+        for path in event.get('guidance') or ():
+            stats = guidance.setdefault(path, {'matched': 0, 'loaded': 0, 'ms': 0.0})
+            stats['matched'] += 1
+            stats['ms'] += ms
+
+        if file != '-' and op != 'guidance_load':
+            ext = extension(file)
+            extensions[ext] = extensions.get(ext, 0) + 1
+
+        item = (ms, -sequence, op, file)
+        if len(slowest) < top:
+            heapq.heappush(slowest, item)
+        elif item > slowest[0]:
+            heapq.heapreplace(slowest, item)
+
+    trend = []
+    for sid, session in sorted(sessions.items(), key=lambda kv: kv[1]['first_ts']):
+        match = session['match'].summary()
+        trend.append({
+            'session': sid,
+            'first_ts': session['first_ts'],
+            'ops': session['ops'],
+            'pattern_matches': match['count'],
+            'mean_ms': match['mean_ms'],
+            'p95_ms': match['p95_ms'],
+            'violations': session['violations'],
+        })
+
+    overhead = sum(per_op[op].total for op in ('pattern_match', 'guidance_load') if op in per_op)
+    return {
+        'log': str(log_path),
+        'total_ops': total,
+        'pattern_budget_ms': pattern_budget_ms,
+        'operations': {op: h.summary() for op, h in sorted(per_op.items())},
+        'index_build': index_builds.summary(),
+        'violations': violations,
+        'hot_guidance': sorted(
+            ({'guidance': path, **stats} for path, stats in guidance.items()),
+            key=lambda g: (-g['ms'], g['guidance']),
+        )[:top],
+        'extensions': dict(sorted(extensions.items(), key=lambda kv: -kv[1])[:10]),
+        'slowest': [
+            {'ms': ms, 'op': op, 'file': file}
+            for ms, _, op, file in sorted(slowest, reverse=True)
+        ],
+        'sessions': trend,
+        'overhead_ms': overhead,
+        'overhead_per_op_ms': overhead / total if total else 0.0,
+    }
+
+
+def print_report(report):
+    print("=== Auto-Guidance Performance Analysis ===")
+    print(f"Log file: {report['log']}")
+    print(f"\nTotal operations: {report['total_ops']}\n")
+
+    if report['index_build']['count']:
+        build = report['index_build']
+        print("📚 Index Build")
+        print(f"   Builds: {build['count']}  p50 {build['p50_ms']:.1f}ms  max {build['max_ms']:.1f}ms\n")
+
+    print("⏱  Latency by Operation")
+    print(f"   {'operation':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for op, s in report['operations'].items():
+        print(f"   {op:<16}{s['count']:>8}{s['p50_ms']:>9.2f}ms{s['p95_ms']:>8.2f}ms"
+              f"{s['p99_ms']:>8.2f}ms{s['max_ms']:>8.2f}ms")
+    print()
+
+    print("🔥 Hot Guidance (by attributed time)")
+    for g in report['hot_guidance']:
+        print(f"   {g['ms']:.1f}ms  matched {g['matched']}×  loaded {g['loaded']}×  {g['guidance']}")
+    print()
+
+    print(f"⚠️  Slowest Operations (Top {len(report['slowest'])})")
+    for s in report['slowest']:
+        print(f"   {s['ms']:.2f}ms - {s['op']} - {s['file']}")
+    print()
+
+    print("📁 Operations by File Type")
+    for ext, count in report['extensions'].items():
+        print(f"   .{ext:<10} {count}")
+    print()
+
+    print("⚡ Budget Violations")
+    v = report['violations']
+    if v['pattern_match']:
+        print(f"   ⚠️  {v['pattern_match']} pattern matching operations >{report['pattern_budget_ms']}ms")
+    if v['guidance_load']:
+        print(f"   ⚠️  {v['guidance_load']} guidance loading operations >{GUIDANCE_LOAD_BUDGET_MS}ms")
+    if not v['pattern_match'] and not v['guidance_load']:
+        print("   ✅ No performance warnings")
+    print()
+
+    if len(report['sessions']) > 1:
+        print("📈 Trend Across Sessions (pattern matching)")
+        for s in report['sessions']:
+            print(f"   {s['session']:<24} {s['pattern_matches']:>6} checks  mean {s['mean_ms']:.2f}ms  "
+                  f"p95 {s['p95_ms']:.2f}ms  violations {s['violations']}")
+        print()
+
+    print("📈 Overall Impact")
+    print(f"   Total overhead: {report['overhead_ms']:.0f}ms across {report['total_ops']} operations")
+    print(f"   Average per operation: {report['overhead_per_op_ms']:.2f}ms")
+    print("\n=== Analysis Complete ===")
+
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description='Analyze auto-guidance performance logs')
+    parser.add_argument('log_file', nargs='?', default=config.get('performance_log') or DEFAULT_LOG)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--top', type=int, default=5, help='Entries in top-N lists (default: 5)')
+    args = parser.parse_args()
+
+    log_path = Path(os.path.expanduser(args.log_file))
+    if not log_path.is_file():
+        print(f"❌ Performance log not found: {log_path}")
+        print("   Make sure performance_tracking is enabled in config.yaml")
+        sys.exit(1)
+
+    report = analyze(log_path, float(config.get('max_pattern_time_ms') or 50), args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Append-only structured performance log for auto-guidance.
+
+One compact JSON object per line:
+
+    {"ts":1730116800.12,"sid":"abc","op":"pattern_match","file":"app/models/user.rb",
+     "ms":0.05,"matched":1,"loaded":0,"guidance":["rails/models.md"]}
+
+Each event is a single O_APPEND write, so concurrent writers never
+interleave partial lines. read_events() streams both this format and the
+legacy CSV format (timestamp,operation,file_path,duration_ms,matched,loaded).
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+DEFAULT_LOG = "/tmp/claude-auto-guidance-perf.log"
+
+
+def session_id():
+    """Session identifier for grouping events: $CLAUDE_SESSION_ID or the parent pid."""
+    return os.environ.get('CLAUDE_SESSION_ID') or f"ppid-{os.getppid()}"
+
+
+def append_event(log_path, op, ms, file='-', matched=None, loaded=None, guidance=None):
+    """Append one event as a single atomic line."""
+    event = {'ts': round(time.time(), 3), 'sid': session_id(), 'op': op,
+             'file': file, 'ms': round(ms, 4)}
+    if matched is not None:
+        event['matched'] = matched
+    if loaded is not None:
+        event['loaded'] = loaded
+    if guidance:
+        event['guidance'] = guidance
+    line = (json.dumps(event, separators=(',', ':')) + '\n').encode('utf-8')
+    fd = os.open(os.path.expanduser(log_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _parse_csv(line):
+    parts = line.split(',')
+    if len(parts) < 4 or parts[1] == 'operation':
+        return None
+    try:
+        ts = datetime.fromisoformat(parts[0]).timestamp()
+    except ValueError:
+        ts = 0.0
+    try:
+        ms = float(parts[3])
+    except ValueError:
+        return None
+
+    def number(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    return {'ts': ts, 'sid': 'legacy', 'op': parts[1], 'file': parts[2], 'ms': ms,
+            'matched': number(parts[4]) if len(parts) > 4 else None,
+            'loaded': number(parts[5]) if len(parts) > 5 else None}
+
+
+def read_events(log_path):
+    """Yield events from log_path one line at a time (constant memory)."""
+    with open(os.path.expanduser(log_path), 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+            else:
+                event = _parse_csv(line)
+                if event:
+                    yield event
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Compiled auto-guidance trigger index.
+
+Builds a persisted index from guidance frontmatter (`file_triggers`,
+`directory_triggers`) and matches file paths against it in near-constant
+time:
+
+- `*<suffix>` file triggers (`*.rb`, `*_controller.rb`) are bucketed by the
+  suffix's final extension, so a path only checks triggers for its own
+  extension. Suffixes without a dot (`*`, `*file`) can match any
+  extension and are checked on every call.
+- Literal file names are a dict lookup.
+- `<dir>/**` directory triggers are bucketed by directory prefix, so a path
+  only looks up its own ancestor directories.
+- Everything else is folded into one combined regex per trigger kind. The
+  individual regexes are only consulted when the combined one matches.
+
+The transitive @-reference closure of each guidance file is resolved at
+build time and stored with the index.
+
+Usage:
+    trigger_index.py build [--force]
+    trigger_index.py match <path> [<path> ...] [--project-root DIR]
+    trigger_index.py bench [--patterns N] [--calls N]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+SKILL_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = SKILL_DIR / "config.yaml"
+INDEX_PATH = Path.home() / ".cache" / "claude-guidance" / "trigger-index.json"
+INDEX_VERSION = 2
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+REFERENCE_RE = re.compile(r'@[^\s`<>()\[\]"\']*\.md')
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+DEFAULT_CONFIG = {
+    'performance_tracking': False,
+    'performance_log': "/tmp/claude-auto-guidance-perf.log",
+    'max_per_trigger': 2,
+    'max_pattern_time_ms': 50,
+    'priority': 'project_first',
+    'exclude_patterns': [],
+}
+
+
+def load_config(config_path=CONFIG_PATH):
+    """Read config.yaml, falling back to defaults when missing or unparsable."""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        import yaml
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(yaml.safe_load(f) or {})
+    except Exception:
+        pass
+    return config
+
+
+def glob_to_regex(pattern):
+    """Translate a trigger glob (`*`, `**`, `?`, `[...]`) into a regex source."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                out.append(pattern[i:end + 1])
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+def final_extension(name):
+    """'.rb' for 'user_spec.rb', '' when there is no dot."""
+    dot = name.rfind('.')
+    return name[dot:] if dot != -1 else ''
+
+
+class TriggerIndex:
+    """Bucketed trigger tables plus combined regexes for the leftovers."""
+
+    def __init__(self, data):
+        self.data = data
+        self.guidance = data['guidance']
+        self.suffix_buckets = data['suffix_buckets']
+        self.any_suffixes = data['any_suffixes']
+        self.names = data['names']
+        self.dir_prefixes = data['dir_prefixes']
+        self.file_regexes = [(re.compile(src), gid) for src, gid in data['file_regexes']]
+        self.path_regexes = [(re.compile(src), gid) for src, gid in data['path_regexes']]
+        self.file_combined = self._combine(data['file_regexes'])
+        self.path_combined = self._combine(data['path_regexes'])
+        # Excludes without '/' test the file name; others test the path at any depth
+        excludes = data['exclude_patterns']
+        self.exclude_name = self._combine([(glob_to_regex(p), None) for p in excludes if '/' not in p])
+        self.exclude_path = self._combine(
+            [('(?:.*/)?' + glob_to_regex(p), None) for p in excludes if '/' in p]
+        )
+
+    @staticmethod
+    def _combine(entries):
+        if not entries:
+            return None
+        return re.compile('|'.join(f'(?:{src})' for src, _ in entries))
+
+    def match_ids(self, rel_path):
+        """Guidance ids whose triggers match rel_path (project-relative, '/'-separated)."""
+        name = rel_path.rsplit('/', 1)[-1]
+        if (self.exclude_name and self.exclude_name.fullmatch(name)) or \
+                (self.exclude_path and self.exclude_path.fullmatch(rel_path)):
+            return set()
+        found = set(self.names.get(name, ()))
+
+        for suffix, gid in self.suffix_buckets.get(final_extension(name), ()):
+            if name.endswith(suffix):
+                found.add(gid)
+        for suffix, gid in self.any_suffixes:
+            if name.endswith(suffix):
+                found.add(gid)
+
+        # Ancestor directories: 'a/b/c.rb' -> 'a', 'a/b'
+        slash = rel_path.find('/')
+        while slash != -1:
+            found.update(self.dir_prefixes.get(rel_path[:slash], ()))
+            slash = rel_path.find('/', slash + 1)
+
+        if self.file_combined and self.file_combined.fullmatch(name):
+            found.update(gid for regex, gid in self.file_regexes if regex.fullmatch(name))
+        if self.path_combined and self.path_combined.fullmatch(rel_path):
+            found.update(gid for regex, gid in self.path_regexes if regex.fullmatch(rel_path))
+        return found
+
+    def match(self, rel_path, priority='project_first', limit=None):
+        """Matching guidance entries, ordered by priority and trimmed to limit."""
+        entries = [self.guidance[gid] for gid in self.match_ids(rel_path)]
+        if priority == 'global_first':
+            entries.sort(key=lambda e: (e['scope'] != 'global', e['path']))
+        elif priority == 'alphabetical':
+            entries.sort(key=lambda e: e['path'])
+        else:
+            entries.sort(key=lambda e: (e['scope'] != 'project', e['path']))
+        return entries[:limit] if limit else entries
+
+
+def compile_triggers(guidance, exclude_patterns):
+    """Build the serialisable index tables from guidance entries."""
+    suffix_buckets = {}
+    any_suffixes = []
+    names = {}
+    dir_prefixes = {}
+    file_regexes = []
+    path_regexes = []
+
+    for gid, entry in enumerate(guidance):
+        for pattern in entry['file_triggers']:
+            if pattern.startswith('*') and not GLOB_CHARS.search(pattern[1:]) and '/' not in pattern:
+                suffix = pattern[1:]
+                # Only a suffix with a dot pins the final extension of the names it matches
+                if '.' in suffix:
+                    suffix_buckets.setdefault(final_extension(suffix), []).append([suffix, gid])
+                else:
+                    any_suffixes.append([suffix, gid])
+            elif not GLOB_CHARS.search(pattern) and '/' not in pattern:
+                names.setdefault(pattern, []).append(gid)
+            else:
+                file_regexes.append([glob_to_regex(pattern), gid])
+        for pattern in entry['directory_triggers']:
+            pattern = pattern.strip('/')
+            if pattern.endswith('/**') and not GLOB_CHARS.search(pattern[:-3]):
+                dir_prefixes.setdefault(pattern[:-3], []).append(gid)
+            else:
+                path_regexes.append([glob_to_regex(pattern), gid])
+
+    return {
+        'guidance': guidance,
+        'suffix_buckets': suffix_buckets,
+        'any_suffixes': any_suffixes,
+        'names': names,
+        'dir_prefixes': dir_prefixes,
+        'file_regexes': file_regexes,
+        'path_regexes': path_regexes,
+        'exclude_patterns': list(exclude_patterns),
+    }
+
+
+def parse_frontmatter(content):
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return {}
+    try:
+        import yaml
+        frontmatter = yaml.safe_load(match.group(1))
+    except Exception:
+        return {}
+    return frontmatter if isinstance(frontmatter, dict) else {}
+
+
+def resolve_reference(ref, source, claude_dir):
+    """Absolute path for an @-reference, or None for project-relative ones."""
+    path = ref[1:]
+    if path.startswith('~/.claude/'):
+        return os.path.normpath(os.path.join(claude_dir, path[len('~/.claude/'):]))
+    if path.startswith('~/'):
+        return os.path.normpath(os.path.join(Path.home(), path[2:]))
+    if path.startswith(('../', './')):
+        return os.path.normpath(os.path.join(os.path.dirname(source), path))
+    return None
+
+
+def reference_closure(path, claude_dir, memo):
+    """Transitive @-references of path (existing files only, path excluded)."""
+    seen = []
+    visited = {path}
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        if current not in memo:
+            try:
+                with open(current, 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                text = ''
+            targets = []
+            for ref in REFERENCE_RE.findall(text):
+                target = resolve_reference(ref.rstrip('.,;:'), current, claude_dir)
+                if target and os.path.isfile(target):
+                    targets.append(target)
+            memo[current] = targets
+        for target in memo[current]:
+            if target not in visited:
+                visited.add(target)
+                seen.append(target)
+                stack.append(target)
+    return seen
+
+
+def guidance_roots(project_root):
+    return [("global", CLAUDE_DIR / "guidance"), ("project", Path(project_root) / ".claude" / "guidance")]
+
+
+def source_files(project_root):
+    """(scope, root, path) for every non-bundle guidance markdown file."""
+    files = []
+    for scope, root in guidance_roots(project_root):
+        if not root.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != 'bundles' and not d.startswith('.')]
+            for filename in filenames:
+                if filename.endswith('.md'):
+                    files.append((scope, root, os.path.join(dirpath, filename)))
+    return sorted(files, key=lambda f: f[2])
+
+
+def source_signature(files):
+    """{path: [mtime_ns, size]} used to detect a stale index."""
+    signature = {}
+    for _, _, path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature[path] = [stat.st_mtime_ns, stat.st_size]
+    return signature
+
+
+def build_index(project_root, config, files=None):
+    """Scan guidance frontmatter and compile the index data."""
+    files = files if files is not None else source_files(project_root)
+    claude_dir = str(CLAUDE_DIR)
+    memo = {}
+    guidance = []
+    for scope, root, path in files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                frontmatter = parse_frontmatter(f.read())
+        except OSError:
+            continue
+        file_triggers = [str(p) for p in frontmatter.get('file_triggers') or []]
+        directory_triggers = [str(p) for p in frontmatter.get('directory_triggers') or []]
+        if not file_triggers and not directory_triggers:
+            continue
+        guidance.append({
+            'path': os.path.relpath(path, root),
+            'file': path,
+            'scope': scope,
+            'file_triggers': file_triggers,
+            'directory_triggers': directory_triggers,
+            'references': reference_closure(path, claude_dir, memo),
+        })
+    data = compile_triggers(guidance, config.get('exclude_patterns') or [])
+    data['version'] = INDEX_VERSION
+    data['project_root'] = str(project_root)
+    data['sources'] = source_signature(files)
+    return data
+
+
+def load_index(project_root, config, index_path=INDEX_PATH, force=False):
+    """
+    Load the persisted index, rebuilding it when guidance files changed.
+
+    Staleness is a stat per guidance file; frontmatter is only re-read on
+    rebuild. Indexes are stored per project root.
+    """
+    project_root = str(Path(project_root).resolve())
+    store = {}
+    try:
+        store = json.loads(Path(index_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        pass
+    files = source_files(project_root)
+    data = store.get(project_root)
+    if force or not data or data.get('version') != INDEX_VERSION \
+            or data.get('sources') != source_signature(files) \
+            or data.get('exclude_patterns') != list(config.get('exclude_patterns') or []):
+        data = build_index(project_root, config, files)
+        store[project_root] = data
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(store, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, index_path)
+    return TriggerIndex(data)
+
+
+def to_relative(path, project_root):
+    """Project-relative '/'-separated path for matching."""
+    path = os.path.expanduser(path)
+    if os.path.isabs(path):
+        path = os.path.relpath(path, project_root)
+    path = path.replace(os.sep, '/')
+    while path.startswith('./'):
+        path = path[2:]
+    return path
+
+
+def synthetic_guidance(count, seed=0):
+    """Guidance entries with `count` triggers in a realistic mix, for bench."""
+    rng = random.Random(seed)
+    exts = [f'.x{n}' for n in range(max(1, count // 20))] + ['.rb', '.js', '.ts', '.vue', '.py']
+    guidance = []
+    for n in range(count):
+        kind = n % 5
+        entry = {'path': f'synthetic/{n}.md', 'file': '', 'scope': 'global',
+                 'file_triggers': [], 'directory_triggers': [], 'references': []}
+        ext = rng.choice(exts)
+        if kind == 0:
+            entry['file_triggers'].append(f'*{ext}')
+        elif kind == 1:
+            entry['file_triggers'].append(f'*_kind{n}{ext}')
+        elif kind == 2:
+            entry['directory_triggers'].append(f'dir{n % 97}/sub{n}/**')
+        elif kind == 3:
+            entry['directory_triggers'].append(f'src{n % 13}/**/*{ext}')
+        else:
+            entry['file_triggers'].append(f'file{n}?{ext}')
+        guidance.append(entry)
+    return guidance
+
+
+# Triggers and paths that the synthetic sample does not exercise
+EDGE_TRIGGERS = ['*', '*file', '*_spec', '*.rb', '*.tar.gz', 'Dockerfile', '*.Dockerfile']
+EDGE_PATHS = ['x.rb', 'a.Dockerfile', 'Dockerfile', 'Makefile', 'spec/user_spec', 'spec/user_spec.rb',
+              'pkg/a.tar.gz', 'noext', '.env']
+
+
+def cross_check(guidance, index, paths):
+    """Raise AssertionError if indexed and linear matching disagree on any path."""
+    for path in paths:
+        if index.match_ids(path) != linear_match(guidance, path):
+            raise AssertionError(f"Indexed and linear matching disagree for {path}")
+
+
+def linear_match(guidance, rel_path):
+    """Baseline: check every pattern in turn, as the skill describes."""
+    name = rel_path.rsplit('/', 1)[-1]
+    found = set()
+    for gid, entry in enumerate(guidance):
+        if any(fnmatch.fnmatchcase(name, p) for p in entry['file_triggers']):
+            found.add(gid)
+        elif any(re.fullmatch(glob_to_regex(p), rel_path) for p in entry['directory_triggers']):
+            found.add(gid)
+    return found
+
+
+def bench(patterns, calls, budget_ms):
+    """Time per-call matching with `patterns` synthetic triggers."""
+    guidance = synthetic_guidance(patterns)
+    start = time.perf_counter()
+    index = TriggerIndex(compile_triggers(guidance, DEFAULT_CONFIG['exclude_patterns']))
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(1)
+    paths = [
+        f"{rng.choice(['app', 'src3', 'dir5/sub5', 'lib'])}/{rng.choice(['a', 'b/c'])}/"
+        f"file{rng.randrange(patterns)}{rng.choice(['', '_kind7'])}{rng.choice(['.rb', '.ts', '.x3', '.md'])}"
+        for _ in range(calls)
+    ]
+
+    # The linear baseline is slow at high pattern counts; sample it
+    sample = paths[:20]
+    cross_check(guidance, index, sample)
+    edge_guidance = [{'path': f'edge/{n}.md', 'file': '', 'scope': 'global', 'file_triggers': [t],
+                      'directory_triggers': [], 'references': []} for n, t in enumerate(EDGE_TRIGGERS)]
+    cross_check(edge_guidance, TriggerIndex(compile_triggers(edge_guidance, [])), EDGE_PATHS)
+
+    timings = []
+    for path in paths:
+        start = time.perf_counter()
+        index.match_ids(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    start = time.perf_counter()
+    for path in sample:
+        linear_match(guidance, path)
+    linear_ms = (time.perf_counter() - start) * 1000 / len(sample)
+
+    def pct(p):
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    return {
+        'patterns': patterns,
+        'calls': calls,
+        'compile_ms': compile_ms,
+        'p50_ms': pct(0.50),
+        'p99_ms': pct(0.99),
+        'max_ms': timings[-1],
+        'linear_avg_ms': linear_ms,
+        'budget_ms': budget_ms,
+        'within_budget': timings[-1] <= budget_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled auto-guidance trigger index')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = sub.add_parser('build', help='Build (or rebuild) the persisted index')
+    build_parser.add_argument('--force', action='store_true', help='Rebuild even if current')
+    build_parser.add_argument('--project-root', default=os.getcwd())
+
+    match_parser = sub.add_parser('match', help='Guidance triggered by file paths (JSON)')
+    match_parser.add_argument('paths', nargs='+')
+    match_parser.add_argument('--project-root', default=os.getcwd())
+
+    bench_parser = sub.add_parser('bench', help='Micro-benchmark with synthetic triggers')
+    bench_parser.add_argument('--patterns', type=int, nargs='+', default=[100, 1000, 5000])
+    bench_parser.add_argument('--calls', type=int, default=5000)
+
+    args = parser.parse_args()
+    config = load_config()
+
+    if args.command == 'bench':
+        results = [bench(n, args.calls, config['max_pattern_time_ms']) for n in args.patterns]
+        for r in results:
+            status = '✅' if r['within_budget'] else '❌'
+            print(f"{status} {r['patterns']:>6} patterns: p50 {r['p50_ms']:.4f}ms  "
+                  f"p99 {r['p99_ms']:.4f}ms  max {r['max_ms']:.4f}ms  "
+                  f"(linear scan {r['linear_avg_ms']:.3f}ms, compile {r['compile_ms']:.1f}ms, "
+                  f"budget {r['budget_ms']}ms)")
+        sys.exit(0 if all(r['within_budget'] for r in results) else 1)
+
+    start = time.perf_counter()
+    index = load_index(args.project_root, config, force=getattr(args, 'force', False))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    tracking = config.get('performance_tracking')
+    if tracking:
+        from perf_log import append_event
+        append_event(config['performance_log'], 'index_build', load_ms, matched=len(index.guidance))
+
+    if args.command == 'build':
+        print(f"🔍 Auto-guidance index built: {len(index.guidance)} guidance files with triggers "
+              f"({load_ms:.0f}ms)")
+        return
+
+    results = {}
+    for path in args.paths:
+        rel_path = to_relative(path, args.project_root)
+        start = time.perf_counter()
+        entries = index.match(rel_path, config['priority'], config['max_per_trigger'])
+        match_ms = (time.perf_counter() - start) * 1000
+        if tracking:
+            append_event(config['performance_log'], 'pattern_match', match_ms, file=rel_path,
+                         matched=len(entries), guidance=[e['path'] for e in entries])
+        results[path] = {
+            'match_ms': round(match_ms, 4),
+            'guidance': [
+                {'path': e['path'], 'file': e['file'], 'scope': e['scope'], 'references': e['references']}
+                for e in entries
+            ],
+        }
+    print(json.dumps({'index_load_ms': round(load_ms, 2), 'results': results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 """
 Markdown to PDF converter with dark mode support.
-Uses pandoc with WeasyPrint for high-quality PDF output.
+Uses pandoc with WeasyPrint for high-quality PDF output, or optionally
+renders in-process through the WeasyPrint library.
 """
 
 import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -15,46 +26,48 @@ def get_skill_dir() -> Path:
     return Path(__file__).parent.parent
 
 
-def convert_md_to_pdf(
-    input_file: str,
-    output_file: str | None = None,
-    dark_mode: bool = True,
-    css_file: str | None = None,
-) -> Path:
-    """
-    Convert a markdown file to PDF.
+ENGINES = ('pandoc', 'weasyprint')
 
-    Args:
-        input_file: Path to the input markdown file
-        output_file: Path for the output PDF (defaults to input with .pdf extension)
-        dark_mode: Use dark mode theme (default: True)
-        css_file: Custom CSS file path (overrides dark_mode setting)
+DEFAULT_CACHE_PATH = Path('~/.cache/md2pdf/renders.json')
 
-    Returns:
-        Path to the generated PDF file
-    """
-    input_path = Path(input_file).expanduser().resolve()
+# pandoc's html5 writer wraps the document like this; keeping the same
+# skeleton lets the bundled stylesheets apply identically to both engines.
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" lang xml:lang>
+<head>
+  <meta charset="utf-8" />
+  <meta name="generator" content="md2pdf" />
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_path}")
+# Python-Markdown extensions approximating pandoc's markdown reader. The
+# output is close but not identical: no :emoji: shortcodes, and pandoc-only
+# syntax (definition list variants, fenced divs, citations) is not parsed.
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists', 'smarty']
 
-    if output_file:
-        output_path = Path(output_file).expanduser().resolve()
-    else:
-        output_path = input_path.with_suffix('.pdf')
+_render_lock = threading.Lock()
 
-    # Determine CSS file
-    if css_file:
-        css_path = Path(css_file).expanduser().resolve()
-    else:
-        skill_dir = get_skill_dir()
-        css_name = 'dark-mode.css' if dark_mode else 'light-mode.css'
-        css_path = skill_dir / 'assets' / css_name
 
-    if not css_path.exists():
-        raise FileNotFoundError(f"CSS file not found: {css_path}")
+@lru_cache(maxsize=None)
+def _font_config():
+    """Shared WeasyPrint font configuration (font discovery runs once)."""
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
 
-    # Build pandoc command
+
+@lru_cache(maxsize=8)
+def _stylesheet(css_path: str, mtime_ns: int):
+    """Parse a stylesheet once per path and modification time."""
+    from weasyprint import CSS
+    return CSS(filename=css_path, font_config=_font_config())
+
+
+def render_with_pandoc(input_path: Path, output_path: Path, css_path: Path) -> Path:
+    """Render through a pandoc subprocess using WeasyPrint as its PDF engine."""
     cmd = [
         'pandoc',
         str(input_path),
@@ -86,6 +99,381 @@ def convert_md_to_pdf(
         raise
 
 
+def render_with_weasyprint(input_path: Path, output_path: Path, css_path: Path) -> Path:
+    """
+    Render in-process with Python-Markdown and the WeasyPrint library.
+
+    Avoids starting pandoc and a second Python interpreter per document.
+    The parsed stylesheet and font configuration are reused across calls.
+    WeasyPrint is not documented as thread-safe, so renders within one
+    process are serialized; convert_many parallelizes batches with a
+    process pool instead. Output follows Python-Markdown, not pandoc's
+    reader (see MARKDOWN_EXTENSIONS).
+    """
+    import markdown
+    from weasyprint import HTML
+
+    body = markdown.markdown(
+        input_path.read_text(encoding='utf-8'),
+        extensions=MARKDOWN_EXTENSIONS,
+        output_format='html',
+    )
+    html = HTML_TEMPLATE.format(body=body)
+    stylesheet = _stylesheet(str(css_path), css_path.stat().st_mtime_ns)
+
+    with _render_lock:
+        HTML(string=html, base_url=str(input_path.parent)).write_pdf(
+            str(output_path),
+            stylesheets=[stylesheet],
+            font_config=_font_config(),
+        )
+    return output_path
+
+
+def weasyprint_available() -> bool:
+    """True when the in-process engine's libraries can be imported."""
+    try:
+        import markdown  # noqa: F401
+        import weasyprint  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RenderCache:
+    """
+    Records which inputs produced each PDF so unchanged documents are skipped.
+
+    The key hashes the markdown content, the stylesheet content and the
+    render options. A PDF is current when it still exists and its stored
+    key matches. Entries persist in a JSON manifest.
+    """
+
+    def __init__(self, manifest_path: Path = DEFAULT_CACHE_PATH):
+        self.manifest_path = Path(manifest_path).expanduser()
+        self._lock = threading.Lock()
+        try:
+            self._entries = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def make_key(input_path: Path, css_path: Path, **options) -> str:
+        """Hash the markdown, the stylesheet and the render options."""
+        digest = hashlib.sha256()
+        digest.update(input_path.read_bytes())
+        digest.update(b'\0')
+        digest.update(css_path.read_bytes())
+        digest.update(b'\0')
+        digest.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, output_path: Path, key: str) -> bool:
+        with self._lock:
+            return output_path.exists() and self._entries.get(str(output_path)) == key
+
+    def record(self, output_path: Path, key: str) -> None:
+        """Store the key for output_path and rewrite the manifest atomically."""
+        with self._lock:
+            self._entries[str(output_path)] = key
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(self._entries, indent=1), encoding='utf-8')
+            os.replace(tmp_path, self.manifest_path)
+
+
+def render_md_to_pdf(
+    input_file: str,
+    output_file: str | None = None,
+    dark_mode: bool = True,
+    css_file: str | None = None,
+    engine: str = 'pandoc',
+    cache: RenderCache | None = None,
+    executor: Executor | None = None,
+) -> tuple[Path, bool]:
+    """
+    Convert a markdown file to PDF unless the cached output is current.
+
+    Takes the same arguments as convert_md_to_pdf, plus an optional
+    RenderCache and an executor (a process pool) to run in-process
+    renders on.
+
+    Returns:
+        (path to the PDF, True if rendering was skipped because it was current)
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {', '.join(ENGINES)})")
+
+    input_path = Path(input_file).expanduser().resolve()
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    if output_file:
+        output_path = Path(output_file).expanduser().resolve()
+    else:
+        output_path = input_path.with_suffix('.pdf')
+
+    # Determine CSS file
+    if css_file:
+        css_path = Path(css_file).expanduser().resolve()
+    else:
+        skill_dir = get_skill_dir()
+        css_name = 'dark-mode.css' if dark_mode else 'light-mode.css'
+        css_path = skill_dir / 'assets' / css_name
+
+    if not css_path.exists():
+        raise FileNotFoundError(f"CSS file not found: {css_path}")
+
+    if engine == 'weasyprint' and not weasyprint_available():
+        print("Warning: in-process engine needs python packages 'markdown' and "
+              "'weasyprint'; falling back to pandoc", file=sys.stderr)
+        engine = 'pandoc'
+
+    # Keyed on the engine that actually renders, after any fallback
+    if cache is not None:
+        key = cache.make_key(input_path, css_path, engine=engine)
+        if cache.is_current(output_path, key):
+            return output_path, True
+
+    if engine == 'weasyprint' and executor is not None:
+        executor.submit(render_with_weasyprint, input_path, output_path, css_path).result()
+    elif engine == 'weasyprint':
+        render_with_weasyprint(input_path, output_path, css_path)
+    else:
+        render_with_pandoc(input_path, output_path, css_path)
+
+    if cache is not None:
+        cache.record(output_path, key)
+    return output_path, False
+
+
+def convert_md_to_pdf(
+    input_file: str,
+    output_file: str | None = None,
+    dark_mode: bool = True,
+    css_file: str | None = None,
+    engine: str = 'pandoc',
+    cache: RenderCache | None = None,
+) -> Path:
+    """
+    Convert a markdown file to PDF.
+
+    Args:
+        input_file: Path to the input markdown file
+        output_file: Path for the output PDF (defaults to input with .pdf extension)
+        dark_mode: Use dark mode theme (default: True)
+        css_file: Custom CSS file path (overrides dark_mode setting)
+        engine: 'pandoc' (subprocess) or 'weasyprint' (in-process; falls
+            back to pandoc when markdown/weasyprint are not installed)
+        cache: Skip rendering when this RenderCache says the PDF is current
+
+    Returns:
+        Path to the generated PDF file
+    """
+    output_path, _ = render_md_to_pdf(input_file, output_file, dark_mode, css_file, engine, cache)
+    return output_path
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting one markdown file."""
+
+    input_path: Path
+    output_path: Path | None
+    seconds: float
+    error: str | None = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def expand_inputs(inputs: list[str]) -> list[Path]:
+    """
+    Expand files, directories and glob patterns into markdown file paths.
+
+    Directories are searched recursively for *.md. Order follows the
+    arguments, with duplicates removed.
+    """
+    paths: list[Path] = []
+    seen: set[Path] = set()
+    for item in inputs:
+        item = os.path.expanduser(item)
+        if os.path.isdir(item):
+            matches = sorted(Path(item).rglob('*.md'))
+        elif glob.has_magic(item):
+            matches = sorted(Path(m) for m in glob.glob(item, recursive=True))
+        else:
+            matches = [Path(item)]
+        for match in matches:
+            resolved = match.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                paths.append(resolved)
+    return paths
+
+
+def common_root(input_files: list[Path]) -> Path | None:
+    """Deepest directory containing every input, used to lay out -d output."""
+    if not input_files:
+        return None
+    return Path(os.path.commonpath([str(p.parent) for p in input_files]))
+
+
+def default_jobs() -> int:
+    """Worker count for batch conversion: one per CPU, capped at 8."""
+    return min(8, os.cpu_count() or 1)
+
+
+def convert_many(
+    input_files: list[Path],
+    output_dir: str | None = None,
+    jobs: int | None = None,
+    input_root: Path | None = None,
+    **options,
+) -> list[ConversionResult]:
+    """
+    Convert many markdown files concurrently on a bounded worker pool.
+
+    Each pandoc conversion is an independent process, so threads are enough
+    to keep several running at once. In-process (weasyprint) renders are
+    serialized within a process, so for those the threads hand the renders
+    to a pool of worker processes. Failures are collected, not raised.
+
+    Args:
+        input_files: Markdown files to convert
+        output_dir: Directory for the PDFs (default: next to each input). Each
+            PDF keeps its path relative to input_root, so specs/a/spec.md
+            and specs/b/spec.md become a/spec.pdf and b/spec.pdf
+        jobs: Maximum concurrent conversions (default: default_jobs())
+        input_root: Directory the output layout is relative to (default:
+            common_root(input_files))
+        **options: Passed through to render_md_to_pdf (including cache)
+
+    Returns:
+        One ConversionResult per input, in input order
+    """
+    out_dir = Path(output_dir).expanduser().resolve() if output_dir else None
+    outputs: dict[Path, Path] = {}
+    if out_dir:
+        root = input_root or common_root(input_files)
+        for input_path in input_files:
+            try:
+                relative = input_path.relative_to(root)
+            except ValueError:
+                relative = Path(input_path.name)
+            outputs[input_path] = out_dir / relative.with_suffix('.pdf')
+        if len(set(outputs.values())) != len(outputs):
+            raise ValueError(f"Several inputs map to the same PDF under {out_dir}")
+        for output_path in set(outputs.values()):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def convert_one(input_path: Path) -> ConversionResult:
+        output_file = str(outputs[input_path]) if out_dir else None
+        start = time.perf_counter()
+        try:
+            output_path, cached = render_md_to_pdf(str(input_path), output_file, **options)
+        except Exception as e:
+            message = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) and e.stderr else str(e)
+            return ConversionResult(input_path, None, time.perf_counter() - start, message)
+        return ConversionResult(input_path, output_path, time.perf_counter() - start, cached=cached)
+
+    workers = max(1, jobs or default_jobs())
+    render_pool = None
+    if options.get('engine') == 'weasyprint' and workers > 1 and len(input_files) > 1 \
+            and weasyprint_available():
+        # spawn: workers are started from pool threads, where fork is unsafe
+        render_pool = ProcessPoolExecutor(max_workers=min(workers, len(input_files)),
+                                          mp_context=multiprocessing.get_context('spawn'))
+        options['executor'] = render_pool
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(convert_one, input_files))
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+
+
+def print_summary(results: list[ConversionResult], elapsed: float) -> None:
+    """Print per-file timing followed by success/failure totals."""
+    failures = [r for r in results if not r.ok]
+    for result in results:
+        if result.ok:
+            verb = 'Up to date' if result.cached else 'Created'
+            print(f"{verb}: file://{result.output_path} ({result.seconds:.2f}s)")
+    for result in failures:
+        print(f"Failed: {result.input_path} ({result.seconds:.2f}s): {result.error}", file=sys.stderr)
+    print(
+        f"\n{len(results) - len(failures)} succeeded, {len(failures)} failed "
+        f"in {elapsed:.2f}s (sum of per-file time {sum(r.seconds for r in results):.2f}s)"
+    )
+
+
+def snapshot(inputs: list[str], css_file: str | None, dark_mode: bool) -> dict[Path, int]:
+    """Modification times of every watched markdown file and the stylesheet."""
+    paths = expand_inputs(inputs)
+    if css_file:
+        paths.append(Path(css_file).expanduser().resolve())
+    else:
+        paths.append(get_skill_dir() / 'assets' / ('dark-mode.css' if dark_mode else 'light-mode.css'))
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+
+def watch(
+    inputs: list[str],
+    interval: float = 0.5,
+    debounce: float = 0.3,
+    output_dir: str | None = None,
+    jobs: int | None = None,
+    **options,
+) -> None:
+    """
+    Poll inputs and re-render markdown files that change, until interrupted.
+
+    Directories and globs are re-expanded on every poll, so new files are
+    picked up. A change is rendered once no further changes have arrived for
+    `debounce` seconds, which coalesces editor save bursts. A stylesheet
+    change re-renders every watched file.
+    """
+    dark_mode = options.get('dark_mode', True)
+    css_file = options.get('css_file')
+    previous = snapshot(inputs, css_file, dark_mode)
+    pending: set[Path] = set()
+    last_change = 0.0
+
+    print(f"Watching {len(previous) - 1} markdown file(s); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(inputs, css_file, dark_mode)
+            changed = {p for p, mtime in current.items() if previous.get(p) != mtime}
+            previous = current
+            if changed:
+                if any(p.suffix == '.css' for p in changed):
+                    changed = {p for p in current if p.suffix != '.css'}
+                pending |= changed
+                last_change = time.monotonic()
+                continue
+            if pending and time.monotonic() - last_change >= debounce:
+                batch = sorted(p for p in pending if p.exists())
+                pending.clear()
+                start = time.perf_counter()
+                # Lay out -d output relative to every watched file, not just this batch
+                root = common_root([p for p in current if p.suffix != '.css'])
+                results = convert_many(batch, output_dir=output_dir, jobs=jobs, input_root=root, **options)
+                print_summary(results, time.perf_counter() - start)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert Markdown to PDF with dark mode support',
@@ -96,11 +484,23 @@ Examples:
   %(prog)s document.md -o output.pdf      # Specify output file
   %(prog)s document.md --light            # Light mode PDF
   %(prog)s document.md --css custom.css   # Custom CSS
+  %(prog)s specs/feature/ -d out/          # Every .md in a folder, in parallel
+  %(prog)s 'specs/**/T*.md' -j 4           # Glob, at most 4 conversions at once
+  %(prog)s specs/feature/ --engine weasyprint  # Render in-process, no pandoc
+  %(prog)s specs/feature/ --watch          # Re-render files as they change
         """,
     )
 
-    parser.add_argument('input', help='Input markdown file')
-    parser.add_argument('-o', '--output', help='Output PDF file (default: input.pdf)')
+    parser.add_argument('inputs', nargs='+', metavar='input',
+                        help='Input markdown files, directories or glob patterns')
+    parser.add_argument('-o', '--output', help='Output PDF file (default: input.pdf; single input only)')
+    parser.add_argument('-d', '--output-dir', help='Directory for output PDFs (default: next to each input)')
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=default_jobs(),
+        help='Maximum concurrent conversions (default: %(default)s)',
+    )
     parser.add_argument(
         '--light',
         action='store_true',
@@ -110,19 +510,78 @@ Examples:
         '--css',
         help='Path to custom CSS file (overrides --light)',
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='pandoc',
+        help='pandoc subprocess (default) or in-process weasyprint library '
+             '(Python-Markdown; output differs slightly from pandoc)',
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Render even when the cached PDF is current',
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and re-render inputs when they change',
+    )
 
     args = parser.parse_args()
+    cache = None if args.force else RenderCache()
 
-    try:
-        output_path = convert_md_to_pdf(
-            input_file=args.input,
-            output_file=args.output,
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("Error: no markdown files matched", file=sys.stderr)
+        sys.exit(1)
+
+    if args.watch:
+        if args.output:
+            parser.error('-o/--output cannot be combined with --watch; use -d/--output-dir')
+        watch(
+            args.inputs,
+            output_dir=args.output_dir,
+            jobs=args.jobs,
             dark_mode=not args.light,
             css_file=args.css,
+            engine=args.engine,
+            cache=cache,
         )
-        print(f"Created: file://{output_path}")
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
+        return
+
+    if len(input_files) == 1 and not args.output_dir:
+        try:
+            output_path, cached = render_md_to_pdf(
+                input_file=str(input_files[0]),
+                output_file=args.output,
+                dark_mode=not args.light,
+                css_file=args.css,
+                engine=args.engine,
+                cache=cache,
+            )
+            print(f"{'Up to date' if cached else 'Created'}: file://{output_path}")
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.output:
+        parser.error('-o/--output needs a single input; use -d/--output-dir for batches')
+
+    start = time.perf_counter()
+    results = convert_many(
+        input_files,
+        output_dir=args.output_dir,
+        jobs=args.jobs,
+        dark_mode=not args.light,
+        css_file=args.css,
+        engine=args.engine,
+        cache=cache,
+    )
+    print_summary(results, time.perf_counter() - start)
+    if any(not r.ok for r in results):
         sys.exit(1)
 
 
@@ -3,26 +3,277 @@
 Skill Packager - Creates a distributable zip file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--incremental] [--level=N] [--jobs=N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --incremental
 """
 
+import hashlib
+import json
+import os
+import shutil
+import struct
 import sys
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from quick_validate import validate_skill
 
 
-def package_skill(skill_path, output_dir=None):
+# Size of the fixed part of a zip local file header
+LOCAL_HEADER_SIZE = 30
+
+DEFAULT_LEVEL = zlib.Z_DEFAULT_COMPRESSION
+
+# Already-compressed formats; deflating these burns CPU for ~0% gain
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+    '.pdf', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.jar',
+    '.mp3', '.mp4', '.m4a', '.mov', '.webm', '.ogg',
+    '.woff', '.woff2', '.docx', '.xlsx', '.pptx',
+}
+
+# Other files are sampled: store them if a fast deflate of the first
+# SAMPLE_SIZE bytes saves less than 5%
+SAMPLE_SIZE = 64 * 1024
+INCOMPRESSIBLE_RATIO = 0.95
+
+
+def manifest_path_for(zip_filename):
+    """Manifest stored beside the archive: <skill>.zip.manifest.json"""
+    return Path(f"{zip_filename}.manifest.json")
+
+
+def load_manifest(zip_filename):
+    """Load the previous manifest, or {} if there is no usable one."""
+    try:
+        with open(manifest_path_for(zip_filename), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def file_digest(file_path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_member(file_path, previous=None):
+    """
+    Manifest entry (size, mtime, hash) for file_path.
+
+    When size and mtime match the previous entry the stored hash is reused,
+    so unchanged files are not read at all.
+    """
+    stat = file_path.stat()
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if previous and previous.get('size') == entry['size'] and previous.get('mtime_ns') == entry['mtime_ns']:
+        entry['sha256'] = previous['sha256']
+    else:
+        entry['sha256'] = file_digest(file_path)
+    return entry
+
+
+def _register_member(dst_zip, info):
+    """
+    Record a member written directly to dst_zip.fp so close() lists it.
+
+    This is the only place that touches ZipFile internals (CPython 3.8-3.13):
+    close() writes the central directory from filelist at offset start_dir,
+    and only when _didModify is set; NameToInfo backs getinfo() and the
+    duplicate-name check. Revisit if zipfile's private layout changes.
+    """
+    dst_zip.filelist.append(info)
+    dst_zip.NameToInfo[info.filename] = info
+    dst_zip.start_dir = dst_zip.fp.tell()
+    dst_zip._didModify = True
+
+
+def write_raw_member(dst_zip, info, chunks):
+    """
+    Append a member whose data is already in its final (compressed) form.
+
+    info must carry CRC, compress_size, file_size and compress_type. zipfile
+    has no public API for this, so the local header is written from info and
+    the member is registered for the central directory by hand.
+    """
+    info.flag_bits &= ~0x08  # sizes go in the header, no data descriptor
+    info.header_offset = dst_zip.fp.tell()
+    dst_zip.fp.write(info.FileHeader())
+    for chunk in chunks:
+        dst_zip.fp.write(chunk)
+    _register_member(dst_zip, info)
+
+
+def copy_compressed_member(src_zip, src_info, dst_zip):
+    """Copy a member's already-compressed bytes from src_zip into dst_zip."""
+    src_zip.fp.seek(src_info.header_offset)
+    header = src_zip.fp.read(LOCAL_HEADER_SIZE)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    src_zip.fp.seek(name_len + extra_len, os.SEEK_CUR)
+
+    info = zipfile.ZipInfo(src_info.filename, src_info.date_time)
+    info.compress_type = src_info.compress_type
+    info.external_attr = src_info.external_attr
+    info.create_system = src_info.create_system
+    info.CRC = src_info.CRC
+    info.compress_size = src_info.compress_size
+    info.file_size = src_info.file_size
+    info.flag_bits = src_info.flag_bits
+
+    def chunks():
+        remaining = src_info.compress_size
+        while remaining:
+            chunk = src_zip.fp.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member in previous archive: {src_info.filename}")
+            remaining -= len(chunk)
+            yield chunk
+
+    write_raw_member(dst_zip, info, chunks())
+
+
+def is_incompressible(file_path, data):
+    """
+    True if deflating data is not worth it.
+
+    Known compressed formats are decided by extension; anything else by
+    deflating a sample and checking how much it shrank.
+    """
+    if file_path.suffix.lower() in INCOMPRESSIBLE_EXTENSIONS:
+        return True
+    sample = data[:SAMPLE_SIZE]
+    if not sample:
+        return False
+    return len(zlib.compress(sample, 1)) / len(sample) > INCOMPRESSIBLE_RATIO
+
+
+def compress_member(file_path, arcname, level):
+    """
+    Read and compress one file for the archive (runs on a worker thread).
+
+    Returns (ZipInfo, data) with data already in its final stored/deflated
+    form. zlib releases the GIL, so several of these run truly in parallel.
+    """
+    data = file_path.read_bytes()
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+
+    if level == 0 or is_incompressible(file_path, data):
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        deflated = compressor.compress(data) + compressor.flush()
+        if len(deflated) < len(data):
+            info.compress_type = zipfile.ZIP_DEFLATED
+            data = deflated
+        else:
+            info.compress_type = zipfile.ZIP_STORED
+    info.compress_size = len(data)
+    return info, data
+
+
+def write_archive(skill_path, zip_filename, incremental=False, level=DEFAULT_LEVEL, jobs=None):
+    """
+    Write the skill archive and its manifest.
+
+    New or modified files are compressed in parallel on a thread pool and
+    written in sorted order, stored rather than deflated when incompressible.
+    At most jobs * 2 compressed files are held in memory at once.
+    In incremental mode, members whose size/mtime/hash and compression level
+    match the previous manifest are copied compressed from the previous
+    archive instead. Returns (added, reused) member counts.
+    """
+    previous_manifest = load_manifest(zip_filename) if incremental else {}
+    previous_zip = None
+    if previous_manifest and zip_filename.exists():
+        try:
+            previous_zip = zipfile.ZipFile(zip_filename, 'r')
+        except zipfile.BadZipFile:
+            previous_manifest = {}
+
+    manifest = {}
+    members = []
+    # Walk through the skill directory
+    for file_path in sorted(skill_path.rglob('*')):
+        if not file_path.is_file():
+            continue
+        # Calculate the relative path within the zip
+        arcname = file_path.relative_to(skill_path.parent).as_posix()
+        previous = previous_manifest.get(arcname)
+        entry = describe_member(file_path, previous)
+        entry['level'] = level
+        manifest[arcname] = entry
+        reuse = bool(previous_zip and previous and previous['sha256'] == entry['sha256']
+                     and previous.get('level') == level and arcname in previous_zip.NameToInfo)
+        members.append((file_path, arcname, reuse))
+
+    added = reused = 0
+    workers = jobs or os.cpu_count() or 1
+    pending = iter([(file_path, arcname) for file_path, arcname, reuse in members if not reuse])
+    window = deque()
+    tmp_filename = zip_filename.with_name(f".{zip_filename.name}.tmp")
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool, \
+                zipfile.ZipFile(tmp_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            def fill_window():
+                # Submit ahead in write order, but never more than workers * 2
+                while len(window) < workers * 2:
+                    item = next(pending, None)
+                    if item is None:
+                        return
+                    window.append(pool.submit(compress_member, item[0], item[1], level))
+
+            fill_window()
+            for file_path, arcname, reuse in members:
+                if reuse:
+                    copy_compressed_member(previous_zip, previous_zip.getinfo(arcname), zipf)
+                    reused += 1
+                    continue
+
+                info, data = window.popleft().result()
+                fill_window()
+                write_raw_member(zipf, info, [data])
+                added += 1
+                codec = 'stored' if info.compress_type == zipfile.ZIP_STORED else 'deflated'
+                print(f"  Added: {arcname} ({codec})")
+    except BaseException:
+        for future in window:
+            future.cancel()
+        tmp_filename.unlink(missing_ok=True)
+        raise
+    finally:
+        if previous_zip:
+            previous_zip.close()
+
+    shutil.move(tmp_filename, zip_filename)
+    with open(manifest_path_for(zip_filename), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return added, reused
+
+
+def package_skill(skill_path, output_dir=None, incremental=False, level=DEFAULT_LEVEL, jobs=None):
     """
     Package a skill folder into a zip file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the zip file (defaults to current directory)
+        incremental: Reuse unchanged members from the previous archive
+        level: Deflate level 0-9 (0 stores everything; default zlib's 6)
+        jobs: Compression threads (defaults to CPU count)
 
     Returns:
         Path to the created zip file, or None if error
@@ -65,14 +316,15 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the zip file
     try:
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+        start = time.perf_counter()
+        added, reused = write_archive(skill_path, zip_filename, incremental, level, jobs)
+        elapsed = time.perf_counter() - start
+        if reused:
+            print(f"  Reused {reused} unchanged file(s) from previous archive")
+
+        source_bytes = sum(p.stat().st_size for p in skill_path.rglob('*') if p.is_file())
+        archive_bytes = zip_filename.stat().st_size
+        print(f"\n📊 {source_bytes:,} bytes -> {archive_bytes:,} bytes in {elapsed * 1000:.0f} ms")
 
         print(f"\n✅ Successfully packaged skill to: {zip_filename}")
         return zip_filename
@@ -83,22 +335,38 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+    incremental = False
+    level = DEFAULT_LEVEL
+    jobs = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg == '--incremental':
+            incremental = True
+        elif arg.startswith('--level='):
+            level = int(arg.split('=', 1)[1])
+        elif arg.startswith('--jobs='):
+            jobs = int(arg.split('=', 1)[1])
+        else:
+            args.append(arg)
+
+    if len(args) < 1 or not -1 <= level <= 9:
+        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--incremental] [--level=N] [--jobs=N]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --incremental")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --level=9 --jobs=4")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, incremental, level, jobs)
 
     if result:
         sys.exit(0)
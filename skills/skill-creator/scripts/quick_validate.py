@@ -1,65 +1,175 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    quick_validate.py <skill_directory>
+    quick_validate.py <root> [<root> ...] [--json]   # every SKILL.md below each root
 """
 
 import sys
 import os
 import re
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Frontmatter larger than this is treated as unterminated
+MAX_FRONTMATTER_BYTES = 64 * 1024
+READ_CHUNK = 4096
+
+KEY_RE = re.compile(r'^([A-Za-z0-9_-]+):\s*(.*)$')
+NAME_RE = re.compile(r'^[a-z0-9-]+$')
+
+
+def read_frontmatter(skill_md):
+    """
+    Read only the frontmatter block of skill_md.
+
+    Returns the text between the opening and closing '---' lines, '' if the
+    file does not start with '---', or None if the block never closes.
+    """
+    with open(skill_md, 'rb') as f:
+        head = f.read(READ_CHUNK)
+        if not head.startswith(b'---'):
+            return ''
+        while True:
+            end = head.find(b'\n---', 3)
+            if end != -1:
+                start = head.find(b'\n') + 1
+                return head[start:end].decode('utf-8')
+            if len(head) >= MAX_FRONTMATTER_BYTES:
+                return None
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return None
+            head += chunk
+
+
+def parse_frontmatter(frontmatter):
+    """
+    Parse top-level `key: value` pairs in one pass.
+
+    Folded/literal block scalars (`>`, `>-`, `|`, ...) are joined from their
+    indented continuation lines.
+    """
+    fields = {}
+    key = None
+    block = None
+    for line in frontmatter.splitlines():
+        if block is not None and (line.startswith((' ', '\t')) or not line.strip()):
+            block.append(line.strip())
+            continue
+        if block is not None:
+            fields[key] = ' '.join(part for part in block if part)
+            block = None
+        match = KEY_RE.match(line)
+        if not match:
+            continue
+        key, value = match.group(1), match.group(2).strip()
+        if value and value[0] in '>|' and value.rstrip('-+0123456789') in ('>', '|'):
+            block = []
+        else:
+            fields.setdefault(key, value)
+    if block is not None:
+        fields[key] = ' '.join(part for part in block if part)
+    return fields
+
+
+def validate_frontmatter(fields):
+    """Check required fields and naming rules; returns (valid, message)."""
+    # Check required fields
+    if 'name' not in fields:
+        return False, "Missing 'name' in frontmatter"
+    if 'description' not in fields:
+        return False, "Missing 'description' in frontmatter"
+
+    name = fields['name'].strip()
+    if name:
+        # Check naming convention (hyphen-case: lowercase with hyphens)
+        if not NAME_RE.match(name):
+            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
+        if name.startswith('-') or name.endswith('-') or '--' in name:
+            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
+
+    description = fields['description'].strip()
+    # Check for angle brackets
+    if '<' in description or '>' in description:
+        return False, "Description cannot contain angle brackets (< or >)"
+
+    return True, "Skill is valid!"
+
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
-    
+
     # Check SKILL.md exists
     skill_md = skill_path / 'SKILL.md'
     if not skill_md.exists():
         return False, "SKILL.md not found"
-    
+
     # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
+    try:
+        frontmatter = read_frontmatter(skill_md)
+    except (OSError, UnicodeDecodeError) as e:
+        return False, f"Cannot read SKILL.md: {e}"
+    if frontmatter == '':
         return False, "No YAML frontmatter found"
-    
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
+    if frontmatter is None:
         return False, "Invalid frontmatter format"
-    
-    frontmatter = match.group(1)
-    
-    # Check required fields
-    if 'name:' not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
-    if 'description:' not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
-    
-    # Extract name for validation
-    name_match = re.search(r'name:\s*(.+)', frontmatter)
-    if name_match:
-        name = name_match.group(1).strip()
-        # Check naming convention (hyphen-case: lowercase with hyphens)
-        if not re.match(r'^[a-z0-9-]+$', name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
-        if name.startswith('-') or name.endswith('-') or '--' in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
 
-    # Extract and validate description
-    desc_match = re.search(r'description:\s*(.+)', frontmatter)
-    if desc_match:
-        description = desc_match.group(1).strip()
-        # Check for angle brackets
-        if '<' in description or '>' in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+    return validate_frontmatter(parse_frontmatter(frontmatter))
 
-    return True, "Skill is valid!"
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
+def find_skills(roots):
+    """Skill directories (containing SKILL.md) at or below each root, sorted."""
+    skills = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Skip VCS and dependency trees
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+            if 'SKILL.md' in filenames:
+                skills.add(Path(dirpath))
+    return sorted(skills)
+
+
+def validate_skills(roots, jobs=None):
+    """Validate every skill below roots in parallel; returns a list of result dicts."""
+    skills = find_skills(roots)
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        outcomes = pool.map(validate_skill, skills)
+        return [
+            {'path': str(skill), 'valid': valid, 'message': message}
+            for skill, (valid, message) in zip(skills, outcomes)
+        ]
+
+
+def main():
+    as_json = '--json' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--json']
+    if not args:
         print("Usage: python quick_validate.py <skill_directory>")
+        print("       python quick_validate.py <root> [<root> ...] [--json]")
         sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+
+    # Original single-skill behaviour
+    if len(args) == 1 and not as_json and (Path(args[0]) / 'SKILL.md').exists():
+        valid, message = validate_skill(args[0])
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    results = validate_skills(args)
+    invalid = [r for r in results if not r['valid']]
+    if as_json:
+        print(json.dumps({'checked': len(results), 'invalid': len(invalid), 'results': results}, indent=2))
+    else:
+        for result in results:
+            status = '✅' if result['valid'] else '❌'
+            print(f"{status} {result['path']}: {result['message']}")
+        print(f"\n{len(results) - len(invalid)}/{len(results)} skills valid")
+    sys.exit(1 if invalid or not results else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Incremental usage statistics over Claude session transcripts.
+
+stats-cache.json is one document that grows by a day per day and is fully
+rewritten on every update. This engine keeps the same data as:
+
+- append-only daily partitions (~/.claude/stats/days/YYYY-MM-DD.json),
+  written once when the day closes and never touched again
+- a small state file with the lastComputedDate watermark, per-transcript
+  read offsets, the still-open days, running per-model token totals,
+  hour counts, the longest session and rolling 7/30/90-day aggregates
+
+A refresh reads only transcript bytes appended since the last refresh,
+closes finished days, and moves each rolling window by adding the new day
+and subtracting the day that fell out of it. Its cost depends on how much
+happened since the last refresh, not on how much history exists. The
+compact stats-cache.json view is only materialized on demand.
+
+Usage:
+    usage_stats.py refresh [--projects DIR]
+    usage_stats.py import [stats-cache.json]
+    usage_stats.py show [--json]
+    usage_stats.py materialize [-o stats-cache.json]
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+PROJECTS_DIR = CLAUDE_DIR / "projects"
+STATS_DIR = CLAUDE_DIR / "stats"
+STATS_CACHE = CLAUDE_DIR / "stats-cache.json"
+STATE_VERSION = 1
+VIEW_VERSION = 1
+
+WINDOWS = (7, 30, 90)
+# Sessions idle this long are dropped from state; their contribution to
+# totals and longestSession is already recorded.
+SESSION_RETENTION_DAYS = 90
+
+USAGE_FIELDS = {
+    'inputTokens': 'input_tokens',
+    'outputTokens': 'output_tokens',
+    'cacheReadInputTokens': 'cache_read_input_tokens',
+    'cacheCreationInputTokens': 'cache_creation_input_tokens',
+}
+
+
+def parse_timestamp(value):
+    """ISO-8601 transcript timestamp -> aware local datetime (None if invalid)."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone()
+    except (AttributeError, ValueError):
+        return None
+
+
+def empty_day(day):
+    return {'date': day, 'messageCount': 0, 'sessionCount': 0, 'toolCallCount': 0,
+            'tokensByModel': {}}
+
+
+def empty_contribution():
+    """What one transcript added to one still-open day, so it can be taken back."""
+    return {'messageCount': 0, 'sessionCount': 0, 'toolCallCount': 0, 'tokensByModel': {},
+            'modelUsage': {}, 'sessions': {}}
+
+
+def empty_window():
+    return {'messageCount': 0, 'sessionCount': 0, 'toolCallCount': 0, 'activeDays': 0,
+            'tokensByModel': {}}
+
+
+def empty_model_usage():
+    return {'inputTokens': 0, 'outputTokens': 0, 'cacheReadInputTokens': 0,
+            'cacheCreationInputTokens': 0, 'webSearchRequests': 0, 'costUSD': 0,
+            'contextWindow': 0}
+
+
+def add_day(window, day, sign=1):
+    """Add (sign=1) or subtract (sign=-1) a day partition from a rolling window."""
+    for key in ('messageCount', 'sessionCount', 'toolCallCount'):
+        window[key] += sign * day[key]
+    if day['messageCount']:
+        window['activeDays'] += sign
+    tokens = window['tokensByModel']
+    for model, count in day['tokensByModel'].items():
+        tokens[model] = tokens.get(model, 0) + sign * count
+        if not tokens[model]:
+            del tokens[model]
+
+
+def atomic_write_json(path, data, indent=None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    separators = None if indent else (',', ':')
+    tmp_path.write_text(json.dumps(data, indent=indent, separators=separators), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+class StatsEngine:
+    """Partitioned usage statistics with a lastComputedDate watermark."""
+
+    def __init__(self, stats_dir=STATS_DIR):
+        self.stats_dir = Path(stats_dir)
+        self.days_dir = self.stats_dir / "days"
+        self.state_path = self.stats_dir / "state.json"
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            if state.get('version') == STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {
+            'version': STATE_VERSION,
+            'lastComputedDate': None,
+            'firstSessionDate': None,
+            'files': {},
+            'openDays': {},
+            'sessions': {},
+            'modelUsage': {},
+            'hourCounts': {},
+            'totalSessions': 0,
+            'totalMessages': 0,
+            'longestSession': None,
+            'windows': {str(n): empty_window() for n in WINDOWS},
+        }
+
+    def save(self):
+        atomic_write_json(self.state_path, self.state)
+
+    # Partitions
+
+    def partition_path(self, day):
+        return self.days_dir / f"{day}.json"
+
+    def read_partition(self, day):
+        try:
+            return json.loads(self.partition_path(day).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def iter_partitions(self):
+        """Closed day partitions in date order (used only when materializing)."""
+        if not self.days_dir.is_dir():
+            return
+        for path in sorted(self.days_dir.glob("*.json")):
+            try:
+                yield json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+
+    # Ingest
+
+    def refresh(self, projects_dir=PROJECTS_DIR, today=None):
+        """
+        Ingest transcript data appended since the last refresh and close finished days.
+
+        Returns the number of transcript lines read.
+        """
+        today = today or date.today().isoformat()
+        lines = 0
+        files = self.state['files']
+        for path in sorted(Path(projects_dir).expanduser().glob("*/*.jsonl")):
+            key = str(path)
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            entry = files.get(key)
+            if entry and entry['offset'] == size:
+                continue
+            if entry is None or size < entry['offset']:
+                # New transcript (or one that was rewritten): read from the start;
+                # events at or before the watermark are skipped. A rewritten one
+                # first gives back what it added to still-open days.
+                if entry is not None:
+                    self._forget_file(entry)
+                entry = files[key] = {'offset': 0, 'lastMessageId': None, 'openDays': {}}
+            lines += self._ingest_file(path, entry)
+        self._close_days(today)
+        self._prune_sessions(today)
+        self.save()
+        return lines
+
+    def _ingest_file(self, path, entry):
+        with open(path, 'rb') as f:
+            f.seek(entry['offset'])
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return 0
+        count = 0
+        for raw in data[:end].splitlines():
+            if not raw.strip():
+                continue
+            count += 1
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            self._ingest_event(event, entry)
+        entry['offset'] += end
+        return count
+
+    def _forget_file(self, entry):
+        """Subtract a transcript's contributions to still-open days and the totals."""
+        state = self.state
+        for day, contribution in entry.get('openDays', {}).items():
+            open_day = state['openDays'].get(day)
+            if open_day is None:
+                continue
+            for key in ('messageCount', 'sessionCount', 'toolCallCount'):
+                open_day[key] -= contribution[key]
+            for model, count in contribution['tokensByModel'].items():
+                open_day['tokensByModel'][model] -= count
+                if not open_day['tokensByModel'][model]:
+                    del open_day['tokensByModel'][model]
+            state['totalMessages'] -= contribution['messageCount']
+            state['totalSessions'] -= contribution['sessionCount']
+            for model, usage in contribution['modelUsage'].items():
+                totals = state['modelUsage'].get(model)
+                if totals is not None:
+                    for field, count in usage.items():
+                        totals[field] -= count
+            for session_id, seen in contribution['sessions'].items():
+                if seen['new']:
+                    state['sessions'].pop(session_id, None)
+                    hour = seen['hour']
+                    state['hourCounts'][hour] -= 1
+                    if not state['hourCounts'][hour]:
+                        del state['hourCounts'][hour]
+                elif session_id in state['sessions']:
+                    state['sessions'][session_id]['messages'] -= seen['messages']
+
+    def _ingest_event(self, event, entry):
+        kind = event.get('type')
+        if kind not in ('user', 'assistant'):
+            return
+        moment = parse_timestamp(event.get('timestamp'))
+        session_id = event.get('sessionId')
+        if moment is None or not session_id:
+            return
+        day = moment.date().isoformat()
+        sessions = self.state['sessions']
+        watermark = self.state['lastComputedDate']
+        if watermark and day <= watermark:
+            # Already counted in a closed partition; remember the session so
+            # later activity is not mistaken for a new session.
+            sessions.setdefault(session_id, {'first': event['timestamp'], 'last': event['timestamp'],
+                                             'messages': 0, 'counted': False})
+            return
+
+        open_day = self.state['openDays'].setdefault(day, empty_day(day))
+        contribution = entry.setdefault('openDays', {}).setdefault(day, empty_contribution())
+        session = sessions.get(session_id)
+        if session is None:
+            session = sessions[session_id] = {'first': event['timestamp'], 'last': event['timestamp'],
+                                              'messages': 0, 'counted': True}
+            open_day['sessionCount'] += 1
+            contribution['sessionCount'] += 1
+            self.state['totalSessions'] += 1
+            hour = str(moment.hour)
+            self.state['hourCounts'][hour] = self.state['hourCounts'].get(hour, 0) + 1
+            contribution['sessions'][session_id] = {'new': True, 'hour': hour, 'messages': 0}
+            first = self.state['firstSessionDate']
+            if first is None or event['timestamp'] < first:
+                self.state['firstSessionDate'] = event['timestamp']
+        session['last'] = max(session['last'], event['timestamp'])
+        session['messages'] += 1
+        seen = contribution['sessions'].setdefault(session_id, {'new': False, 'hour': None, 'messages': 0})
+        seen['messages'] += 1
+        self._update_longest(session_id, session)
+
+        open_day['messageCount'] += 1
+        contribution['messageCount'] += 1
+        self.state['totalMessages'] += 1
+        if kind != 'assistant':
+            return
+
+        message = event.get('message') or {}
+        content = message.get('content')
+        if isinstance(content, list):
+            tool_calls = sum(
+                1 for block in content if isinstance(block, dict) and block.get('type') == 'tool_use'
+            )
+            open_day['toolCallCount'] += tool_calls
+            contribution['toolCallCount'] += tool_calls
+        # One API response is logged as several lines sharing a message id;
+        # count its usage once.
+        message_id = message.get('id')
+        usage = message.get('usage')
+        model = message.get('model')
+        if not usage or not model or model == '<synthetic>' or message_id == entry['lastMessageId']:
+            return
+        entry['lastMessageId'] = message_id
+        totals = self.state['modelUsage'].setdefault(model, empty_model_usage())
+        added = contribution['modelUsage'].setdefault(model, {})
+        counts = {field: usage.get(source) or 0 for field, source in USAGE_FIELDS.items()}
+        counts['webSearchRequests'] = (usage.get('server_tool_use') or {}).get('web_search_requests') or 0
+        for field, count in counts.items():
+            totals[field] += count
+            added[field] = added.get(field, 0) + count
+        tokens = (usage.get('input_tokens') or 0) + (usage.get('output_tokens') or 0)
+        open_day['tokensByModel'][model] = open_day['tokensByModel'].get(model, 0) + tokens
+        contribution['tokensByModel'][model] = contribution['tokensByModel'].get(model, 0) + tokens
+
+    def _update_longest(self, session_id, session):
+        start = parse_timestamp(session['first'])
+        end = parse_timestamp(session['last'])
+        duration = int((end - start).total_seconds() * 1000)
+        longest = self.state['longestSession']
+        if longest is None or duration > longest['duration']:
+            self.state['longestSession'] = {'sessionId': session_id, 'duration': duration,
+                                            'messageCount': session['messages'],
+                                            'timestamp': session['first']}
+        elif longest['sessionId'] == session_id:
+            longest['messageCount'] = session['messages']
+
+    def _close_days(self, today):
+        """Write partitions for open days before today and advance the watermark."""
+        open_days = self.state['openDays']
+        watermark = self.state['lastComputedDate']
+        closing = sorted(day for day in open_days if day < today)
+        yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+        if watermark is None:
+            if not closing:
+                return
+            watermark = (date.fromisoformat(closing[0]) - timedelta(days=1)).isoformat()
+        if watermark >= yesterday:
+            return
+
+        # Walk every calendar day up to yesterday so windows also slide over idle days
+        day = date.fromisoformat(watermark) + timedelta(days=1)
+        last = date.fromisoformat(yesterday)
+        while day <= last:
+            key = day.isoformat()
+            partition = open_days.pop(key, None)
+            stored = self.read_partition(key)
+            if stored is None and partition is not None:
+                atomic_write_json(self.partition_path(key), partition)
+                stored = partition
+            # A day already on disk wins for the windows too: dailyActivity and
+            # the later expiry both read the stored partition back
+            self._advance_windows(day, stored)
+            day += timedelta(days=1)
+        self.state['lastComputedDate'] = yesterday
+        # Closed days are final; a rewritten transcript only gives back open ones
+        for entry in self.state['files'].values():
+            contributions = entry.get('openDays') or {}
+            for closed in [d for d in contributions if d <= yesterday]:
+                del contributions[closed]
+
+    def _advance_windows(self, day, partition):
+        for n in WINDOWS:
+            window = self.state['windows'][str(n)]
+            if partition is not None:
+                add_day(window, partition)
+            expired = self.read_partition((day - timedelta(days=n)).isoformat())
+            if expired is not None:
+                add_day(window, expired, sign=-1)
+
+    def _prune_sessions(self, today):
+        cutoff = (date.fromisoformat(today) - timedelta(days=SESSION_RETENTION_DAYS)).isoformat()
+        sessions = self.state['sessions']
+        for session_id in [s for s, v in sessions.items() if v['last'][:10] < cutoff]:
+            del sessions[session_id]
+
+    # Seeding from an existing stats-cache.json
+
+    def import_cache(self, cache_path=STATS_CACHE):
+        """Seed partitions, totals and the watermark from a stats-cache.json document."""
+        cache = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+        tokens = {entry['date']: entry.get('tokensByModel', {}) for entry in cache.get('dailyModelTokens', [])}
+        for activity in cache.get('dailyActivity', []):
+            day = activity['date']
+            if self.read_partition(day) is None:
+                partition = empty_day(day)
+                for key in ('messageCount', 'sessionCount', 'toolCallCount'):
+                    partition[key] = activity.get(key, 0)
+                partition['tokensByModel'] = tokens.get(day, {})
+                atomic_write_json(self.partition_path(day), partition)
+
+        state = self.state
+        state['lastComputedDate'] = cache.get('lastComputedDate')
+        state['firstSessionDate'] = cache.get('firstSessionDate')
+        state['modelUsage'] = {model: {**empty_model_usage(), **usage}
+                               for model, usage in cache.get('modelUsage', {}).items()}
+        state['hourCounts'] = dict(cache.get('hourCounts', {}))
+        state['totalSessions'] = cache.get('totalSessions', 0)
+        state['totalMessages'] = cache.get('totalMessages', 0)
+        state['longestSession'] = cache.get('longestSession')
+        state['openDays'] = {}
+        state['windows'] = self._recompute_windows()
+        self.save()
+
+    def _recompute_windows(self):
+        """Full window computation from partitions; only needed when seeding."""
+        windows = {str(n): empty_window() for n in WINDOWS}
+        watermark = self.state['lastComputedDate']
+        if not watermark:
+            return windows
+        end = date.fromisoformat(watermark)
+        for n in WINDOWS:
+            for offset in range(n):
+                partition = self.read_partition((end - timedelta(days=offset)).isoformat())
+                if partition is not None:
+                    add_day(windows[str(n)], partition)
+        return windows
+
+    # Views
+
+    def summary(self):
+        """Small on-demand summary: totals, rolling windows and per-model tokens."""
+        state = self.state
+        return {
+            'lastComputedDate': state['lastComputedDate'],
+            'totalSessions': state['totalSessions'],
+            'totalMessages': state['totalMessages'],
+            'rolling': {f'{n}d': state['windows'][str(n)] for n in WINDOWS},
+            'modelUsage': state['modelUsage'],
+            'openDays': sorted(state['openDays']),
+            'longestSession': state['longestSession'],
+        }
+
+    def materialize(self):
+        """Build the compact stats-cache.json document from the partitions."""
+        activity = []
+        model_tokens = []
+        for partition in self.iter_partitions():
+            activity.append({k: partition[k] for k in ('date', 'messageCount', 'sessionCount',
+                                                       'toolCallCount')})
+            model_tokens.append({'date': partition['date'],
+                                 'tokensByModel': partition['tokensByModel']})
+        state = self.state
+        return {
+            'version': VIEW_VERSION,
+            'lastComputedDate': state['lastComputedDate'],
+            'dailyActivity': activity,
+            'dailyModelTokens': model_tokens,
+            'modelUsage': state['modelUsage'],
+            'totalSessions': state['totalSessions'],
+            'totalMessages': state['totalMessages'],
+            'longestSession': state['longestSession'],
+            'firstSessionDate': state['firstSessionDate'],
+            'hourCounts': dict(sorted(state['hourCounts'].items(), key=lambda kv: int(kv[0]))),
+        }
+
+
+def print_summary(summary):
+    print(f"Stats through {summary['lastComputedDate'] or 'n/a'}"
+          f" ({summary['totalSessions']} sessions, {summary['totalMessages']} messages)")
+    if summary['openDays']:
+        print(f"Open days (not yet partitioned): {', '.join(summary['openDays'])}")
+    print()
+    for label, window in summary['rolling'].items():
+        tokens = sum(window['tokensByModel'].values())
+        print(f"  last {label:>4}: {window['activeDays']:>3} active days  "
+              f"{window['sessionCount']:>5} sessions  {window['messageCount']:>7} messages  "
+              f"{window['toolCallCount']:>6} tool calls  {tokens:>11,} tokens")
+    print()
+    for model, usage in sorted(summary['modelUsage'].items()):
+        print(f"  {model}: {usage['inputTokens']:,} in / {usage['outputTokens']:,} out"
+              f" / {usage['cacheReadInputTokens']:,} cache read")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental usage statistics for Claude sessions')
+    parser.add_argument('--stats-dir', default=str(STATS_DIR),
+                        help='Partition and state directory (default: ~/.claude/stats)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    refresh = sub.add_parser('refresh', help='Ingest new transcript data and close finished days')
+    refresh.add_argument('--projects', default=str(PROJECTS_DIR),
+                         help='Transcript directory (default: ~/.claude/projects)')
+
+    seed = sub.add_parser('import', help='Seed partitions from an existing stats-cache.json')
+    seed.add_argument('cache', nargs='?', default=str(STATS_CACHE))
+
+    show = sub.add_parser('show', help='Print totals and rolling 7/30/90-day aggregates')
+    show.add_argument('--json', action='store_true', help='Print as JSON')
+
+    view = sub.add_parser('materialize', help='Write the compact stats-cache.json view')
+    view.add_argument('-o', '--output', default=str(STATS_CACHE),
+                      help="Output path, or '-' for stdout (default: ~/.claude/stats-cache.json)")
+
+    args = parser.parse_args()
+    engine = StatsEngine(os.path.expanduser(args.stats_dir))
+
+    if args.command == 'refresh':
+        lines = engine.refresh(args.projects)
+        print(f"Ingested {lines} new transcript lines; stats through "
+              f"{engine.state['lastComputedDate'] or 'n/a'}")
+    elif args.command == 'import':
+        if not Path(args.cache).expanduser().is_file():
+            print(f"❌ Stats cache not found: {args.cache}")
+            sys.exit(1)
+        engine.import_cache(Path(args.cache).expanduser())
+        print(f"Imported stats through {engine.state['lastComputedDate']}")
+    elif args.command == 'show':
+        summary = engine.summary()
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            print_summary(summary)
+    elif args.command == 'materialize':
+        document = engine.materialize()
+        if args.output == '-':
+            print(json.dumps(document, indent=2))
+        else:
+            atomic_write_json(Path(args.output).expanduser(), document, indent=2)
+            print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()